@@ -0,0 +1,236 @@
+"""
+Semantic Answer Cache
+Reuses LLM answers for repeated or near-duplicate questions over the same chunks
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from embedding_cache import normalize_text
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", "./answer_cache.db")
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "86400"))  # seconds, 0 = no expiry
+# Cosine similarity for a near-duplicate question to reuse an answer (0 = exact matches only)
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a question for exact matching (unicode, whitespace, case)"""
+    return normalize_text(query).lower()
+
+
+def context_key(docs: List[Document]) -> str:
+    """
+    Fingerprint of the set of chunks given to the LLM
+
+    Chroma results carry no ids, so each chunk is identified by its source
+    and text; the set is order-independent.
+    """
+    chunk_hashes = sorted(
+        hashlib.sha1(f"{doc.metadata.get('source', '')}\0{doc.page_content}".encode("utf-8")).hexdigest()
+        for doc in docs
+    )
+    return hashlib.sha256("\n".join(chunk_hashes).encode("utf-8")).hexdigest()
+
+
+def answer_key(model_name: str, query: str, context: str) -> str:
+    """Cache key for a (model, normalized query, chunk set) triple"""
+    data = f"{model_name}\0{normalize_query(query)}\0{context}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnswerCache:
+    """SQLite cache of LLM answers with TTL, LRU eviction and similarity lookup"""
+
+    def __init__(self, db_path: str = ANSWER_CACHE_PATH,
+                 max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+                 ttl: float = ANSWER_CACHE_TTL,
+                 similarity: float = ANSWER_CACHE_SIMILARITY):
+        """
+        Initialize cache
+
+        Args:
+            db_path: Path to SQLite database file
+            max_entries: Number of answers kept; least recently used are evicted
+            ttl: Seconds an answer stays valid (0 for no expiry)
+            similarity: Minimum cosine similarity between question embeddings
+                for a near-duplicate hit (0 to disable)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                context_key TEXT NOT NULL,
+                query TEXT NOT NULL,
+                query_vector BLOB,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_answers_context ON answers(model, context_key)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_answers_accessed ON answers(accessed_at)
+        """)
+        self.conn.commit()
+
+    def _fresh_after(self) -> float:
+        """Oldest created_at still within the TTL"""
+        return time.time() - self.ttl if self.ttl else 0.0
+
+    def _touch(self, key: str):
+        """Record a hit on an entry"""
+        self.conn.execute(
+            "UPDATE answers SET accessed_at = ?, hits = hits + 1 WHERE key = ?",
+            (time.time(), key),
+        )
+        self.conn.commit()
+
+    def get(self, model_name: str, query: str, docs: List[Document],
+            query_vector: Optional[List[float]] = None) -> Optional[Tuple[str, str]]:
+        """
+        Look up an answer for this question over these chunks
+
+        Tries the exact (model, normalized query, chunk set) key first, then,
+        if a query vector is given, the most similar cached question over
+        the same chunks.
+
+        Args:
+            model_name: LLM model name
+            query: User question
+            docs: Chunks that would be sent to the LLM
+            query_vector: Question embedding for near-duplicate lookup
+
+        Returns:
+            Tuple of (answer, "exact" or "semantic"), or None on a miss
+        """
+        context = context_key(docs)
+        key = answer_key(model_name, query, context)
+        fresh_after = self._fresh_after()
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT answer FROM answers WHERE key = ? AND created_at >= ?",
+                (key, fresh_after),
+            ).fetchone()
+            if row:
+                self._touch(key)
+                self.hits += 1
+                return row[0], "exact"
+
+            if query_vector is not None and self.similarity > 0:
+                rows = self.conn.execute("""
+                    SELECT key, query_vector, answer FROM answers
+                    WHERE model = ? AND context_key = ? AND created_at >= ?
+                      AND query_vector IS NOT NULL
+                """, (model_name, context, fresh_after)).fetchall()
+                if rows:
+                    target = np.asarray(query_vector, dtype=np.float32)
+                    vectors = np.vstack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+                    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(target)
+                    scores = vectors @ target / np.clip(norms, 1e-12, None)
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity:
+                        self._touch(rows[best][0])
+                        self.semantic_hits += 1
+                        return rows[best][2], "semantic"
+
+            self.misses += 1
+            return None
+
+    def put(self, model_name: str, query: str, docs: List[Document], answer: str,
+            query_vector: Optional[List[float]] = None):
+        """
+        Store an answer, dropping expired entries and evicting beyond the cap
+
+        Args:
+            model_name: LLM model name
+            query: User question
+            docs: Chunks that were sent to the LLM
+            answer: LLM answer
+            query_vector: Question embedding for near-duplicate lookup
+        """
+        context = context_key(docs)
+        key = answer_key(model_name, query, context)
+        vector = (np.asarray(query_vector, dtype=np.float32).tobytes()
+                  if query_vector is not None else None)
+        now = time.time()
+
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO answers
+                    (key, model, context_key, query, query_vector, answer, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, model_name, context, query, vector, answer, now, now))
+
+            if self.ttl:
+                self.conn.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl,))
+
+            count = self.conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute("""
+                    DELETE FROM answers WHERE key IN (
+                        SELECT key FROM answers ORDER BY accessed_at ASC LIMIT ?
+                    )
+                """, (count - self.max_entries,))
+                logger.info(f"Answer cache evicted {count - self.max_entries} answers")
+
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and size"""
+        with self._lock:
+            size = self.conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                'size': size,
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'similarity': self.similarity,
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.semantic_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    def clear(self):
+        """Remove all cached answers"""
+        with self._lock:
+            self.conn.execute("DELETE FROM answers")
+            self.conn.commit()
+
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,99 @@
+"""
+Article Parser for PMC Pages
+Extracts body text, abstract, figures and meta description from one download
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+from urllib.parse import urljoin
+
+
+@dataclass
+class ArticleRecord:
+    """Structured content of a single PMC article page"""
+
+    url: str
+    paragraphs: List[str] = field(default_factory=list)
+    abstract: Optional[str] = None
+    image_urls: List[str] = field(default_factory=list)
+    meta_description: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Body text with paragraphs separated by blank lines"""
+        return "\n\n".join(self.paragraphs).strip()
+
+    @property
+    def summary(self) -> Optional[str]:
+        """Abstract, falling back to the meta description"""
+        return self.abstract or self.meta_description
+
+
+def _absolute_url(img_url: str, article_url: str) -> str:
+    """Make an image URL absolute"""
+    if img_url.startswith("//"):
+        return "https:" + img_url
+    if img_url.startswith("/"):
+        return urljoin(article_url, img_url)
+    return img_url
+
+
+def parse_article(html: str, article_url: str) -> ArticleRecord:
+    """
+    Parse a PMC article page in a single pass
+
+    Args:
+        html: Raw page HTML
+        article_url: Page URL, used to resolve relative image links
+
+    Returns:
+        ArticleRecord with body paragraphs, abstract, figure URLs and meta description
+    """
+    from bs4 import BeautifulSoup  # deferred: keeps server startup light
+
+    soup = BeautifulSoup(html, "html.parser")
+    main_content = soup.find(id="maincontent") or soup.find("article")
+
+    # Body text
+    paragraphs = [p.get_text() for p in (main_content or soup).find_all("p")]
+
+    # Figure images first, then any other images in the main content
+    image_urls = []
+    figures = soup.find_all("figure") or soup.find_all("div", class_="figure")
+    for fig in figures:
+        img = fig.find("img")
+        if img and img.get("src"):
+            image_urls.append(_absolute_url(img["src"], article_url))
+
+    if main_content:
+        for img in main_content.find_all("img"):
+            if img.get("src"):
+                img_url = _absolute_url(img["src"], article_url)
+                if img_url not in image_urls:
+                    image_urls.append(img_url)
+
+    # Abstract: first paragraph after an "Abstract" heading
+    abstract = None
+    heading = soup.find(
+        lambda tag: tag.name
+        and tag.name.startswith("h")
+        and tag.string
+        and "abstract" in tag.string.lower()
+    )
+    if heading:
+        abstract_paragraph = heading.find_next("p")
+        if abstract_paragraph:
+            abstract = abstract_paragraph.get_text(strip=True) or None
+
+    meta_description = None
+    meta = soup.find("meta", {"name": "description"})
+    if meta and meta.get("content"):
+        meta_description = meta.get("content").strip() or None
+
+    return ArticleRecord(
+        url=article_url,
+        paragraphs=paragraphs,
+        abstract=abstract,
+        image_urls=image_urls,
+        meta_description=meta_description,
+    )
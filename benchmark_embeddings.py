@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Benchmark and Parity Check
+Compares torch, onnx and onnx-int8 on throughput, memory and retrieval results
+
+Usage:
+    python benchmark_embeddings.py [--limit 500] [--backends torch,onnx,onnx-int8]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sqlite3
+import time
+from typing import Dict, List
+
+import numpy as np
+
+QUERIES = [
+    "effects of microgravity on bone density",
+    "spaceflight changes in gene expression",
+    "radiation damage to DNA in astronauts",
+    "plant root growth in space",
+    "muscle atrophy during long duration missions",
+    "immune system response to spaceflight",
+    "oxidative stress in space",
+    "cardiovascular adaptation to weightlessness",
+]
+TOP_K = 10
+
+
+def load_titles(db_path: str, limit: int) -> List[str]:
+    """Load paper titles from papers.db as the benchmark corpus"""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT title FROM papers ORDER BY id LIMIT ?", (limit,)).fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+def run_backend(backend: str, texts: List[str]) -> Dict:
+    """Load one backend and embed the corpus (runs in a fresh process)"""
+    from main import load_embedding_model
+
+    started = time.perf_counter()
+    model = load_embedding_model(backend)
+    load_seconds = time.perf_counter() - started
+
+    model.embed_documents(texts[:8])  # warm-up
+
+    started = time.perf_counter()
+    doc_vectors = np.array(model.embed_documents(texts), dtype=np.float32)
+    embed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    query_vectors = np.array([model.embed_query(q) for q in QUERIES], dtype=np.float32)
+    query_ms = (time.perf_counter() - started) * 1000 / len(QUERIES)
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "texts_per_second": len(texts) / embed_seconds,
+        "query_ms": query_ms,
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "doc_vectors": doc_vectors,
+        "query_vectors": query_vectors,
+    }
+
+
+def top_k(query_vectors: np.ndarray, doc_vectors: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k most similar documents for each query"""
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--db", default="./papers.db")
+    parser.add_argument("--limit", type=int, default=500, help="Number of titles to embed")
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+    args = parser.parse_args()
+
+    texts = load_titles(args.db, args.limit)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    print(f"📊 Embedding {len(texts)} titles with: {', '.join(backends)}")
+
+    # One process per backend so load time and peak memory are measured in isolation
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in backends:
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (backend, texts))
+        r = results[backend]
+        print(
+            f"✅ {backend:10s} load {r['load_seconds']:6.2f}s | "
+            f"{r['texts_per_second']:8.1f} texts/s | query {r['query_ms']:6.2f} ms | "
+            f"peak RSS {r['peak_rss_mb']:7.1f} MB"
+        )
+
+    reference = results.get("torch") or results[backends[0]]
+    print(f"\n🔍 Parity against {reference['backend']} (top-{TOP_K} over {len(QUERIES)} queries)")
+    reference_top = top_k(reference["query_vectors"], reference["doc_vectors"], TOP_K)
+
+    for backend, r in results.items():
+        if r is reference:
+            continue
+        cosine = (r["doc_vectors"] * reference["doc_vectors"]).sum(axis=1)
+        backend_top = top_k(r["query_vectors"], r["doc_vectors"], TOP_K)
+        overlap = np.mean([
+            len(set(a) & set(b)) / TOP_K for a, b in zip(reference_top, backend_top)
+        ])
+        top1 = np.mean(reference_top[:, 0] == backend_top[:, 0])
+        print(
+            f"   {backend:10s} cosine mean {cosine.mean():.5f} min {cosine.min():.5f} | "
+            f"top-{TOP_K} overlap {overlap:.1%} | top-1 match {top1:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Server Startup Benchmark
+Measures import time, time to first /health response and time until ready per STARTUP_MODE
+
+Usage:
+    python benchmark_startup.py [--modes eager,background,lazy] [--runs 3]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def measure_import() -> float:
+    """Seconds to import main in a fresh interpreter"""
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_startup(mode: str, port: int, timeout: float) -> dict:
+    """
+    Start uvicorn in the given mode and poll /health
+
+    Returns:
+        Dictionary with seconds to first /health response and to ready (None on timeout)
+    """
+    env = dict(os.environ, STARTUP_MODE=mode)
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    first_response = None
+    ready = None
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    health = client.get(f"http://127.0.0.1:{port}/health").json()
+                except httpx.HTTPError:
+                    time.sleep(0.05)
+                    continue
+
+                if first_response is None:
+                    first_response = time.perf_counter() - started
+                if health.get("ready"):
+                    ready = time.perf_counter() - started
+                    break
+                if health.get("load_errors"):
+                    print(f"   ⚠️ {mode}: {health['load_errors']}")
+                    break
+                if mode == "lazy":
+                    # Nothing loads until a request needs it; trigger it like a first query would
+                    client.get(f"http://127.0.0.1:{port}/database-status", timeout=timeout)
+                time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {"first_response": first_response, "ready": ready}
+
+
+def summarize(values) -> str:
+    """Median of the successful runs"""
+    values = [v for v in values if v is not None]
+    return f"{statistics.median(values):6.2f}s" if values else "   n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--modes", default="eager,background,lazy")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--timeout", type=float, default=180.0)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    print(f"📦 import main: {summarize(imports)} (median of {args.runs})")
+
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        runs = [measure_startup(mode, args.port, args.timeout) for _ in range(args.runs)]
+        print(
+            f"🚀 {mode:10s} first /health {summarize(r['first_response'] for r in runs)} | "
+            f"ready {summarize(r['ready'] for r in runs)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Context Packing for LLM Prompts
+Deduplicates retrieved chunks, merges neighbours from the same paper and fills a token budget
+"""
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "8000"))
+CONTEXT_MAX_CHUNKS_PER_PAPER = int(os.getenv("CONTEXT_MAX_CHUNKS_PER_PAPER", "3"))
+# Rough token estimate for English scientific text (no tokenizer call per chunk)
+CHARS_PER_TOKEN = float(os.getenv("CONTEXT_CHARS_PER_TOKEN", "4"))
+
+# Longest chunk overlap looked for when joining neighbours (splitter overlap is 500)
+MAX_OVERLAP_CHARS = 1000
+# Minimum shared text counted as an overlap
+MIN_OVERLAP_CHARS = 20
+# Estimated tokens for the per-paper Title/PMCID/Source header in the prompt
+HEADER_TOKENS = 40
+PASSAGE_SEPARATOR = "\n[...]\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def join_overlapping(left: str, right: str, max_overlap: int = MAX_OVERLAP_CHARS) -> Optional[str]:
+    """
+    Join consecutive chunks, dropping the text they share
+
+    Args:
+        left: Earlier chunk
+        right: Following chunk
+        max_overlap: Longest overlap looked for
+
+    Returns:
+        Joined text, or None if right doesn't start with the end of left
+    """
+    tail = left[-max_overlap:]
+    probe = right[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return None
+    start = tail.find(probe)
+    while start != -1:
+        if right.startswith(tail[start:]):
+            return left + right[len(tail) - start:]
+        start = tail.find(probe, start + 1)
+    return None
+
+
+def _paper_key(doc: Document) -> str:
+    """Group chunks by PMCID, falling back to the paper link"""
+    return doc.metadata.get("pmcid") or doc.metadata.get("source") or ""
+
+
+def _chunk_index(doc: Document) -> Optional[int]:
+    """Position of a chunk within its paper, if recorded"""
+    try:
+        return int(doc.metadata["chunk_index"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _Paper:
+    """Chunks selected from one paper, keyed by position"""
+    first: Document
+    rank: int
+    chunks: Dict[int, str] = field(default_factory=dict)
+    unordered: List[str] = field(default_factory=list)
+
+    def passages(self) -> List[str]:
+        """Selected text in paper order, neighbours joined without their overlap"""
+        passages: List[str] = []
+        previous = None
+        for index in sorted(self.chunks):
+            text = self.chunks[index]
+            joined = None
+            if passages and previous == index - 1:
+                joined = join_overlapping(passages[-1], text)
+            if joined is not None:
+                passages[-1] = joined
+            else:
+                passages.append(text)
+            previous = index
+        return passages + self.unordered
+
+
+def pack_context(docs: List[Document], token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 max_chunks_per_paper: int = CONTEXT_MAX_CHUNKS_PER_PAPER
+                 ) -> Tuple[List[Document], Dict]:
+    """
+    Pack retrieved chunks into as few prompt tokens as possible
+
+    Chunks are taken best first: exact duplicates and chunks contained in an
+    already selected chunk of the same paper are dropped, each paper is
+    capped at max_chunks_per_paper so more distinct papers fit, and a chunk
+    that doesn't fit the remaining budget is skipped in favour of smaller
+    ones further down. Selected chunks are then grouped into one document
+    per paper, with neighbouring chunks joined and their overlap removed.
+
+    Args:
+        docs: Chunks ordered by relevance, best first
+        token_budget: Estimated tokens available for context
+        max_chunks_per_paper: Chunks kept per paper (0 for no limit)
+
+    Returns:
+        Tuple of (one document per paper in relevance order, stats dictionary)
+    """
+    papers: Dict[str, _Paper] = {}
+    seen = set()
+    used = 0
+    duplicates = 0
+    skipped = 0
+    selected = 0
+
+    for rank, doc in enumerate(docs):
+        key = _paper_key(doc)
+        text = doc.page_content
+        identity = (key, text)
+        paper = papers.get(key)
+        if identity in seen or (paper and any(
+                text in chunk for chunk in list(paper.chunks.values()) + paper.unordered)):
+            duplicates += 1
+            continue
+        seen.add(identity)
+
+        if (paper and max_chunks_per_paper
+                and len(paper.chunks) + len(paper.unordered) >= max_chunks_per_paper):
+            skipped += 1
+            continue
+
+        index = _chunk_index(doc)
+        cost = estimate_tokens(text) + (0 if paper else HEADER_TOKENS)
+        if paper and index is not None:
+            # A neighbour that is already selected shares its overlap with this chunk
+            for left, right in ((paper.chunks.get(index - 1), text),
+                                (text, paper.chunks.get(index + 1))):
+                if left is not None and right is not None:
+                    joined = join_overlapping(left, right)
+                    if joined is not None:
+                        cost -= estimate_tokens(left) + estimate_tokens(right) - estimate_tokens(joined)
+
+        if used + cost > token_budget:
+            if selected:
+                skipped += 1
+                continue
+            # Always send something: trim the best chunk to the budget
+            text = text[:int(max(token_budget - HEADER_TOKENS, 0) * CHARS_PER_TOKEN)]
+            cost = token_budget
+
+        if paper is None:
+            paper = papers[key] = _Paper(first=doc, rank=rank)
+        if index is not None and index not in paper.chunks:
+            paper.chunks[index] = text
+        else:
+            paper.unordered.append(text)
+        used += cost
+        selected += 1
+
+    packed = []
+    merged = 0
+    for paper in sorted(papers.values(), key=lambda p: p.rank):
+        passages = paper.passages()
+        merged += len(paper.chunks) + len(paper.unordered) - len(passages)
+        metadata = {
+            k: v for k, v in paper.first.metadata.items()
+            if k not in ("chunk_index", "rerank_score")
+        }
+        indexes = sorted(paper.chunks)
+        if indexes:
+            metadata["chunk_indexes"] = json.dumps(indexes)
+        packed.append(Document(page_content=PASSAGE_SEPARATOR.join(passages), metadata=metadata))
+
+    stats = {
+        'token_budget': token_budget,
+        'estimated_tokens': sum(estimate_tokens(doc.page_content) + HEADER_TOKENS for doc in packed),
+        'candidates': len(docs),
+        'chunks_used': selected,
+        'papers': len(packed),
+        'duplicates_dropped': duplicates,
+        'chunks_skipped': skipped,
+        'neighbours_merged': merged,
+    }
+    logger.info(
+        f"Packed {selected}/{len(docs)} chunks from {len(packed)} papers "
+        f"into ~{stats['estimated_tokens']} tokens (budget {token_budget})"
+    )
+    return packed, stats
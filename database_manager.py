@@ -3,38 +3,93 @@ SQLite3 Database Manager for NASA Space Biology Papers
 Tracks papers from CSV files and their loading status
 """
 
+import hashlib
+import json
+import re
 import sqlite3
-import pandas as pd
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from types import SimpleNamespace
 import logging
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows read per chunk when importing CSV files
+CSV_CHUNK_SIZE = 50000
+
+# Seconds a connection waits on a locked database before failing
+BUSY_TIMEOUT = 30.0
+
 
 class PaperDatabaseManager:
     """Manages SQLite database for tracking paper loading status"""
     
-    def __init__(self, db_path: str = "./papers.db"):
+    def __init__(self, db_path: str = "./papers.db", pooled: bool = True,
+                 busy_timeout: float = BUSY_TIMEOUT):
         """
         Initialize database manager
         
         Args:
             db_path: Path to SQLite database file
+            pooled: Give each thread its own connections; otherwise all
+                threads share a single connection
+            busy_timeout: Seconds to wait for a lock held by another writer
         """
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.pooled = pooled
+        self.busy_timeout = busy_timeout
+        self._local = threading.local() if pooled else SimpleNamespace()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self._init_database()
     
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection and register it for close()"""
+        if read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(
+                uri, uri=True, timeout=self.busy_timeout, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+            # WAL lets readers proceed while a writer commits
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Read-write connection for the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+    
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Read-write cursor for the current thread"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self.conn.cursor()
+        return cursor
+    
+    @property
+    def read_cursor(self) -> sqlite3.Cursor:
+        """Read-only cursor for the current thread"""
+        cursor = getattr(self._local, "read_cursor", None)
+        if cursor is None:
+            cursor = self._local.read_cursor = self._connect(read_only=True).cursor()
+        return cursor
+    
     def _init_database(self):
         """Initialize database and create tables if they don't exist"""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.cursor = self.conn.cursor()
-        
         # Create papers table
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS papers (
@@ -61,68 +116,254 @@ class PaperDatabaseManager:
             CREATE INDEX IF NOT EXISTS idx_isLoaded ON papers(isLoaded)
         """)
         
+        # Create ingestion jobs table
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                batch_size INTEGER NOT NULL,
+                elapsed_seconds REAL DEFAULT 0,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Papers assigned to each job and their outcome
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id INTEGER NOT NULL REFERENCES jobs(id),
+                paper_id INTEGER NOT NULL REFERENCES papers(id),
+                status TEXT NOT NULL DEFAULT 'pending',
+                chunks_created INTEGER DEFAULT 0,
+                error TEXT,
+                PRIMARY KEY (job_id, paper_id)
+            )
+        """)
+        
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items(job_id, status)
+        """)
+        
+        # Abstract column for databases created before it existed
+        self.cursor.execute("PRAGMA table_info(papers)")
+        if 'abstract' not in [row[1] for row in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE papers ADD COLUMN abstract TEXT")
+        
+        self.fts_enabled = self._init_fts()
+        self._init_catalog()
+        self._init_workflow_cache()
+        
         self.conn.commit()
         logger.info(f"Database initialized at {self.db_path}")
     
-    def load_csv(self, csv_url: str) -> Dict[str, int]:
+    def _init_fts(self) -> bool:
+        """
+        Create the FTS5 index over titles and abstracts, kept in sync by triggers
+        
+        Returns:
+            True if FTS5 is available, False to fall back to LIKE search
+        """
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'")
+        exists = self.cursor.fetchone() is not None
+        
+        try:
+            self.cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    title, abstract,
+                    content='papers', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, paper search falls back to LIKE: {e}")
+            return False
+        
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+                INSERT INTO papers_fts (rowid, title, abstract)
+                VALUES (new.id, new.title, new.abstract);
+            END
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+                INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+                VALUES ('delete', old.id, old.title, old.abstract);
+            END
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS papers_fts_au AFTER UPDATE OF title, abstract ON papers BEGIN
+                INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+                VALUES ('delete', old.id, old.title, old.abstract);
+                INSERT INTO papers_fts (rowid, title, abstract)
+                VALUES (new.id, new.title, new.abstract);
+            END
+        """)
+        
+        # Index rows that existed before the FTS table
+        if not exists:
+            self.cursor.execute("INSERT INTO papers_fts (papers_fts) VALUES ('rebuild')")
+            logger.info("Built full-text index for papers")
+        
+        return True
+    
+    def _init_catalog(self):
+        """
+        Create the loaded-paper catalog: a partial index for paging and a
+        single-row counter table kept current by triggers
+        """
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_catalog ON papers(loaded_at DESC, id)
+            WHERE isLoaded = TRUE
+        """)
+        
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS catalog_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                loaded_papers INTEGER NOT NULL,
+                loaded_chunks INTEGER NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            INSERT OR IGNORE INTO catalog_stats (id, loaded_papers, loaded_chunks)
+            SELECT 1, COUNT(*), COALESCE(SUM(chunks_created), 0)
+            FROM papers WHERE isLoaded = TRUE
+        """)
+        
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS catalog_ai AFTER INSERT ON papers
+            WHEN new.isLoaded = TRUE BEGIN
+                UPDATE catalog_stats
+                SET loaded_papers = loaded_papers + 1,
+                    loaded_chunks = loaded_chunks + COALESCE(new.chunks_created, 0)
+                WHERE id = 1;
+            END
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS catalog_ad AFTER DELETE ON papers
+            WHEN old.isLoaded = TRUE BEGIN
+                UPDATE catalog_stats
+                SET loaded_papers = loaded_papers - 1,
+                    loaded_chunks = loaded_chunks - COALESCE(old.chunks_created, 0)
+                WHERE id = 1;
+            END
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS catalog_au AFTER UPDATE OF isLoaded, chunks_created ON papers BEGIN
+                UPDATE catalog_stats
+                SET loaded_papers = loaded_papers
+                        + (new.isLoaded = TRUE) - (old.isLoaded = TRUE),
+                    loaded_chunks = loaded_chunks
+                        + CASE WHEN new.isLoaded = TRUE THEN COALESCE(new.chunks_created, 0) ELSE 0 END
+                        - CASE WHEN old.isLoaded = TRUE THEN COALESCE(old.chunks_created, 0) ELSE 0 END
+                WHERE id = 1;
+            END
+        """)
+    
+    def _init_workflow_cache(self):
+        """
+        Create tables caching /workflow LLM output: attributes per paper and
+        citation analyses per set of papers
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS paper_attributes (
+                paper_key TEXT PRIMARY KEY,
+                title TEXT,
+                author TEXT,
+                topic TEXT,
+                method TEXT,
+                result TEXT,
+                model TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS citation_analyses (
+                set_key TEXT PRIMARY KEY,
+                paper_keys TEXT NOT NULL,
+                citations TEXT NOT NULL,
+                model TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    
+    def load_csv(self, csv_url: str, chunksize: int = CSV_CHUNK_SIZE) -> Dict[str, int]:
         """
         Load papers from CSV file into database
         
+        The CSV is streamed in chunks, cleaned with vectorized string ops
+        and inserted with executemany in a single transaction.
+        
         Args:
             csv_url: URL or path to CSV file
+            chunksize: Number of rows read per chunk
             
         Returns:
             Dictionary with stats (total, added, duplicates)
         """
+        stats = {
+            'total': 0,
+            'added': 0,
+            'duplicates': 0,
+            'errors': 0
+        }
+        
+        self.cursor.execute("PRAGMA synchronous")
+        synchronous = self.cursor.fetchone()[0]
+        
         try:
-            # Read CSV
-            df = pd.read_csv(csv_url)
-            
-            # Ensure required columns exist
-            if 'Title' not in df.columns or 'Link' not in df.columns:
-                raise ValueError("CSV must contain 'Title' and 'Link' columns")
+            # Bulk-load tuning: fewer fsyncs, bigger page cache, temp data in memory
+            self.cursor.execute("PRAGMA synchronous = NORMAL")
+            self.cursor.execute("PRAGMA cache_size = -64000")
+            self.cursor.execute("PRAGMA temp_store = MEMORY")
             
-            stats = {
-                'total': len(df),
-                'added': 0,
-                'duplicates': 0,
-                'errors': 0
-            }
-            
-            # Process each row
-            for _, row in df.iterrows():
-                title = row['Title'].strip() if pd.notna(row['Title']) else ''
-                link = row['Link'].strip() if pd.notna(row['Link']) else ''
+            import pandas as pd  # deferred: only needed for CSV imports
+
+            for df in pd.read_csv(csv_url, chunksize=chunksize):
+                # Ensure required columns exist
+                if 'Title' not in df.columns or 'Link' not in df.columns:
+                    raise ValueError("CSV must contain 'Title' and 'Link' columns")
                 
-                if not title or not link:
-                    stats['errors'] += 1
-                    continue
+                stats['total'] += len(df)
                 
-                # Extract PMCID from link if available
-                pmcid = self._extract_pmcid(link)
+                titles = df['Title'].fillna('').astype(str).str.strip()
+                links = df['Link'].fillna('').astype(str).str.strip()
+                valid = (titles != '') & (links != '')
+                stats['errors'] += int((~valid).sum())
                 
-                try:
-                    # Insert paper (ignore if duplicate link)
-                    self.cursor.execute("""
-                        INSERT OR IGNORE INTO papers (title, link, pmcid, isLoaded)
-                        VALUES (?, ?, ?, FALSE)
-                    """, (title, link, pmcid))
-                    
-                    if self.cursor.rowcount > 0:
-                        stats['added'] += 1
-                    else:
-                        stats['duplicates'] += 1
-                        
-                except sqlite3.IntegrityError:
-                    stats['duplicates'] += 1
+                titles = titles[valid]
+                links = links[valid]
+                
+                # Extract PMCID from link (same rule as _extract_pmcid)
+                pmcids = 'PMC' + links.str.extract(r'PMC([^/]*)', expand=False).str.strip()
+                pmcids = pmcids.astype(object).where(pmcids.notna(), None)
+                
+                # Insert papers (ignore if duplicate link)
+                self.cursor.executemany("""
+                    INSERT OR IGNORE INTO papers (title, link, pmcid, isLoaded)
+                    VALUES (?, ?, ?, FALSE)
+                """, zip(titles.tolist(), links.tolist(), pmcids.tolist()))
+                # rowcount counts rows inserted into papers only, not FTS/catalog trigger writes
+                stats['added'] += max(self.cursor.rowcount, 0)
             
             self.conn.commit()
+            
+            stats['duplicates'] = stats['total'] - stats['errors'] - stats['added']
             logger.info(f"CSV loaded: {stats['added']} added, {stats['duplicates']} duplicates, {stats['errors']} errors")
             return stats
             
         except Exception as e:
+            self.conn.rollback()
             logger.error(f"Error loading CSV: {e}")
             raise
+        
+        finally:
+            self.cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
     
     def append_csv(self, csv_url: str) -> Dict[str, int]:
         """
@@ -202,6 +443,82 @@ class PaperDatabaseManager:
             logger.error(f"Error marking paper as abstracted: {e}")
             return False
     
+    def mark_many_as_loaded(self, papers: List[Tuple[str, int]]) -> Dict[str, bool]:
+        """
+        Mark several papers as loaded in a single transaction
+        
+        Args:
+            papers: List of (link, chunks_created) tuples
+            
+        Returns:
+            Dictionary mapping each link to True if updated, False if not found
+        """
+        results = {}
+        now = datetime.now()
+        try:
+            for link, chunks_created in papers:
+                self.cursor.execute("""
+                    UPDATE papers
+                    SET isLoaded = TRUE,
+                        loaded_at = ?,
+                        chunks_created = ?,
+                        updated_at = ?
+                    WHERE link = ?
+                """, (now, chunks_created, now, link))
+                results[link] = self.cursor.rowcount > 0
+            
+            self.conn.commit()
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error marking papers as loaded: {e}")
+            return {link: False for link, _ in papers}
+        
+        missing = [link for link, ok in results.items() if not ok]
+        logger.info(f"Marked {len(results) - len(missing)} papers as loaded")
+        if missing:
+            logger.warning(f"Papers not found in database: {missing}")
+        return results
+    
+    def mark_many_as_abstracted(self, papers: List[Tuple[str, int]],
+                                abstracts: Optional[Dict[str, str]] = None) -> Dict[str, bool]:
+        """
+        Mark several papers as abstracted in a single transaction
+        
+        Args:
+            papers: List of (link, chunks_created) tuples
+            abstracts: Optional map of link to abstract text to store (and index)
+            
+        Returns:
+            Dictionary mapping each link to True if updated, False if not found
+        """
+        results = {}
+        abstracts = abstracts or {}
+        now = datetime.now()
+        try:
+            for link, _ in papers:
+                self.cursor.execute("""
+                    UPDATE papers
+                    SET isAbstracted = TRUE,
+                        abstract = COALESCE(?, abstract),
+                        updated_at = ?
+                    WHERE link = ?
+                """, (abstracts.get(link), now, link))
+                results[link] = self.cursor.rowcount > 0
+            
+            self.conn.commit()
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error marking papers as abstracted: {e}")
+            return {link: False for link, _ in papers}
+        
+        missing = [link for link, ok in results.items() if not ok]
+        logger.info(f"Marked {len(results) - len(missing)} papers as abstracted")
+        if missing:
+            logger.warning(f"Papers not found in database: {missing}")
+        return results
+    
     def mark_as_loaded_by_pmcid(self, pmcid: str, chunks_created: int = 0) -> bool:
         """
         Mark a paper as loaded by PMCID
@@ -250,10 +567,10 @@ class PaperDatabaseManager:
         if limit:
             query += f" LIMIT {limit}"
         
-        self.cursor.execute(query)
+        self.read_cursor.execute(query)
         
         papers = []
-        for row in self.cursor.fetchall():
+        for row in self.read_cursor.fetchall():
             papers.append({
                 'id': row[0],
                 'title': row[1],
@@ -284,10 +601,10 @@ class PaperDatabaseManager:
         if limit:
             query += f" LIMIT {limit}"
         
-        self.cursor.execute(query)
+        self.read_cursor.execute(query)
         
         papers = []
-        for row in self.cursor.fetchall():
+        for row in self.read_cursor.fetchall():
             papers.append({
                 'id': row[0],
                 'title': row[1],
@@ -318,10 +635,10 @@ class PaperDatabaseManager:
         if limit:
             query += f" LIMIT {limit}"
         
-        self.cursor.execute(query)
+        self.read_cursor.execute(query)
         
         papers = []
-        for row in self.cursor.fetchall():
+        for row in self.read_cursor.fetchall():
             papers.append({
                 'id': row[0],
                 'title': row[1],
@@ -340,14 +657,14 @@ class PaperDatabaseManager:
         Returns:
             List of all paper dictionaries
         """
-        self.cursor.execute("""
+        self.read_cursor.execute("""
             SELECT id, title, link, pmcid, isLoaded, loaded_at, chunks_created, created_at
             FROM papers
             ORDER BY created_at ASC
         """)
         
         papers = []
-        for row in self.cursor.fetchall():
+        for row in self.read_cursor.fetchall():
             papers.append({
                 'id': row[0],
                 'title': row[1],
@@ -361,6 +678,52 @@ class PaperDatabaseManager:
         
         return papers
     
+    def get_catalog_stats(self) -> Dict:
+        """
+        Get loaded paper and chunk totals from the maintained catalog
+        
+        Returns:
+            Dictionary with loaded_papers and loaded_chunks
+        """
+        self.read_cursor.execute(
+            "SELECT loaded_papers, loaded_chunks FROM catalog_stats WHERE id = 1")
+        row = self.read_cursor.fetchone()
+        return {
+            'loaded_papers': row[0] if row else 0,
+            'loaded_chunks': row[1] if row else 0
+        }
+    
+    def get_catalog_page(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Get one page of loaded papers, most recently loaded first
+        
+        Args:
+            limit: Page size
+            offset: Number of papers to skip
+            
+        Returns:
+            List of paper dictionaries
+        """
+        self.read_cursor.execute("""
+            SELECT title, pmcid, link, chunks_created, loaded_at
+            FROM papers INDEXED BY idx_catalog
+            WHERE isLoaded = TRUE
+            ORDER BY loaded_at DESC, id
+            LIMIT ? OFFSET ?
+        """, (limit, offset))
+        
+        papers = []
+        for row in self.read_cursor.fetchall():
+            papers.append({
+                'title': row[0],
+                'pmcid': row[1] or "N/A",
+                'source': row[2],
+                'chunks_created': row[3],
+                'loaded_at': row[4]
+            })
+        
+        return papers
+    
     def get_paper_by_link(self, link: str) -> Optional[Dict]:
         """
         Get a specific paper by its link
@@ -371,13 +734,13 @@ class PaperDatabaseManager:
         Returns:
             Paper dictionary or None if not found
         """
-        self.cursor.execute("""
+        self.read_cursor.execute("""
             SELECT id, title, link, pmcid, isLoaded, loaded_at, chunks_created, created_at
             FROM papers
             WHERE link = ?
         """, (link,))
         
-        row = self.cursor.fetchone()
+        row = self.read_cursor.fetchone()
         if row:
             return {
                 'id': row[0],
@@ -391,6 +754,163 @@ class PaperDatabaseManager:
             }
         return None
     
+    def get_papers_by_links(self, links: List[str]) -> Dict[str, Dict]:
+        """
+        Get several papers by link in batched queries
+        
+        Args:
+            links: Paper links/URLs
+        
+        Returns:
+            Dictionary of link to paper dictionary for the links found
+        """
+        papers = {}
+        links = list(dict.fromkeys(links))
+        
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(links), 500):
+            batch = links[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self.read_cursor.execute(f"""
+                SELECT id, title, link, pmcid, isLoaded, loaded_at, chunks_created, created_at
+                FROM papers
+                WHERE link IN ({placeholders})
+            """, batch)
+        
+            for row in self.read_cursor.fetchall():
+                papers[row[2]] = {
+                    'id': row[0],
+                    'title': row[1],
+                    'link': row[2],
+                    'pmcid': row[3],
+                    'isLoaded': bool(row[4]),
+                    'loaded_at': row[5],
+                    'chunks_created': row[6],
+                    'created_at': row[7]
+                }
+        
+        return papers
+    
+    def get_paper_attributes(self, paper_keys: List[str]) -> Dict[str, Dict]:
+        """
+        Get cached workflow attributes for several papers
+        
+        Args:
+            paper_keys: Paper PMCIDs (or links for papers without one)
+        
+        Returns:
+            Dictionary of paper key to attribute dictionary for the papers cached
+        """
+        attributes = {}
+        paper_keys = list(dict.fromkeys(paper_keys))
+        
+        for start in range(0, len(paper_keys), 500):
+            batch = paper_keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self.read_cursor.execute(f"""
+                SELECT paper_key, title, author, topic, method, result
+                FROM paper_attributes
+                WHERE paper_key IN ({placeholders})
+            """, batch)
+        
+            for row in self.read_cursor.fetchall():
+                attributes[row[0]] = {
+                    'title': row[1],
+                    'author': row[2],
+                    'topic': row[3],
+                    'method': row[4],
+                    'result': row[5]
+                }
+        
+        return attributes
+    
+    def save_paper_attributes(self, attributes: Dict[str, Dict], model: Optional[str] = None):
+        """
+        Cache workflow attributes for papers
+        
+        Args:
+            attributes: Dictionary of paper key to attribute dictionary
+                (title, author, topic, method, result)
+            model: LLM model that extracted them
+        """
+        rows = [
+            (key, attrs.get('title'), attrs.get('author'), attrs.get('topic'),
+             attrs.get('method'), attrs.get('result'), model)
+            for key, attrs in attributes.items()
+        ]
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO paper_attributes
+                (paper_key, title, author, topic, method, result, model)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        self.conn.commit()
+    
+    def get_papers_without_attributes(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get loaded papers that have no cached workflow attributes
+        
+        Args:
+            limit: Maximum number of papers to return (None for all)
+        
+        Returns:
+            List of paper dictionaries
+        """
+        query = """
+            SELECT p.id, p.title, p.link, p.pmcid
+            FROM papers p
+            LEFT JOIN paper_attributes a ON a.paper_key = COALESCE(NULLIF(p.pmcid, ''), p.link)
+            WHERE p.isLoaded = TRUE AND a.paper_key IS NULL
+            ORDER BY p.loaded_at DESC
+        """
+        params = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+        
+        self.read_cursor.execute(query, params)
+        return [
+            {'id': row[0], 'title': row[1], 'link': row[2], 'pmcid': row[3]}
+            for row in self.read_cursor.fetchall()
+        ]
+    
+    def _citation_set_key(self, paper_keys: List[str]) -> str:
+        """Order-independent key for a set of papers"""
+        return hashlib.sha256("\n".join(sorted(set(paper_keys))).encode("utf-8")).hexdigest()
+    
+    def get_citation_analysis(self, paper_keys: List[str]) -> Optional[List[Dict]]:
+        """
+        Get the cached citation analysis for a set of papers
+        
+        Args:
+            paper_keys: Paper PMCIDs (or links), in any order
+        
+        Returns:
+            List of citations ({'from', 'to', 'reason'} with paper keys), or None if not cached
+        """
+        self.read_cursor.execute(
+            "SELECT citations FROM citation_analyses WHERE set_key = ?",
+            (self._citation_set_key(paper_keys),)
+        )
+        row = self.read_cursor.fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def save_citation_analysis(self, paper_keys: List[str], citations: List[Dict],
+                               model: Optional[str] = None):
+        """
+        Cache the citation analysis for a set of papers
+        
+        Args:
+            paper_keys: Paper PMCIDs (or links), in any order
+            citations: Citations ({'from', 'to', 'reason'} with paper keys)
+            model: LLM model that produced them
+        """
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO citation_analyses (set_key, paper_keys, citations, model)
+            VALUES (?, ?, ?, ?)
+        """, (self._citation_set_key(paper_keys), json.dumps(sorted(set(paper_keys))),
+              json.dumps(citations), model))
+        self.conn.commit()
+    
     def get_stats(self) -> Dict:
         """
         Get database statistics
@@ -399,19 +919,19 @@ class PaperDatabaseManager:
             Dictionary with various statistics
         """
         # Total papers
-        self.cursor.execute("SELECT COUNT(*) FROM papers")
-        total = self.cursor.fetchone()[0]
+        self.read_cursor.execute("SELECT COUNT(*) FROM papers")
+        total = self.read_cursor.fetchone()[0]
         
         # Loaded papers
-        self.cursor.execute("SELECT COUNT(*) FROM papers WHERE isLoaded = TRUE")
-        loaded = self.cursor.fetchone()[0]
+        self.read_cursor.execute("SELECT COUNT(*) FROM papers WHERE isLoaded = TRUE")
+        loaded = self.read_cursor.fetchone()[0]
         
         # Unloaded papers
         unloaded = total - loaded
         
         # Total chunks
-        self.cursor.execute("SELECT SUM(chunks_created) FROM papers WHERE isLoaded = TRUE")
-        total_chunks = self.cursor.fetchone()[0] or 0
+        self.read_cursor.execute("SELECT SUM(chunks_created) FROM papers WHERE isLoaded = TRUE")
+        total_chunks = self.read_cursor.fetchone()[0] or 0
         
         # Average chunks per paper
         avg_chunks = total_chunks / loaded if loaded > 0 else 0
@@ -425,17 +945,64 @@ class PaperDatabaseManager:
             'loading_progress': round((loaded / total * 100), 2) if total > 0 else 0
         }
     
-    def search_papers(self, query: str, loaded_only: bool = False) -> List[Dict]:
+    def search_papers(self, query: str, loaded_only: bool = False,
+                      limit: int = 50, offset: int = 0) -> List[Dict]:
         """
-        Search papers by title
+        Search papers by title and abstract
+        
+        Uses the FTS5 index with BM25 ranking (title weighted above abstract)
+        and prefix matching on every query term.
         
         Args:
             query: Search query
             loaded_only: Only return loaded papers
+            limit: Maximum number of results
+            offset: Number of results to skip (pagination)
             
         Returns:
-            List of matching paper dictionaries
+            List of matching paper dictionaries, best match first
         """
+        if not self.fts_enabled:
+            return self._search_papers_like(query, loaded_only, limit, offset)
+        
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"*' for term in terms)
+        
+        sql = """
+            SELECT p.id, p.title, p.link, p.pmcid, p.isLoaded, p.loaded_at, p.chunks_created,
+                   bm25(papers_fts, 10.0, 1.0) AS score
+            FROM papers_fts
+            JOIN papers p ON p.id = papers_fts.rowid
+            WHERE papers_fts MATCH ?
+        """
+        
+        if loaded_only:
+            sql += " AND p.isLoaded = TRUE"
+        
+        sql += " ORDER BY score LIMIT ? OFFSET ?"
+        
+        self.read_cursor.execute(sql, (match, limit, offset))
+        
+        papers = []
+        for row in self.read_cursor.fetchall():
+            papers.append({
+                'id': row[0],
+                'title': row[1],
+                'link': row[2],
+                'pmcid': row[3],
+                'isLoaded': bool(row[4]),
+                'loaded_at': row[5],
+                'chunks_created': row[6],
+                'score': round(-row[7], 4)
+            })
+        
+        return papers
+    
+    def _search_papers_like(self, query: str, loaded_only: bool,
+                            limit: int, offset: int) -> List[Dict]:
+        """Search papers by title substring (used when FTS5 is unavailable)"""
         sql = """
             SELECT id, title, link, pmcid, isLoaded, loaded_at, chunks_created
             FROM papers
@@ -445,12 +1012,12 @@ class PaperDatabaseManager:
         if loaded_only:
             sql += " AND isLoaded = TRUE"
         
-        sql += " ORDER BY created_at DESC"
+        sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
         
-        self.cursor.execute(sql, (f"%{query}%",))
+        self.read_cursor.execute(sql, (f"%{query}%", limit, offset))
         
         papers = []
-        for row in self.cursor.fetchall():
+        for row in self.read_cursor.fetchall():
             papers.append({
                 'id': row[0],
                 'title': row[1],
@@ -463,6 +1030,232 @@ class PaperDatabaseManager:
         
         return papers
     
+    def create_load_job(self, limit: Optional[int], batch_size: int) -> Dict:
+        """
+        Create a paper loading job over the current unloaded papers
+        
+        Papers already pending in another active job are not assigned twice.
+        
+        Args:
+            limit: Maximum number of papers to load (None for all)
+            batch_size: Number of papers processed per batch
+            
+        Returns:
+            Job dictionary
+        """
+        self.cursor.execute("""
+            INSERT INTO jobs (kind, status, batch_size)
+            VALUES ('load_papers', 'queued', ?)
+        """, (batch_size,))
+        job_id = self.cursor.lastrowid
+        
+        query = """
+            INSERT INTO job_items (job_id, paper_id)
+            SELECT ?, id FROM papers
+            WHERE isLoaded = FALSE
+              AND id NOT IN (
+                  SELECT ji.paper_id FROM job_items ji
+                  JOIN jobs j ON j.id = ji.job_id
+                  WHERE ji.status = 'pending' AND j.status IN ('queued', 'running')
+              )
+            ORDER BY created_at ASC
+        """
+        params = [job_id]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        self.cursor.execute(query, params)
+        self.conn.commit()
+        logger.info(f"Created load job {job_id} with {self.cursor.rowcount} papers")
+        return self.get_job(job_id)
+    
+    def get_job_batch(self, job_id: int, batch_size: int) -> List[Dict]:
+        """
+        Get the next pending papers of a job
+        
+        Papers that were loaded before a crash but not yet recorded
+        against the job are marked done first, so they aren't scraped twice.
+        
+        Args:
+            job_id: Job ID
+            batch_size: Maximum number of papers to return
+            
+        Returns:
+            List of paper dictionaries
+        """
+        self.cursor.execute("""
+            UPDATE job_items
+            SET status = 'done',
+                chunks_created = (SELECT chunks_created FROM papers WHERE id = paper_id)
+            WHERE job_id = ? AND status = 'pending'
+              AND paper_id IN (SELECT id FROM papers WHERE isLoaded = TRUE)
+        """, (job_id,))
+        self.conn.commit()
+        
+        self.cursor.execute("""
+            SELECT p.id, p.title, p.link, p.pmcid, p.created_at
+            FROM job_items ji
+            JOIN papers p ON p.id = ji.paper_id
+            WHERE ji.job_id = ? AND ji.status = 'pending'
+            ORDER BY p.created_at ASC
+            LIMIT ?
+        """, (job_id, batch_size))
+        
+        papers = []
+        for row in self.cursor.fetchall():
+            papers.append({
+                'id': row[0],
+                'title': row[1],
+                'link': row[2],
+                'pmcid': row[3],
+                'created_at': row[4]
+            })
+        
+        return papers
+    
+    def record_job_batch(self, job_id: int, loaded: Dict[int, int],
+                         failed: Dict[int, str], elapsed_seconds: float):
+        """
+        Record the outcome of one job batch in a single transaction
+        
+        Args:
+            job_id: Job ID
+            loaded: Map of paper ID to chunks created
+            failed: Map of paper ID to error message
+            elapsed_seconds: Wall time spent on the batch
+        """
+        self.cursor.executemany("""
+            UPDATE job_items SET status = 'done', chunks_created = ?
+            WHERE job_id = ? AND paper_id = ?
+        """, [(chunks, job_id, paper_id) for paper_id, chunks in loaded.items()])
+        self.cursor.executemany("""
+            UPDATE job_items SET status = 'failed', error = ?
+            WHERE job_id = ? AND paper_id = ?
+        """, [(error, job_id, paper_id) for paper_id, error in failed.items()])
+        self.cursor.execute("""
+            UPDATE jobs
+            SET elapsed_seconds = elapsed_seconds + ?,
+                updated_at = ?
+            WHERE id = ?
+        """, (elapsed_seconds, datetime.now(), job_id))
+        self.conn.commit()
+    
+    def set_job_status(self, job_id: int, status: str, error: Optional[str] = None):
+        """
+        Update job status
+        
+        Args:
+            job_id: Job ID
+            status: One of queued, running, completed, failed
+            error: Error message for failed jobs
+        """
+        now = datetime.now()
+        self.cursor.execute("""
+            UPDATE jobs
+            SET status = ?,
+                error = ?,
+                started_at = CASE WHEN ? = 'running' THEN COALESCE(started_at, ?) ELSE started_at END,
+                finished_at = CASE WHEN ? IN ('completed', 'failed') THEN ? ELSE finished_at END,
+                updated_at = ?
+            WHERE id = ?
+        """, (status, error, status, now, status, now, now, job_id))
+        self.conn.commit()
+    
+    def get_resumable_jobs(self) -> List[int]:
+        """
+        Get jobs that were queued or interrupted while running
+        
+        Returns:
+            List of job IDs, oldest first
+        """
+        self.read_cursor.execute("""
+            SELECT id FROM jobs
+            WHERE status IN ('queued', 'running')
+            ORDER BY id ASC
+        """)
+        return [row[0] for row in self.read_cursor.fetchall()]
+    
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """
+        Get job progress, throughput and failures
+        
+        Args:
+            job_id: Job ID
+            
+        Returns:
+            Job dictionary or None if not found
+        """
+        self.read_cursor.execute("""
+            SELECT id, kind, status, batch_size, elapsed_seconds, error,
+                   created_at, started_at, finished_at
+            FROM jobs WHERE id = ?
+        """, (job_id,))
+        row = self.read_cursor.fetchone()
+        if not row:
+            return None
+        
+        job = {
+            'id': row[0],
+            'kind': row[1],
+            'status': row[2],
+            'batch_size': row[3],
+            'elapsed_seconds': round(row[4] or 0, 2),
+            'error': row[5],
+            'created_at': row[6],
+            'started_at': row[7],
+            'finished_at': row[8],
+        }
+        
+        self.read_cursor.execute("""
+            SELECT COUNT(*),
+                   SUM(status = 'done'),
+                   SUM(status = 'failed'),
+                   SUM(CASE WHEN status = 'done' THEN chunks_created ELSE 0 END)
+            FROM job_items WHERE job_id = ?
+        """, (job_id,))
+        total, done, failed, chunks = self.read_cursor.fetchone()
+        done, failed, chunks = done or 0, failed or 0, chunks or 0
+        elapsed = row[4] or 0
+        
+        job.update({
+            'total_papers': total,
+            'papers_done': done,
+            'papers_failed': failed,
+            'papers_pending': total - done - failed,
+            'chunks_created': chunks,
+            'progress': round((done + failed) / total * 100, 2) if total > 0 else 100.0,
+            'papers_per_second': round(done / elapsed, 3) if elapsed > 0 else 0,
+            'chunks_per_second': round(chunks / elapsed, 3) if elapsed > 0 else 0,
+        })
+        
+        self.read_cursor.execute("""
+            SELECT p.title, p.link, ji.error
+            FROM job_items ji
+            JOIN papers p ON p.id = ji.paper_id
+            WHERE ji.job_id = ? AND ji.status = 'failed'
+        """, (job_id,))
+        job['failures'] = [
+            {'title': r[0], 'link': r[1], 'error': r[2]}
+            for r in self.read_cursor.fetchall()
+        ]
+        
+        return job
+    
+    def list_jobs(self, limit: int = 20) -> List[Dict]:
+        """
+        Get the most recent jobs
+        
+        Args:
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            List of job dictionaries, newest first
+        """
+        self.read_cursor.execute("SELECT id FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        job_ids = [row[0] for row in self.read_cursor.fetchall()]
+        return [self.get_job(job_id) for job_id in job_ids]
+    
     def reset_database(self) -> bool:
         """
         Clear all papers from database
@@ -471,7 +1264,11 @@ class PaperDatabaseManager:
             True if successful
         """
         try:
+            self.cursor.execute("DELETE FROM job_items")
+            self.cursor.execute("DELETE FROM jobs")
             self.cursor.execute("DELETE FROM papers")
+            self.cursor.execute("DELETE FROM paper_attributes")
+            self.cursor.execute("DELETE FROM citation_analyses")
             self.conn.commit()
             logger.info("Database reset successfully")
             return True
@@ -498,9 +1295,13 @@ class PaperDatabaseManager:
         return None
     
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close all database connections"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local() if self.pooled else SimpleNamespace()
+        if connections:
             logger.info("Database connection closed")
     
     def __enter__(self):
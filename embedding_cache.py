@@ -0,0 +1,271 @@
+"""
+Persistent Embedding Cache
+Reuses vectors for text that was already embedded by the same model
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.db")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "0"))  # seconds, 0 = no expiry
+
+
+def normalize_text(text: str) -> str:
+    """Normalize unicode and collapse whitespace before hashing"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    """Cache key for a (model, normalized text) pair"""
+    data = f"{model_name}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class EmbeddingStore:
+    """SQLite store of embedding vectors as compact blobs with LRU eviction"""
+
+    def __init__(self, db_path: str = EMBEDDING_CACHE_PATH,
+                 max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+                 dtype: str = EMBEDDING_CACHE_DTYPE):
+        """
+        Initialize store
+
+        Args:
+            db_path: Path to SQLite database file
+            max_entries: Number of vectors kept; least recently used are evicted
+            dtype: Storage precision, "float32" or "float16"
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dtype TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings(accessed_at)
+        """)
+        self.conn.commit()
+        # Kept up to date by put_many so writes don't need a COUNT(*)
+        self._count = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up vectors
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary of key to vector for the keys found
+        """
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT key, dtype, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, dtype, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=dtype).astype(np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self.conn.commit()
+
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """
+        Store vectors and evict the least recently used beyond the cap
+
+        Args:
+            items: Dictionary of key to vector
+        """
+        now = time.time()
+        rows = [
+            (key, self.dtype.name, np.asarray(vector, dtype=self.dtype).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            # Update existing keys, then insert the rest; the insert's rowcount
+            # is the number of new vectors
+            self.conn.executemany("""
+                UPDATE embeddings SET dtype = ?, vector = ?, accessed_at = ? WHERE key = ?
+            """, [(dtype, vector, accessed_at, key) for key, dtype, vector, accessed_at in rows])
+            cursor = self.conn.executemany("""
+                INSERT OR IGNORE INTO embeddings (key, dtype, vector, accessed_at)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            self._count += max(cursor.rowcount, 0)
+
+            if self._count > self.max_entries:
+                cursor = self.conn.execute("""
+                    DELETE FROM embeddings WHERE key IN (
+                        SELECT key FROM embeddings ORDER BY accessed_at ASC LIMIT ?
+                    )
+                """, (self._count - self.max_entries,))
+                self._count -= cursor.rowcount
+                logger.info(f"Embedding cache evicted {cursor.rowcount} vectors")
+
+            self.conn.commit()
+
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+class QueryEmbeddingLRU:
+    """Thread-safe in-memory LRU of query vectors with optional TTL"""
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL):
+        """
+        Initialize LRU
+
+        Args:
+            max_size: Number of vectors kept
+            ttl: Seconds a vector stays valid (0 for no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get a vector, or None if missing or expired"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            stored_at, vector = item
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: List[float]):
+        """Store a vector, evicting the least recently used beyond the cap"""
+        with self._lock:
+            self._items[key] = (time.monotonic(), vector)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and size"""
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only runs the model on texts it hasn't seen"""
+
+    def __init__(self, underlying: Embeddings, model_name: str,
+                 store: Optional[EmbeddingStore] = None,
+                 query_cache: Optional[QueryEmbeddingLRU] = None):
+        """
+        Initialize wrapper
+
+        Args:
+            underlying: Embedding model to call on cache misses
+            model_name: Model name, part of the cache key
+            store: Persistent store for document vectors (None to disable)
+            query_cache: In-memory LRU for query vectors (None to disable)
+        """
+        self.underlying = underlying
+        self.model_name = model_name
+        self.store = store
+        self.query_cache = query_cache
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, computing only the vectors missing from the cache"""
+        if self.store is None:
+            return self.underlying.embed_documents(texts)
+
+        keys = [cache_key(self.model_name, text) for text in texts]
+        cached = self.store.get_many(list(set(keys)))
+
+        # Embed each missing text once, even if it repeats in the batch
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.store.put_many(computed)
+            cached.update(computed)
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing the vector of a recent identical query"""
+        if self.query_cache is None:
+            return self.underlying.embed_query(text)
+
+        # The LRU may be shared across backends, so the model is part of the key
+        key = cache_key(self.model_name, text)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self.query_cache.put(key, vector)
+        return vector
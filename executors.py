@@ -0,0 +1,74 @@
+"""
+Executor Pools for Blocking Work
+Keeps embedding, network and SQLite calls off the FastAPI event loop
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+CPU_WORKERS = int(os.getenv("EXECUTOR_CPU_WORKERS", str(os.cpu_count() or 2)))
+IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "16"))
+# Each db worker thread gets its own SQLite connection (WAL: readers don't block)
+DB_WORKERS = int(os.getenv("EXECUTOR_DB_WORKERS", "4"))
+
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_sizes = {"cpu": CPU_WORKERS, "io": IO_WORKERS, "db": DB_WORKERS}
+
+
+def get_pool(name: str) -> ThreadPoolExecutor:
+    """
+    Get a named executor, creating it on first use
+
+    Args:
+        name: Pool name ("cpu", "io" or "db")
+
+    Returns:
+        ThreadPoolExecutor bounded by the configured size
+    """
+    pool = _pools.get(name)
+    if pool is None:
+        if name not in _sizes:
+            raise ValueError(f"Unknown executor pool: {name}")
+        pool = ThreadPoolExecutor(
+            max_workers=_sizes[name], thread_name_prefix=f"{name}-pool")
+        _pools[name] = pool
+    return pool
+
+
+async def run_in_pool(name: str, func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on a named pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_pool(name), functools.partial(func, *args, **kwargs))
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """Run embedding, vector search or HTML parsing work"""
+    return await run_in_pool("cpu", func, *args, **kwargs)
+
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking network or disk work (LLM calls, CSV downloads, caches)"""
+    return await run_in_pool("io", func, *args, **kwargs)
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """Run SQLite work"""
+    return await run_in_pool("db", func, *args, **kwargs)
+
+
+def shutdown_pools(wait: bool = True):
+    """Shut down all executors"""
+    for name, pool in list(_pools.items()):
+        pool.shutdown(wait=wait)
+        del _pools[name]
+    logger.info("Executor pools shut down")
@@ -0,0 +1,229 @@
+"""
+On-Disk HTML Cache for PMC Articles
+Content-addressed, compressed storage with conditional revalidation and LRU eviction
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+HTML_CACHE_DIR = os.getenv("HTML_CACHE_DIR", "./html_cache")
+HTML_CACHE_MAX_BYTES = int(os.getenv("HTML_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+HTML_CACHE_MAX_AGE = float(os.getenv("HTML_CACHE_MAX_AGE", str(24 * 3600)))
+HTML_CACHE_OFFLINE = os.getenv("HTML_CACHE_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+class CacheMissError(LookupError):
+    """Raised in offline mode when a URL is not cached"""
+
+
+@dataclass
+class CachedPage:
+    """A cached response body with its validators"""
+
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class HtmlCache:
+    """Stores raw article responses on disk, keyed by URL and content hash"""
+
+    def __init__(
+        self,
+        cache_dir: str = HTML_CACHE_DIR,
+        max_bytes: int = HTML_CACHE_MAX_BYTES,
+        max_age: float = HTML_CACHE_MAX_AGE,
+        offline: bool = HTML_CACHE_OFFLINE,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Directory holding the index and compressed bodies
+            max_bytes: Size cap for compressed bodies; least recently used are evicted
+            max_age: Seconds a page is served without revalidation
+            offline: Never touch the network, serve only cached pages
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.offline = offline
+        self._lock = threading.Lock()
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            str(self.cache_dir / "index.db"), check_same_thread=False)
+        self._init_index()
+
+    def _init_index(self):
+        """Create index tables if they don't exist"""
+        with self._lock:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL REFERENCES blobs(digest),
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_blobs_accessed ON blobs(accessed_at)
+            """)
+            self.conn.commit()
+
+    def _blob_path(self, digest: str) -> Path:
+        """Path of a compressed body"""
+        return self.objects_dir / digest[:2] / f"{digest}.zz"
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Get a cached page
+
+        Args:
+            url: Page URL
+
+        Returns:
+            CachedPage or None if not cached
+        """
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT digest, etag, last_modified, fetched_at
+                FROM pages WHERE url = ?
+            """, (url,)).fetchone()
+            if not row:
+                return None
+
+            digest, etag, last_modified, fetched_at = row
+            try:
+                body = zlib.decompress(
+                    self._blob_path(digest).read_bytes()).decode("utf-8")
+            except (OSError, zlib.error) as e:
+                logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self.conn.commit()
+                return None
+
+            self.conn.execute(
+                "UPDATE blobs SET accessed_at = ? WHERE digest = ?", (time.time(), digest))
+            self.conn.commit()
+
+        return CachedPage(url, body, etag, last_modified, fetched_at)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Whether a page can be served without revalidation"""
+        return time.time() - page.fetched_at < self.max_age
+
+    def put(self, url: str, body: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """
+        Store a page
+
+        Args:
+            url: Page URL
+            body: Response body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        raw = body.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(digest)
+        now = time.time()
+
+        with self._lock:
+            if not path.exists():
+                data = zlib.compress(raw, 6)
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+                size = len(data)
+            else:
+                size = path.stat().st_size
+
+            self.conn.execute("""
+                INSERT INTO blobs (digest, size, accessed_at) VALUES (?, ?, ?)
+                ON CONFLICT(digest) DO UPDATE SET accessed_at = excluded.accessed_at
+            """, (digest, size, now))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO pages (url, digest, etag, last_modified, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (url, digest, etag, last_modified, now))
+            self._evict()
+            self.conn.commit()
+
+    def touch(self, url: str):
+        """Mark a page as revalidated (304 Not Modified)"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def _evict(self):
+        """Remove least recently used bodies until under the size cap"""
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            "SELECT digest, size FROM blobs ORDER BY accessed_at ASC").fetchall()
+        evicted = 0
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM pages WHERE digest = ?", (digest,))
+            self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            self._blob_path(digest).unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        logger.info(f"HTML cache evicted {evicted} entries")
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with page count, body count and compressed size
+        """
+        with self._lock:
+            pages = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return {
+            'pages': pages,
+            'bodies': blobs,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'offline': self.offline,
+        }
+
+    def close(self):
+        """Close index connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,111 @@
+"""
+Background Ingestion Job Queue
+Runs paper loading jobs persisted in papers.db in resumable batches
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from database_manager import PaperDatabaseManager
+from executors import run_db
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "20"))
+
+# Takes a batch of papers, returns ({paper_id: chunks_created}, {paper_id: error})
+BatchProcessor = Callable[[List[Dict]], Awaitable[Tuple[Dict[int, int], Dict[int, str]]]]
+
+
+class IngestJobQueue:
+    """Single-worker queue that processes loading jobs batch by batch"""
+
+    def __init__(self, db_manager: PaperDatabaseManager, process_batch: BatchProcessor,
+                 batch_size: int = JOB_BATCH_SIZE):
+        """
+        Initialize job queue
+
+        Args:
+            db_manager: Database manager holding jobs and papers
+            process_batch: Coroutine that scrapes, chunks and embeds a batch
+            batch_size: Number of papers per batch
+        """
+        self.db_manager = db_manager
+        self.process_batch = process_batch
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Re-enqueue interrupted jobs and start the worker"""
+        for job_id in await run_db(self.db_manager.get_resumable_jobs):
+            logger.info(f"Resuming job {job_id}")
+            self._queue.put_nowait(job_id)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker; running jobs resume on next start"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, num_papers: Optional[int]) -> Dict:
+        """
+        Create and enqueue a loading job
+
+        Args:
+            num_papers: Maximum number of papers to load (None for all)
+
+        Returns:
+            Job dictionary
+        """
+        job = await run_db(self.db_manager.create_load_job, num_papers, self.batch_size)
+        if job["total_papers"] == 0:
+            await run_db(self.db_manager.set_job_status, job["id"], "completed")
+            return await run_db(self.db_manager.get_job, job["id"])
+
+        self._queue.put_nowait(job["id"])
+        return job
+
+    async def _run(self):
+        """Process queued jobs one at a time"""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                await run_db(self.db_manager.set_job_status, job_id, "failed", str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: int):
+        """Process all pending papers of a job in batches"""
+        await run_db(self.db_manager.set_job_status, job_id, "running")
+
+        while True:
+            batch = await run_db(self.db_manager.get_job_batch, job_id, self.batch_size)
+            if not batch:
+                break
+
+            started = time.monotonic()
+            loaded, failed = await self.process_batch(batch)
+            elapsed = time.monotonic() - started
+
+            await run_db(self.db_manager.record_job_batch, job_id, loaded, failed, elapsed)
+            logger.info(
+                f"Job {job_id}: batch of {len(batch)} done "
+                f"({len(loaded)} loaded, {len(failed)} failed, {elapsed:.1f}s)"
+            )
+
+        await run_db(self.db_manager.set_job_status, job_id, "completed")
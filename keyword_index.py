@@ -0,0 +1,233 @@
+"""
+Keyword Index for Chunk Retrieval
+BM25 full-text index over chunk text, kept in step with the Chroma collections
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+KEYWORD_INDEX_PATH = os.getenv("KEYWORD_INDEX_PATH", "./keyword_index.db")
+
+# Records read per Chroma page when rebuilding an index
+SYNC_BATCH_SIZE = 1000
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query that matches any of its terms
+
+    Each whitespace-separated term is quoted, so names such as "IL-6" or
+    "NF-kB" become phrases of their parts instead of FTS5 syntax.
+
+    Returns:
+        FTS5 MATCH expression, or None if the query has no terms
+    """
+    terms = []
+    for raw in query.split():
+        term = re.sub(r"^\W+|\W+$", "", raw)
+        if term and re.search(r"\w", term):
+            terms.append('"' + term.replace('"', '""') + '"')
+    return " OR ".join(terms) if terms else None
+
+
+class ChunkKeywordIndex:
+    """SQLite FTS5 (BM25) index of chunk text for one Chroma collection"""
+
+    def __init__(self, collection: str, db_path: str = KEYWORD_INDEX_PATH):
+        """
+        Initialize index
+
+        Args:
+            collection: Chroma collection name the chunks belong to
+            db_path: Path to SQLite database file (shared by all collections)
+        """
+        self.collection = collection
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                source TEXT,
+                text TEXT NOT NULL,
+                metadata TEXT,
+                UNIQUE (collection, chunk_id)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_source ON chunks(collection, source)
+        """)
+        self.conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                text, content='chunks', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_ai AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts (rowid, text) VALUES (new.id, new.text);
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_ad AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_au AFTER UPDATE OF text ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO chunks_fts (rowid, text) VALUES (new.id, new.text);
+            END
+        """)
+        self.conn.commit()
+
+    def add(self, ids: Sequence[str], texts: Sequence[str],
+            metadatas: Sequence[Optional[Dict]]):
+        """
+        Insert or replace chunks
+
+        Args:
+            ids: Chunk ids (the same ids used in Chroma)
+            texts: Chunk text
+            metadatas: Chunk metadata
+        """
+        rows = [
+            (self.collection, chunk_id, (metadata or {}).get("source"), text or "",
+             json.dumps(metadata or {}))
+            for chunk_id, text, metadata in zip(ids, texts, metadatas)
+        ]
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO chunks (collection, chunk_id, source, text, metadata)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (collection, chunk_id) DO UPDATE SET
+                    source = excluded.source,
+                    text = excluded.text,
+                    metadata = excluded.metadata
+            """, rows)
+            self.conn.commit()
+
+    def search(self, query: str, k: int = 10,
+               sources: Optional[Sequence[str]] = None) -> List[Tuple[Document, float]]:
+        """
+        BM25 search over chunk text
+
+        Args:
+            query: Free-text query
+            k: Maximum number of chunks
+            sources: Only search chunks of these paper links
+
+        Returns:
+            List of (document, score) pairs, best match first (higher is better)
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        sql = """
+            SELECT c.text, c.metadata, bm25(chunks_fts) AS score
+            FROM chunks_fts
+            JOIN chunks c ON c.id = chunks_fts.rowid
+            WHERE chunks_fts MATCH ? AND c.collection = ?
+        """
+        params: List = [match, self.collection]
+        if sources is not None:
+            sources = list(sources)
+            if not sources:
+                return []
+            sql += f" AND c.source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(k)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        # FTS5's bm25() is negative; flip it so higher means more relevant
+        return [
+            (Document(page_content=text, metadata=json.loads(metadata or "{}")), -score)
+            for text, metadata, score in rows
+        ]
+
+    def count(self) -> int:
+        """Number of chunks indexed for this collection"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE collection = ?", (self.collection,)
+            ).fetchone()[0]
+
+    def delete_sources(self, sources: Sequence[str], batch_size: int = 500):
+        """
+        Remove all chunks of some papers
+
+        Args:
+            sources: Paper links
+            batch_size: Links per DELETE statement
+        """
+        sources = list(sources)
+        with self._lock:
+            for start in range(0, len(sources), batch_size):
+                batch = sources[start:start + batch_size]
+                self.conn.execute(
+                    f"DELETE FROM chunks WHERE collection = ? AND source IN ({','.join('?' * len(batch))})",
+                    (self.collection, *batch),
+                )
+            self.conn.commit()
+
+    def clear(self):
+        """Remove all chunks of this collection"""
+        with self._lock:
+            self.conn.execute("DELETE FROM chunks WHERE collection = ?", (self.collection,))
+            self.conn.commit()
+
+    def sync_from_collection(self, collection, batch_size: int = SYNC_BATCH_SIZE) -> int:
+        """
+        Rebuild the index from a Chroma collection if their sizes differ
+
+        Used for stores created before the index existed; new chunks are
+        added as they are upserted.
+
+        Args:
+            collection: chromadb Collection
+            batch_size: Records read per page
+
+        Returns:
+            Number of chunks indexed (0 if already in sync)
+        """
+        total = collection.count()
+        if total == self.count():
+            return 0
+
+        logger.info(f"Rebuilding keyword index for {self.collection} ({total} chunks)")
+        self.clear()
+        indexed = 0
+        for offset in range(0, total, batch_size):
+            page = collection.get(
+                limit=batch_size, offset=offset, include=["documents", "metadatas"])
+            self.add(page["ids"], page["documents"], page["metadatas"])
+            indexed += len(page["ids"])
+        logger.info(f"Keyword index for {self.collection} holds {indexed} chunks")
+        return indexed
+
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,237 @@
+"""
+Pooled LLM Clients
+Reuses chat model clients per (model, API key, temperature) with idle eviction and concurrency limits
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google")  # google | fake (canned answers, no API calls)
+LLM_POOL_MAX_CLIENTS = int(os.getenv("LLM_POOL_MAX_CLIENTS", "32"))
+LLM_POOL_IDLE_TTL = float(os.getenv("LLM_POOL_IDLE_TTL", "600"))  # seconds
+LLM_POOL_CONCURRENCY = int(os.getenv("LLM_POOL_CONCURRENCY", "4"))  # calls in flight per API key
+LLM_FAKE_RESPONSE = os.getenv(
+    "LLM_FAKE_RESPONSE", "This is a canned answer from the fake LLM provider.")
+
+ClientKey = Tuple[str, str, float]
+
+
+def hash_api_key(api_key: str) -> str:
+    """Fingerprint an API key so raw keys never appear in pool keys, logs or stats"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def google_chat_model(model_name: str, api_key: str, temperature: float) -> BaseChatModel:
+    """Create a Gemini chat model client"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=temperature,
+        google_api_key=api_key,
+    )
+
+
+def fake_chat_model(model_name: str, api_key: str, temperature: float) -> BaseChatModel:
+    """Create a local chat model that always answers LLM_FAKE_RESPONSE (for tests)"""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    return FakeListChatModel(responses=[LLM_FAKE_RESPONSE])
+
+
+CHAT_MODEL_FACTORIES: Dict[str, Callable[[str, str, float], BaseChatModel]] = {
+    "google": google_chat_model,
+    "fake": fake_chat_model,
+}
+
+
+@dataclass
+class PooledClient:
+    """A chat model client and its usage bookkeeping"""
+    llm: BaseChatModel
+    semaphore: asyncio.Semaphore  # Shared by all clients of the same API key
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+    calls: int = 0
+
+
+class LLMClientPool:
+    """Bounded pool of chat model clients shared across requests"""
+
+    def __init__(self, factory: Optional[Callable[[str, str, float], BaseChatModel]] = None,
+                 max_clients: int = LLM_POOL_MAX_CLIENTS,
+                 idle_ttl: float = LLM_POOL_IDLE_TTL,
+                 concurrency: int = LLM_POOL_CONCURRENCY):
+        """
+        Initialize pool
+
+        Args:
+            factory: Creates a client from (model name, API key, temperature);
+                defaults to the LLM_PROVIDER factory
+            max_clients: Clients kept; idle least recently used are evicted
+            idle_ttl: Seconds an unused client is kept (0 to keep until evicted by size)
+            concurrency: Calls in flight per API key across its models and
+                temperatures (provider quotas are per key); further calls wait
+        """
+        if factory is None:
+            if LLM_PROVIDER not in CHAT_MODEL_FACTORIES:
+                raise ValueError(f"Unknown LLM provider: {LLM_PROVIDER}")
+            factory = CHAT_MODEL_FACTORIES[LLM_PROVIDER]
+            self.provider = LLM_PROVIDER
+        else:
+            self.provider = getattr(factory, "__name__", "custom")
+        self.factory = factory
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.concurrency = concurrency
+        self._clients: Dict[ClientKey, PooledClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}  # By API key fingerprint
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _evict(self, now: float, keep: ClientKey):
+        """Drop expired idle clients, then idle ones beyond the size cap (never keep)"""
+        idle = sorted(
+            (client.last_used, key) for key, client in self._clients.items()
+            if client.in_use == 0 and key != keep
+        )
+        excess = len(self._clients) - self.max_clients
+        for last_used, key in idle:
+            expired = self.idle_ttl and now - last_used > self.idle_ttl
+            if not expired and excess <= 0:
+                break
+            del self._clients[key]
+            if not any(other[1] == key[1] for other in self._clients):
+                self._semaphores.pop(key[1], None)
+            excess -= 1
+            self.evicted += 1
+            logger.info(f"Evicted LLM client {key[0]} (key {key[1]}, temperature {key[2]})")
+
+    def _get(self, model_name: str, api_key: str, temperature: float) -> PooledClient:
+        """Get or create the client for a key"""
+        key = (model_name, hash_api_key(api_key), float(temperature))
+        now = time.monotonic()
+
+        client = self._clients.get(key)
+        if client is None:
+            semaphore = self._semaphores.get(key[1])
+            if semaphore is None:
+                semaphore = self._semaphores[key[1]] = asyncio.Semaphore(self.concurrency)
+            client = PooledClient(
+                llm=self.factory(model_name, api_key, temperature),
+                semaphore=semaphore,
+            )
+            self._clients[key] = client
+            self.created += 1
+        else:
+            self.reused += 1
+        client.last_used = now
+        self._evict(now, keep=key)
+        return client
+
+    @asynccontextmanager
+    async def acquire(self, model_name: str, api_key: str,
+                      temperature: float = 0) -> AsyncIterator[BaseChatModel]:
+        """
+        Check out a client, waiting if its API key's concurrency limit is reached
+
+        The client can't be evicted while checked out.
+
+        Args:
+            model_name: LLM model name
+            api_key: Provider API key
+            temperature: Sampling temperature
+
+        Yields:
+            Chat model client
+        """
+        client = self._get(model_name, api_key, temperature)
+        client.in_use += 1
+        try:
+            async with client.semaphore:
+                client.calls += 1
+                yield client.llm
+        finally:
+            client.in_use -= 1
+            client.last_used = time.monotonic()
+
+    async def ainvoke(self, model_name: str, api_key: str, prompt: str,
+                      temperature: float = 0) -> str:
+        """
+        Run a prompt and return the answer text
+
+        Args:
+            model_name: LLM model name
+            api_key: Provider API key
+            prompt: Prompt text
+            temperature: Sampling temperature
+
+        Returns:
+            Response content
+        """
+        async with self.acquire(model_name, api_key, temperature) as llm:
+            response = await llm.ainvoke(prompt)
+        return response.content
+
+    async def astream(self, model_name: str, api_key: str, prompt: str,
+                      temperature: float = 0) -> AsyncIterator[str]:
+        """
+        Run a prompt and yield the answer text as it is generated
+
+        Args:
+            model_name: LLM model name
+            api_key: Provider API key
+            prompt: Prompt text
+            temperature: Sampling temperature
+
+        Yields:
+            Non-empty pieces of the response content
+        """
+        async with self.acquire(model_name, api_key, temperature) as llm:
+            async for chunk in llm.astream(prompt):
+                if chunk.content:
+                    yield chunk.content
+
+    def stats(self) -> Dict:
+        """Get pool size and reuse counters"""
+        return {
+            'provider': self.provider,
+            'clients': len(self._clients),
+            'in_use': sum(client.in_use for client in self._clients.values()),
+            'max_clients': self.max_clients,
+            'concurrency': self.concurrency,
+            'created': self.created,
+            'reused': self.reused,
+            'evicted': self.evicted,
+        }
+
+    def clear(self):
+        """Drop all clients"""
+        self._clients.clear()
+        self._semaphores.clear()
+
+
+_pool: Optional[LLMClientPool] = None
+
+
+def get_llm_pool() -> LLMClientPool:
+    """Get the process-wide LLM client pool"""
+    global _pool
+    if _pool is None:
+        _pool = LLMClientPool()
+    return _pool
@@ -1,23 +1,39 @@
 import os
 import warnings
-from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from langchain.docstore.document import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain_community.vectorstores.utils import filter_complex_metadata
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-import time
+from langchain_core.documents import Document
+import asyncio
+import hashlib
 import json
+import math
+import time
 from datetime import datetime
 from database_manager import PaperDatabaseManager
+from scraper import get_scraper
+from article_parser import ArticleRecord, parse_article
+from executors import run_cpu, run_db, run_io, shutdown_pools
+from llm_pool import get_llm_pool
+from context_builder import pack_context
+from paper_graph import PaperSimilarityGraph
+from workflow_analysis import (
+    analyze_papers, paper_key, papers_from_docs, precompute_attributes, PREVIEW_CHARS, WorkflowPaper,
+)
+from job_queue import IngestJobQueue
+from embedding_cache import CachedEmbeddings, EmbeddingStore, QueryEmbeddingLRU
+from embedding_pipeline import index_chunks
+from answer_cache import ANSWER_CACHE_ENABLED, AnswerCache
+from keyword_index import ChunkKeywordIndex
+from reranker import (RERANK_BUDGET_MS, RERANK_CANDIDATES, RERANK_ENABLED, RERANK_TOP_N,
+                      CrossEncoderReranker)
+from retrieval import CHUNKS_PER_PAPER, StoreRetriever, parse_keywords, plan_retrieval, search_stores
+
+# pandas, text splitters, Chroma, the embedding backends and the Gemini client
+# are imported where they are used, so the server can accept traffic before
+# they are loaded (see STARTUP_MODE)
 
 # Suppress warnings
 os.environ["GRPC_VERBOSITY"] = "ERROR"
@@ -44,13 +60,32 @@ app.add_middleware(
 vector_store = None
 secondary_vector_store = None  # For abstract-based search
 embeddings = None
+main_keyword_index = None  # BM25 index over main store chunks
+abstract_keyword_index = None  # BM25 index over abstract chunks
+answer_cache = None  # LLM answers by (model, question, chunk set)
+paper_graph = None  # Precomputed paper-to-paper similarity edges
 db_manager = None  # Database manager for tracking papers
+job_queue = None  # Background ingestion jobs
+workflow_precompute_task: Optional[asyncio.Task] = None  # Background /workflow attribute extraction
+_loading: Dict[str, asyncio.Task] = {}  # Deferred loaders by name
+load_errors: Dict[str, str] = {}  # Last failure of each deferred loader
+query_embedding_cache = QueryEmbeddingLRU()  # Shared by every vector-store lookup
+reranker = CrossEncoderReranker()  # Model loads in the background when first needed
 
 # Configuration
 PERSIST_DIRECTORY = "./chroma_db"
 COLLECTION_NAME = "space_biology_papers"
+ABSTRACT_PERSIST_DIRECTORY = "./small_persistent_db"
+ABSTRACT_COLLECTION_NAME = "search_semantics"
 CSV_URL = "https://raw.githubusercontent.com/jgalazka/SB_publications/main/SB_publication_PMC.csv"
 DB_PATH = "./papers.db"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# "torch" (sentence-transformers), "onnx" or "onnx-int8" (ONNX Runtime on CPU)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# "eager" loads the model and stores before serving, "background" warms them
+# after startup, "lazy" waits for the first request that needs them
+STARTUP_MODE = os.getenv("STARTUP_MODE", "background").lower()
 
 
 # Pydantic Models
@@ -64,7 +99,7 @@ class SearchQuery(BaseModel):
         None, description="Google API key for Gemini")
     model_name: str = Field("gemini-2.5-flash", description="LLM model to use")
     search_method: str = Field(
-        "similarity", description="Search method: similarity, mmr, or similarity_score"
+        "similarity", description="Search method: similarity, mmr, or hybrid (BM25 + vector)"
     )
     use_keyword_filter: bool = Field(
         False, description="Enable keyword filtering")
@@ -98,10 +133,10 @@ class LoadPapersRequest(BaseModel):
         10, ge=1, le=607, description="Number of papers to load")
 
 
-class LoadPapersResponse(BaseModel):
+class LoadJobResponse(BaseModel):
     status: str
-    papers_loaded: int
-    chunks_created: int
+    job_id: int
+    papers_queued: int
     message: str
 
 
@@ -109,11 +144,30 @@ class OnDemandSearchQuery(BaseModel):
     query: str = Field(..., description="Search query")
     num_results: int = Field(
         5, ge=1, le=20, description="Number of papers to retrieve")
+    search_method: str = Field(
+        "hybrid", pattern="^(similarity|mmr|hybrid)$",
+        description="Search method: similarity, mmr, or hybrid (BM25 + vector)")
+    use_keyword_filter: bool = Field(
+        False, description="Only keep papers whose title contains a keyword")
+    keyword_filter: Optional[str] = Field(
+        None, description="Comma-separated keywords for filtering")
+    rerank: Optional[bool] = Field(
+        None, description="Rerank chunks with a cross-encoder (default: RERANK_ENABLED)")
+    rerank_budget_ms: Optional[int] = Field(
+        None, ge=0, le=10000, description="Reranking time budget (default: RERANK_BUDGET_MS)")
+    use_answer_cache: bool = Field(
+        True, description="Reuse a cached answer for the same question over the same chunks")
     use_llm: bool = Field(True, description="Generate LLM answer")
     google_api_key: Optional[str] = Field(None, description="Google API key")
     model_name: str = Field("gemini-2.5-flash", description="LLM model")
 
 
+class WorkflowPrecomputeRequest(BaseModel):
+    google_api_key: str = Field(..., description="Google API key")
+    model_name: str = Field("gemini-2.5-flash", description="LLM model")
+    limit: int = Field(100, ge=1, le=5000, description="Maximum number of papers to describe")
+
+
 class DatabaseStatus(BaseModel):
     status: str
     collection_name: str
@@ -133,141 +187,140 @@ def init_database():
 
 def load_csv():
     """Load papers CSV from GitHub"""
+    import pandas as pd
+
     return pd.read_csv(CSV_URL)
 
 
-def scrape_article_text_with_images(article_url: str) -> Optional[tuple]:
-    """Scrape article text and image URLs from PMC URL"""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        " (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-    }
+async def scrape_article(article_url: str) -> Optional[ArticleRecord]:
+    """Fetch and parse a PMC article once"""
     try:
-        page = requests.get(article_url, headers=headers, timeout=30)
-        page.raise_for_status()
-        soup = BeautifulSoup(page.text, "html.parser")
+        html = await get_scraper().fetch(article_url)
+        return await run_cpu(parse_article, html, article_url)
+    except Exception as e:
+        print(f"Error scraping {article_url}: {e}")
+        return None
 
-        # Get text
-        main_content = soup.find(id="maincontent") or soup.find("article")
-        if not main_content:
-            main_content = soup
 
-        paragraphs = main_content.find_all("p")
-        text = "\n\n".join(p.get_text() for p in paragraphs)
+async def scrape_article_text_with_images(article_url: str) -> Optional[tuple]:
+    """Scrape article text and image URLs from PMC URL"""
+    record = await scrape_article(article_url)
+    if not record:
+        return None
+    return (record.text, record.image_urls)
 
-        # Get images
-        image_urls = scrape_article_images(article_url)
 
-        return (text.strip(), image_urls)
-    except Exception as e:
-        print(f"Error scraping {article_url}: {e}")
-        return None
+async def scrape_article_abstract(article_url: str) -> Optional[str]:
+    """Scrape article abstract, falling back to the meta description"""
+    record = await scrape_article(article_url)
+    return record.summary if record else None
 
 
-def scrape_article_images(article_url: str) -> List[str]:
+def load_embedding_model(backend: str = EMBEDDING_BACKEND):
     """
-    Scrape image URLs from PMC article
+    Load the embedding model on the selected backend
+
+    Args:
+        backend: "torch", "onnx" or "onnx-int8"
 
     Returns:
-        List of image URLs found in the article
+        LangChain embeddings object
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-    try:
-        page = requests.get(article_url, headers=headers, timeout=30)
-        page.raise_for_status()
-        soup = BeautifulSoup(page.text, "html.parser")
-
-        image_urls = []
-
-        # Find all figure images
-        figures = soup.find_all("figure") or soup.find_all(
-            "div", class_="figure")
-        for fig in figures:
-            img = fig.find("img")
-            if img and img.get("src"):
-                img_url = img["src"]
-                # Make absolute URL if relative
-                if img_url.startswith("//"):
-                    img_url = "https:" + img_url
-                elif img_url.startswith("/"):
-                    from urllib.parse import urljoin
-
-                    img_url = urljoin(article_url, img_url)
-                image_urls.append(img_url)
-
-        # Also check for images in main content
-        main_content = soup.find(id="maincontent") or soup.find("article")
-        if main_content:
-            imgs = main_content.find_all("img")
-            for img in imgs:
-                if img.get("src"):
-                    img_url = img["src"]
-                    if img_url.startswith("//"):
-                        img_url = "https:" + img_url
-                    elif img_url.startswith("/"):
-                        from urllib.parse import urljoin
-
-                        img_url = urljoin(article_url, img_url)
-                    if img_url not in image_urls:
-                        image_urls.append(img_url)
-
-        return image_urls
-    except Exception as e:
-        print(f"Error scraping images from {article_url}: {e}")
-        return []
+    if backend == "torch":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
 
+        return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    if backend in ("onnx", "onnx-int8"):
+        from onnx_embeddings import OnnxEmbeddings
 
-def scrape_article_abstract(article_url: str):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-    }
-    try:
-        page = requests.get(article_url, headers=headers, timeout=30)
-        page.raise_for_status()
-        soup = BeautifulSoup(page.text, "html.parser")
-
-        heading = soup.find(
-            lambda tag: tag.name
-            and tag.name.startswith("h")
-            and tag.string
-            and "abstract" in tag.string.lower()
-        )
+        return OnnxEmbeddings(EMBEDDING_MODEL, quantized=backend == "onnx-int8")
+    raise ValueError(f"Unknown embedding backend: {backend}")
 
-        if heading:
-            abstract_paragraph = heading.find_next("p")
-            if abstract_paragraph:
-                return abstract_paragraph.get_text(strip=True)
 
-        meta_abstract = soup.find("meta", {"name": "description"})
-        if meta_abstract and meta_abstract.get("content"):
-            return meta_abstract.get("content").strip()
+def init_embeddings():
+    """
+    Initialize embeddings on the configured backend, wrapped in the persistent
+    document embedding cache and the process-wide query embedding LRU
+    """
+    model = load_embedding_model(EMBEDDING_BACKEND)
+    # Keep torch keys unchanged; other backends get their own cache entries
+    cache_name = EMBEDDING_MODEL if EMBEDDING_BACKEND == "torch" else f"{EMBEDDING_MODEL}#{EMBEDDING_BACKEND}"
+    store = EmbeddingStore() if EMBEDDING_CACHE_ENABLED else None
+    return CachedEmbeddings(model, cache_name, store=store, query_cache=query_embedding_cache)
 
-        return None
-    except Exception as e:
-        print(f"Error scraping {article_url}: {e}")
-        return None
 
+def split_papers(docs: List[Document], splitter) -> Tuple[List[Document], List[str], Dict[str, List[str]]]:
+    """
+    Split paper documents into chunks in one pass
 
-def init_embeddings():
-    """Initialize HuggingFace embeddings"""
-    return HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    Chunk ids are derived from the paper link and chunk position, so
+    re-adding a paper upserts its chunks instead of duplicating them. A link
+    given more than once is split once (its last document wins), since one
+    upsert can't hold the same id twice.
 
+    Returns:
+        Tuple of (chunks, chunk ids in the same order, {link: chunk ids})
+    """
+    chunks = []
+    chunk_ids = []
+    chunk_ids_by_link = {}
+
+    docs = list({doc.metadata["source"]: doc for doc in docs}.values())
+    for doc in docs:
+        link = doc.metadata["source"]
+        prefix = hashlib.sha1(link.encode("utf-8")).hexdigest()[:16]
+        doc_chunks = splitter.split_documents([doc])
+        doc_ids = []
+        for i, chunk in enumerate(doc_chunks):
+            chunk.metadata["chunk_index"] = i
+            doc_ids.append(f"{prefix}-{i}")
+
+        chunks.extend(doc_chunks)
+        chunk_ids.extend(doc_ids)
+        chunk_ids_by_link.setdefault(link, []).extend(doc_ids)
+
+    return chunks, chunk_ids, chunk_ids_by_link
+
+
+def paper_splitter():
+    """Text splitter for full papers"""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=5000,
+        chunk_overlap=500,
+        length_function=len,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
 
-def create_vectorstore(docs, embeddings_func, persist_dir, collection):
-    """Create ChromaDB vector store"""
-    vector_store = Chroma.from_documents(
-        documents=docs,
-        embedding=embeddings_func,
+
+def open_vectorstore(embeddings_func, persist_dir, collection):
+    """Open a ChromaDB vector store, creating an empty collection if needed"""
+    from langchain_community.vectorstores import Chroma
+
+    return Chroma(
         persist_directory=persist_dir,
+        embedding_function=embeddings_func,
         collection_name=collection,
     )
-    return vector_store
+
+
+def delete_vectorstore(persist_dir, collection) -> bool:
+    """Delete a persisted ChromaDB collection; returns False if it didn't exist"""
+    import chromadb
+    from chromadb.errors import NotFoundError
+
+    try:
+        chromadb.PersistentClient(path=persist_dir).delete_collection(collection)
+    except (NotFoundError, ValueError):
+        return False
+    return True
 
 
 def load_existing_vectorstore(embeddings_func, persist_dir, collection):
     """Load existing ChromaDB vector store"""
+    from langchain_community.vectorstores import Chroma
+
     try:
         vs = Chroma(
             persist_directory=persist_dir,
@@ -284,44 +337,173 @@ def load_existing_vectorstore(embeddings_func, persist_dir, collection):
         return None, 0
 
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize embeddings and try to load existing database on startup"""
-    global vector_store, embeddings, db_manager
+# Deferred loading of the embedding model and vector stores
+def _load_once(name: str, loader) -> asyncio.Task:
+    """Start a loader task once and share it; a failed load is retried on the next call"""
+    task = _loading.get(name)
+    if task is None or (task.done() and (task.cancelled() or task.exception())):
+        task = asyncio.create_task(loader())
+        _loading[name] = task
+    return task
 
-    print("🚀 Starting NASA Space Biology Knowledge Engine API...")
 
-    # Initialize SQLite database
-    db_manager = init_database()
-    print(f"✅ SQLite database initialized at {DB_PATH}")
+def _is_loaded(name: str) -> bool:
+    """Check whether a deferred loader finished successfully"""
+    task = _loading.get(name)
+    return bool(task and task.done() and not task.cancelled() and not task.exception())
 
-    # Initialize embeddings
-    embeddings = init_embeddings()
-    print("✅ Embeddings initialized")
 
-    # Try to load secondary (abstract) vector store
-    global secondary_vector_store
-    sec_vs, sec_count = load_existing_vectorstore(
-        embeddings, "./small_persistent_db", "search_semantics"
-    )
+async def _load_embeddings():
+    """Load the embedding model on the CPU pool"""
+    global embeddings
+    started = time.monotonic()
+    try:
+        embeddings = await run_cpu(init_embeddings)
+    except Exception as e:
+        load_errors["embeddings"] = str(e)
+        raise
+    load_errors.pop("embeddings", None)
+    print(f"✅ Embeddings initialized ({time.monotonic() - started:.1f}s)")
+
+
+async def _load_vector_stores():
+    """Open the main and secondary (abstract) vector stores concurrently"""
+    global vector_store, secondary_vector_store
+    await ensure_embeddings()
+    started = time.monotonic()
+    try:
+        (sec_vs, sec_count), (vs, count) = await asyncio.gather(
+            run_io(load_existing_vectorstore, embeddings, ABSTRACT_PERSIST_DIRECTORY, ABSTRACT_COLLECTION_NAME),
+            run_io(load_existing_vectorstore, embeddings, PERSIST_DIRECTORY, COLLECTION_NAME),
+        )
+    except Exception as e:
+        load_errors["vector_stores"] = str(e)
+        raise
+    load_errors.pop("vector_stores", None)
+
     if sec_vs:
         secondary_vector_store = sec_vs
-        print(f"✅ Loaded secondary (abstract) database with {
-              sec_count} chunks")
+        print(f"✅ Loaded secondary (abstract) database with {sec_count} chunks")
     else:
         print("⚠️ No secondary database found. Abstracts not indexed yet.")
 
-    # Try to load existing vector store
-    vs, count = load_existing_vectorstore(
-        embeddings, PERSIST_DIRECTORY, COLLECTION_NAME
-    )
-    if vs:
+    # An ingest may have created the main store while this was loading
+    if vs and vector_store is None:
         vector_store = vs
-        print(f"✅ Loaded existing database with {count} chunks")
-    else:
+        print(f"✅ Loaded existing database with {count} chunks ({time.monotonic() - started:.1f}s)")
+    elif not vs:
         print("⚠️ No existing database found. Use /load-papers endpoint to create one.")
 
+    # Hybrid search uses vectors only until the keyword indexes are in sync
+    _load_once("keyword_indexes", _sync_keyword_indexes)
+
+
+async def _sync_keyword_indexes():
+    """Build BM25 indexes for stores created before the indexes existed"""
+    try:
+        for store, index in ((vector_store, main_keyword_index),
+                             (secondary_vector_store, abstract_keyword_index)):
+            if store is not None and index is not None:
+                await run_io(index.sync_from_collection, store._collection)
+    except Exception as e:
+        load_errors["keyword_indexes"] = str(e)
+        print(f"❌ Keyword index sync failed: {e}")
+        raise
+    load_errors.pop("keyword_indexes", None)
+
+
+def store_retrievers() -> Tuple[Optional[StoreRetriever], Optional[StoreRetriever]]:
+    """Retrievers for the main and abstract stores that are currently loaded"""
+    indexes_ready = _is_loaded("keyword_indexes")
+    main = StoreRetriever(
+        vector_store, main_keyword_index if indexes_ready else None, "main"
+    ) if vector_store else None
+    abstracts = StoreRetriever(
+        secondary_vector_store, abstract_keyword_index if indexes_ready else None, "abstract"
+    ) if secondary_vector_store else None
+    return main, abstracts
+
+
+async def ensure_embeddings():
+    """Wait until the embedding model is loaded, starting the load if needed"""
+    if embeddings is None:
+        # Shielded so a cancelled request doesn't abort a load other requests share
+        await asyncio.shield(_load_once("embeddings", _load_embeddings))
+    return embeddings
+
+
+async def ensure_vector_stores():
+    """Wait until the embedding model and vector stores are loaded"""
+    if not _is_loaded("vector_stores"):
+        try:
+            await asyncio.shield(_load_once("vector_stores", _load_vector_stores))
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Search backend failed to load: {e}")
+
+
+async def _load_reranker():
+    """Load the cross-encoder reranking model on the CPU pool"""
+    try:
+        await run_cpu(reranker.load)
+    except Exception as e:
+        load_errors["reranker"] = str(e)
+        print(f"❌ Reranker failed to load: {e}")
+        raise
+    load_errors.pop("reranker", None)
+    print(f"✅ Reranker loaded ({reranker.model_name})")
+
+
+async def warm_up():
+    """Load the model and stores ahead of the first request"""
+    if RERANK_ENABLED:
+        _load_once("reranker", _load_reranker)
+    try:
+        await ensure_vector_stores()
+    except Exception as e:
+        print(f"❌ Warm-up failed: {e}")
+
+
+# Startup event
+@app.on_event("startup")
+async def startup_event():
+    """Initialize the paper database and job queue; load models per STARTUP_MODE"""
+    global db_manager, job_queue, main_keyword_index, abstract_keyword_index, answer_cache, paper_graph
+
+    print(f"🚀 Starting NASA Space Biology Knowledge Engine API ({STARTUP_MODE} startup)...")
+    started = time.monotonic()
+
+    # Initialize SQLite database
+    db_manager = await run_db(init_database)
+    print(f"✅ SQLite database initialized at {DB_PATH}")
+
+    main_keyword_index = ChunkKeywordIndex(COLLECTION_NAME)
+    abstract_keyword_index = ChunkKeywordIndex(ABSTRACT_COLLECTION_NAME)
+    if ANSWER_CACHE_ENABLED:
+        answer_cache = AnswerCache()
+    paper_graph = PaperSimilarityGraph(DB_PATH)
+
+    # Resume interrupted ingestion jobs
+    job_queue = IngestJobQueue(db_manager, ingest_papers)
+    await job_queue.start()
+    print("✅ Ingestion job queue started")
+
+    if STARTUP_MODE == "eager":
+        await warm_up()
+    elif STARTUP_MODE == "background":
+        _load_once("warm_up", warm_up)
+
+    print(f"✅ Accepting requests after {time.monotonic() - started:.2f}s")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop ingestion and release pooled HTTP connections, LLM clients and executors on shutdown"""
+    if job_queue:
+        await job_queue.stop()
+    await get_scraper().aclose()
+    get_llm_pool().clear()
+    shutdown_pools(wait=False)
+
 
 # API Endpoints
 
@@ -335,7 +517,8 @@ async def root():
         "endpoints": {
             "health": "/health",
             "search": "/search (POST) - Smart search with automatic paper scraping and images",
-            "load_papers": "/load-papers (POST)",
+            "load_papers": "/load-papers (POST) - Queue a background loading job",
+            "jobs": "/jobs, /jobs/{job_id}",
             "database_status": "/database-status",
             "papers_list": "/papers",
             "reset_database": "/reset-database (POST)",
@@ -345,10 +528,28 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint; answers immediately, with readiness of deferred components"""
+    ready = {
+        "database": db_manager is not None,
+        "job_queue": job_queue is not None,
+        "embeddings": embeddings is not None,
+        "vector_stores": _is_loaded("vector_stores"),
+        "keyword_indexes": _is_loaded("keyword_indexes"),
+    }
+    # Reranking is optional per request, so it doesn't gate readiness
     return {
         "status": "healthy",
+        "ready": all(ready.values()),
+        "components": ready,
+        "startup_mode": STARTUP_MODE,
+        "load_errors": load_errors,
         "database_loaded": vector_store is not None,
+        "embedding_backend": EMBEDDING_BACKEND,
+        "reranker": {"enabled": RERANK_ENABLED, "loaded": reranker.loaded},
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "answer_cache": await run_db(answer_cache.stats) if answer_cache else None,
+        "llm_pool": get_llm_pool().stats(),
+        "paper_graph": paper_graph.stats() if paper_graph else None,
         "timestamp": datetime.now().isoformat(),
     }
 
@@ -356,134 +557,155 @@ async def health_check():
 @app.get("/database-status", response_model=DatabaseStatus)
 async def get_database_status():
     """Get current database status"""
+    await ensure_vector_stores()
     if not vector_store:
         raise HTTPException(status_code=404, detail="Database not loaded")
 
     collection = vector_store._collection
-    total_chunks = collection.count()
+    total_chunks = await run_io(collection.count)
 
-    # Get unique papers
-    all_results = collection.get(include=["metadatas"])
-    unique_papers = set()
-    for metadata in all_results["metadatas"]:
-        pmcid = metadata.get("pmcid", "N/A")
-        if pmcid != "N/A":
-            unique_papers.add(pmcid)
+    # Paper count comes from the catalog maintained in papers.db at ingest
+    catalog = await run_db(db_manager.get_catalog_stats)
 
     return DatabaseStatus(
         status="loaded",
         collection_name=COLLECTION_NAME,
         persist_directory=PERSIST_DIRECTORY,
         total_chunks=total_chunks,
-        total_papers=len(unique_papers),
+        total_papers=catalog["loaded_papers"],
     )
 
 
 @app.get("/papers")
-async def list_papers():
-    """List all papers in the database"""
+async def list_papers(
+    limit: int = Query(default=100, ge=1, le=1000, description="Papers per page"),
+    offset: int = Query(default=0, ge=0, description="Papers to skip"),
+):
+    """List papers in the database, most recently loaded first"""
+    await ensure_vector_stores()
     if not vector_store:
         raise HTTPException(status_code=404, detail="Database not loaded")
 
-    collection = vector_store._collection
-    all_results = collection.get(include=["metadatas"])
-
-    unique_papers = {}
-    for metadata in all_results["metadatas"]:
-        title = metadata.get("title", "Unknown")
-        pmcid = metadata.get("pmcid", "N/A")
-        source = metadata.get("source", "Unknown")
-        if pmcid not in unique_papers:
-            unique_papers[pmcid] = {"title": title,
-                                    "pmcid": pmcid, "source": source}
+    catalog = await run_db(db_manager.get_catalog_stats)
+    papers = await run_db(db_manager.get_catalog_page, limit=limit, offset=offset)
 
-    return {"total_papers": len(unique_papers), "papers": list(unique_papers.values())}
+    return {
+        "total_papers": catalog["loaded_papers"],
+        "limit": limit,
+        "offset": offset,
+        "papers": papers,
+    }
 
 
 # Legacy search endpoint removed - use /search/on-demand instead
 
 
-@app.post("/search")
-async def search_papers(request: OnDemandSearchQuery):
+def format_source_document(doc: Document, paper_images_map: Dict[str, List[str]]) -> Dict:
+    """Format a chunk for responses, with image URLs parsed from its JSON metadata"""
+    doc_title = doc.metadata.get("title", "Unknown")
+    
+    # Parse image URLs from JSON string in metadata
+    image_urls_json = doc.metadata.get("image_urls_json", "")
+    try:
+        image_urls = json.loads(image_urls_json) if image_urls_json else []
+    except:
+        # Fallback to map if JSON parsing fails (for newly scraped papers)
+        image_urls = paper_images_map.get(doc_title, [])
+    
+    return {
+        "page_content": doc.page_content[:500] + "..."
+        if len(doc.page_content) > 500
+        else doc.page_content,
+        "metadata": {
+            "title": doc_title,
+            "pmcid": doc.metadata.get("pmcid", "N/A"),
+            "source": doc.metadata.get("source", "Unknown"),
+            "image_urls": image_urls,
+        },
+    }
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def search_events(request: OnDemandSearchQuery,
+                        stream_tokens: bool = False) -> AsyncIterator[Tuple[str, Dict]]:
     """
-    Smart search endpoint:
-    1. First search in main vector store (full papers) if available
-    2. If not enough results, search abstracts in secondary DB
-    3. Scrape full papers with images (if not already loaded)
-    4. Generate answer with citations and images
+    Run the search pipeline, yielding (event, data) as each stage finishes
+
+    Events, in order: "sources" (retrieval hits and their images), one
+    "scrape" per paper as it finishes, "indexed", "context" (chunks sent to
+    the LLM), "token" (answer text; streamed only if stream_tokens) and
+    finally "result" with the full response.
+
+    Args:
+        request: Search request
+        stream_tokens: Stream the LLM answer token by token instead of one call
     """
     global secondary_vector_store, vector_store, embeddings, db_manager
 
-    all_relevant_docs = []
-    papers_to_scrape = []
-    loaded_papers = []
+    await ensure_vector_stores()
+
     image_data = []
     paper_images_map = {}
 
-    # Step 1: Try to search in main vector store first (full papers)
-    if vector_store:
-        try:
-            # Search full paper vector store
-            main_retriever = vector_store.as_retriever(
-                search_type="similarity", search_kwargs={"k": request.num_results}
-            )
-            main_docs = main_retriever.invoke(request.query)
-            
-            if len(main_docs) >= request.num_results:
-                # We have enough results from full papers, no need to scrape
-                all_relevant_docs = main_docs
-                loaded_papers = [{"title": doc.metadata.get("title"), "pmcid": doc.metadata.get("pmcid")} 
-                                for doc in main_docs]
-                print(f"✅ Found {len(main_docs)} results in main vector store (full papers)")
-            else:
-                # Not enough results, will search abstracts below
-                all_relevant_docs = main_docs
-                print(f"⚠️ Only found {len(main_docs)} results in main store, searching abstracts...")
-        except Exception as e:
-            print(f"Error searching main vector store: {e}")
-
-    # Step 2: If not enough results, search in abstract database
-    if len(all_relevant_docs) < request.num_results and secondary_vector_store:
-        retriever = secondary_vector_store.as_retriever(
-            search_type="similarity", search_kwargs={"k": request.num_results}
-        )
-        abstract_docs = retriever.invoke(request.query)
-
-        # Step 3: Extract paper links
-        paper_links = []
-        for doc in abstract_docs:
-            link = doc.metadata.get("source")
-            pmcid = doc.metadata.get("pmcid")
-            title = doc.metadata.get("title")
-            if link:
-                paper_links.append({"link": link, "pmcid": pmcid, "title": title})
-
-        # Step 4: Check which papers are already loaded
-        for paper in paper_links:
-            db_paper = db_manager.get_paper_by_link(paper["link"])
-            if db_paper and db_paper["isLoaded"]:
-                # Get chunks from already loaded paper
-                results = vector_store.similarity_search(
-                    paper["title"], k=5, filter={"pmcid": paper["pmcid"]}
-                ) if vector_store else []
-                all_relevant_docs.extend(results)
-                loaded_papers.append(db_paper)
-            else:
-                papers_to_scrape.append(paper)
+    # Steps 1-4: One query embedding, both stores in parallel, batched status lookup
+    keywords = parse_keywords(request.keyword_filter) if request.use_keyword_filter else []
+    main, abstracts = store_retrievers()
+    plan = await plan_retrieval(
+        request.query, request.num_results, embeddings, db_manager,
+        main=main, abstracts=abstracts, method=request.search_method, keywords=keywords,
+    )
 
-    elif not secondary_vector_store and len(all_relevant_docs) == 0:
+    if not secondary_vector_store and not plan.main_docs:
         raise HTTPException(
             status_code=404,
             detail="No search databases available. Run abstract indexing first.",
         )
+    loaded_papers = plan.loaded_papers
+    papers_to_scrape = plan.papers_to_scrape
+
+    def paper_ref(paper: Dict) -> Dict:
+        return {"title": paper.get("title"), "pmcid": paper.get("pmcid"), "link": paper.get("link")}
+
+    # Sources go out before any scraping or LLM work
+    main_sources = [format_source_document(doc, {}) for doc in plan.main_docs]
+    yield "sources", {
+        "source_documents": main_sources,
+        "images_found": [
+            {"pmcid": source["metadata"]["pmcid"], "title": source["metadata"]["title"],
+             "images": source["metadata"]["image_urls"]}
+            for source in main_sources if source["metadata"]["image_urls"]
+        ],
+        "papers_already_loaded": [paper_ref(paper) for paper in loaded_papers],
+        "papers_to_scrape": [paper_ref(paper) for paper in papers_to_scrape],
+    }
 
     # Step 5: Scrape full content + images for unloaded papers
     docs = []
+    papers_scraped = []
+
+    async def scrape_paper(paper: Dict):
+        return paper, await scrape_article_text_with_images(paper["link"])
+
+    print(f"📄 Scraping {len(papers_to_scrape)} full papers...")
+    results = {}
+    for completed, next_done in enumerate(
+            asyncio.as_completed([scrape_paper(paper) for paper in papers_to_scrape]), 1):
+        paper, result = await next_done
+        results[paper["link"]] = result
+        yield "scrape", {
+            **paper_ref(paper),
+            "status": "scraped" if result else "failed",
+            "images": result[1] if result else [],
+            "completed": completed,
+            "total": len(papers_to_scrape),
+        }
 
     for paper in papers_to_scrape:
-        print(f"📄 Scraping full paper: {paper['title'][:50]}...")
-        result = scrape_article_text_with_images(paper["link"])
-
+        result = results.get(paper["link"])
         if not result:
             continue
 
@@ -503,6 +725,7 @@ async def search_papers(request: OnDemandSearchQuery):
             },
         )
         docs.append(doc)
+        papers_scraped.append(paper)
 
         if image_urls:
             image_data.append(
@@ -510,169 +733,234 @@ async def search_papers(request: OnDemandSearchQuery):
                     "title": paper["title"], "images": image_urls}
             )
 
-        time.sleep(1)
-
     # Step 5: Create chunks and add to main vector store
     if docs:
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=5000,
-            chunk_overlap=500,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
-        chunks = splitter.split_documents(docs)
+        chunks, chunk_ids, chunk_ids_by_link = await run_cpu(split_papers, docs, paper_splitter())
         
         # No need to filter metadata since we're using JSON strings for images
 
-        if vector_store:
-            vector_store.add_documents(chunks)
-        else:
-            vector_store = create_vectorstore(
-                chunks, embeddings, PERSIST_DIRECTORY, COLLECTION_NAME
-            )
+        if not vector_store:
+            vector_store = await run_cpu(
+                open_vectorstore, embeddings, PERSIST_DIRECTORY, COLLECTION_NAME)
+        await run_cpu(index_chunks, vector_store, chunks, chunk_ids,
+                      keyword_index=main_keyword_index)
 
         # Mark as loaded in database
-        for i, paper in enumerate(papers_to_scrape):
-            paper_chunks = [
-                c for c in chunks if c.metadata.get("title") == paper["title"]
-            ]
-            db_manager.mark_as_loaded(
-                paper["link"], chunks_created=len(paper_chunks))
-            print(f"  ✅ Marked as loaded: {paper['title'][:50]}")
-
-    # Step 6: Get all relevant chunks (newly loaded + already loaded)
-    all_relevant_docs = []
-
-    # Get chunks from newly scraped papers
-    all_relevant_docs.extend(chunks if docs else [])
-
-    # Get chunks from already loaded papers
-    for loaded_paper in loaded_papers:
-        # Query main vector store for this paper's chunks
-        results = vector_store.similarity_search(
-            loaded_paper["title"], k=5, filter={"pmcid": loaded_paper["pmcid"]}
+        loaded_counts = [
+            (paper["link"], len(chunk_ids_by_link.get(paper["link"], [])))
+            for paper in papers_scraped
+        ]
+        await run_db(db_manager.mark_many_as_loaded, loaded_counts)
+        print(f"  ✅ Marked {len(loaded_counts)} papers as loaded")
+        await update_paper_graph([link for link, _ in loaded_counts])
+
+    yield "indexed", {
+        "papers": len(papers_scraped),
+        "chunks": len(chunks) if docs else 0,
+    }
+
+    # Step 6: Rank the chunks of all relevant papers (already loaded + newly scraped)
+    # with one filtered query, so the best passages of new papers come first too
+    all_relevant_docs = chunks if docs else []
+    main, _ = store_retrievers()
+    paper_links = [paper["link"] for paper in loaded_papers + papers_scraped]
+    use_rerank = request.rerank if request.rerank is not None else RERANK_ENABLED
+    if main and paper_links:
+        # Reranking scores a wider pool, so fetch enough chunks per paper to fill it
+        per_paper = CHUNKS_PER_PAPER
+        if use_rerank:
+            per_paper = max(per_paper, math.ceil(RERANK_CANDIDATES / len(paper_links)))
+        all_relevant_docs = await main.fetch_paper_chunks(
+            request.query, plan.query_vector, paper_links, per_paper=per_paper,
+            method=request.search_method,
         )
-        all_relevant_docs.extend(results)
+
+    # Step 6b: Optionally rerank the candidate pool; sources keep num_results
+    # chunks in the new order and the LLM gets the best RERANK_TOP_N (all
+    # candidates, as without reranking, if it fell back to retrieval order)
+    rerank_stats = None
+    source_pool = all_relevant_docs
+    if use_rerank and all_relevant_docs:
+        if not reranker.loaded:
+            # Don't make this request wait for the model; later ones will use it
+            _load_once("reranker", _load_reranker)
+        budget_ms = request.rerank_budget_ms if request.rerank_budget_ms is not None else RERANK_BUDGET_MS
+        candidates = all_relevant_docs[:RERANK_CANDIDATES]
+        source_pool, rerank_stats = await run_cpu(
+            reranker.rerank, request.query, candidates, None, budget_ms)
+        if rerank_stats['applied']:
+            all_relevant_docs = source_pool[:RERANK_TOP_N]
+        rerank_stats['kept'] = len(all_relevant_docs)
+
+    source_docs = [
+        format_source_document(doc, paper_images_map)
+        for doc in source_pool[: request.num_results]
+    ]
+    # Deduplicate, merge neighbouring chunks and fit the prompt's token budget
+    context_docs, packing_stats = pack_context(all_relevant_docs)
+    yield "context", {
+        "source_documents": source_docs,
+        "reranking": rerank_stats,
+        "context_packing": packing_stats,
+    }
 
     # Step 7: Generate LLM answer with images
     answer = None
+    answer_cached = None  # "exact" or "semantic" when served from the answer cache
     if request.use_llm and request.google_api_key and all_relevant_docs:
-        llm = ChatGoogleGenerativeAI(
-            model=request.model_name,
-            temperature=0,
-            google_api_key=request.google_api_key,
-        )
-
-        # Format context with images
-        context_parts = []
-        for i, doc in enumerate(all_relevant_docs[:10], 1):
-            title = doc.metadata.get("title", "Unknown")
-            pmcid = doc.metadata.get("pmcid", "Unknown")
-            source = doc.metadata.get("source", "Unknown")
-            
-            # Parse image URLs from JSON string in metadata
-            image_urls_json = doc.metadata.get("image_urls_json", "")
-            try:
-                img_urls = json.loads(image_urls_json) if image_urls_json else []
-            except:
-                # Fallback to map if JSON parsing fails (for newly scraped papers)
-                img_urls = paper_images_map.get(title, [])
-
-            context = (
-                f"[Document {i}]\nTitle: {title}\nPMCID: {
-                    pmcid}\nSource: {source}\n"
+        cached = None
+        if answer_cache and request.use_answer_cache:
+            cached = await run_db(
+                answer_cache.get, request.model_name, request.query, context_docs, plan.query_vector)
+
+        if cached:
+            answer, answer_cached = cached
+            print(f"⚡ Answer served from cache ({answer_cached} match)")
+            if stream_tokens:
+                yield "token", {"text": answer}
+        else:
+            from langchain.prompts import PromptTemplate
+
+            # Format context with images
+            context_parts = []
+            for i, doc in enumerate(context_docs, 1):
+                title = doc.metadata.get("title", "Unknown")
+                pmcid = doc.metadata.get("pmcid", "Unknown")
+                source = doc.metadata.get("source", "Unknown")
+                
+                # Parse image URLs from JSON string in metadata
+                image_urls_json = doc.metadata.get("image_urls_json", "")
+                try:
+                    img_urls = json.loads(image_urls_json) if image_urls_json else []
+                except:
+                    # Fallback to map if JSON parsing fails (for newly scraped papers)
+                    img_urls = paper_images_map.get(title, [])
+
+                context = (
+                    f"[Document {i}]\nTitle: {title}\nPMCID: {pmcid}\nSource: {source}\n"
+                )
+                if img_urls:
+                    # First 3 images
+                    context += f"Images: {', '.join(img_urls[:3])}\n"
+                context += f"Content: {doc.page_content}\n"
+                context_parts.append(context)
+
+            formatted_context = "\n---\n".join(context_parts)
+
+            prompt_template = PromptTemplate(
+                template=(
+                    "You are an expert assistant analyzing NASA space biology research papers. "
+                    "Use the following papers to answer the question. "
+                    "ALWAYS cite paper Title and PMCID.\n\n"
+                    "When referencing images/figures from papers, use this EXACT format:\n"
+                    "![Figure from PMCID](IMAGE_URL)\n\n"
+                    "Available Papers:\n{context}\n\n"
+                    "Question: {question}\n\n"
+                    "Answer with citations in markdown format. When mentioning figures, use the markdown image syntax above with actual image URLs from the context."
+                ),
+                input_variables=["context", "question"],
             )
-            if img_urls:
-                # First 3 images
-                context += f"Images: {', '.join(img_urls[:3])}\n"
-            context += f"Content: {doc.page_content}\n"
-            context_parts.append(context)
-
-        formatted_context = "\n---\n".join(context_parts)
-
-        prompt_template = PromptTemplate(
-            template=(
-                "You are an expert assistant analyzing NASA space biology research papers. "
-                "Use the following papers to answer the question. "
-                "ALWAYS cite paper Title and PMCID.\n\n"
-                "When referencing images/figures from papers, use this EXACT format:\n"
-                "![Figure from PMCID](IMAGE_URL)\n\n"
-                "Available Papers:\n{context}\n\n"
-                "Question: {question}\n\n"
-                "Answer with citations in markdown format. When mentioning figures, use the markdown image syntax above with actual image URLs from the context."
-            ),
-            input_variables=["context", "question"],
-        )
 
-        prompt = prompt_template.format(
-            context=formatted_context, question=request.query
-        )
-        response = llm.invoke(prompt)
-        answer = response.content
+            prompt = prompt_template.format(
+                context=formatted_context, question=request.query
+            )
+            llm_pool = get_llm_pool()
+            if stream_tokens:
+                parts = []
+                async for text in llm_pool.astream(
+                        request.model_name, request.google_api_key, prompt, temperature=0):
+                    parts.append(text)
+                    yield "token", {"text": text}
+                answer = "".join(parts)
+            else:
+                answer = await llm_pool.ainvoke(
+                    request.model_name, request.google_api_key, prompt, temperature=0)
 
-    # Step 8: Format response with image URLs parsed from JSON
-    source_docs = []
-    for doc in all_relevant_docs[: request.num_results]:
-        doc_title = doc.metadata.get("title", "Unknown")
-        
-        # Parse image URLs from JSON string in metadata
-        image_urls_json = doc.metadata.get("image_urls_json", "")
-        try:
-            image_urls = json.loads(image_urls_json) if image_urls_json else []
-        except:
-            # Fallback to map if JSON parsing fails (for newly scraped papers)
-            image_urls = paper_images_map.get(doc_title, [])
-        
-        source_docs.append(
-            {
-                "page_content": doc.page_content[:500] + "..."
-                if len(doc.page_content) > 500
-                else doc.page_content,
-                "metadata": {
-                    "title": doc_title,
-                    "pmcid": doc.metadata.get("pmcid", "N/A"),
-                    "source": doc.metadata.get("source", "Unknown"),
-                    "image_urls": image_urls,
-                },
-            }
-        )
+            if answer_cache and isinstance(answer, str) and answer:
+                await run_db(
+                    answer_cache.put, request.model_name, request.query, context_docs,
+                    answer, plan.query_vector)
 
-    return {
+    # Step 8: Full response
+    yield "result", {
         "answer": answer,
         "source_documents": source_docs,
         "images_found": image_data,
         "papers_newly_scraped": len(papers_to_scrape),
         "papers_already_loaded": len(loaded_papers),
+        "reranking": rerank_stats,
+        "context_packing": packing_stats,
+        "answer_cached": answer_cached,
         "query": request.query,
         "timestamp": datetime.now().isoformat(),
     }
 
 
+@app.post("/search")
+async def search_papers(request: OnDemandSearchQuery):
+    """
+    Smart search endpoint:
+    1. Search main (full papers) and secondary (abstract) stores concurrently
+    2. If main has too few results, resolve abstract hits against papers.db in one query
+    3. Scrape full papers with images (if not already loaded)
+    4. Generate answer with citations and images
+    """
+    result = None
+    async for event, data in search_events(request):
+        if event == "result":
+            result = data
+    return result
+
+
+@app.post("/search/stream")
+async def stream_search(request: OnDemandSearchQuery):
+    """
+    Streaming variant of /search (server-sent events)
+
+    Sends sources and images as soon as retrieval finishes, then scrape
+    progress per paper, then the answer token by token, then the full
+    result. Errors after the stream has started arrive as an "error" event.
+    """
+    # Fail with a proper status code before the stream starts
+    await ensure_vector_stores()
+
+    async def event_stream():
+        try:
+            async for event, data in search_events(request, stream_tokens=True):
+                yield format_sse(event, data)
+        except HTTPException as e:
+            yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            print(f"❌ Streaming search failed: {e}")
+            yield format_sse("error", {"status_code": 500, "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/workflow")
 async def generate_workflow(request: OnDemandSearchQuery):
     """
     Generate intelligent ReactFlow workflow diagram using LLM analysis
     Returns nodes and edges representing paper relationships and research methodology flow
     """
-    global secondary_vector_store, vector_store, db_manager
+    global secondary_vector_store, vector_store, embeddings, db_manager
 
-    # Search for relevant papers
-    relevant_docs = []
-    
-    if vector_store:
-        try:
-            retriever = vector_store.as_retriever(
-                search_type="similarity", search_kwargs={"k": request.num_results}
-            )
-            relevant_docs = retriever.invoke(request.query)
-        except Exception as e:
-            print(f"Error searching main vector store: {e}")
-    
+    await ensure_vector_stores()
+
+    # Search for relevant papers (both stores at once, abstracts used if main is short)
+    keywords = parse_keywords(request.keyword_filter) if request.use_keyword_filter else []
+    main, abstracts = store_retrievers()
+    hits = await search_stores(
+        request.query, request.num_results, embeddings, main=main, abstracts=abstracts,
+        method=request.search_method, keywords=keywords,
+    )
+    relevant_docs = hits.main_docs
     if len(relevant_docs) < request.num_results and secondary_vector_store:
-        retriever = secondary_vector_store.as_retriever(
-            search_type="similarity", search_kwargs={"k": request.num_results}
-        )
-        relevant_docs = retriever.invoke(request.query)
+        relevant_docs = hits.abstract_docs
 
     if not relevant_docs:
         raise HTTPException(
@@ -680,69 +968,26 @@ async def generate_workflow(request: OnDemandSearchQuery):
             detail="No papers found for this query"
         )
 
-    # Use LLM to analyze relationships if API key provided
-    workflow_analysis = None
+    # Attributes are cached per paper and citations per paper set; the LLM
+    # is only asked about what hasn't been seen (and not at all without a key)
+    papers = papers_from_docs(relevant_docs)
+    run_prompt = None
     if request.use_llm and request.google_api_key:
-        try:
-            llm = ChatGoogleGenerativeAI(
-                model=request.model_name,
-                temperature=0.2,
-                google_api_key=request.google_api_key,
-            )
-            
-            # Format paper information for LLM
-            papers_info = []
-            for idx, doc in enumerate(relevant_docs):
-                title = doc.metadata.get("title", "Unknown Title")
-                pmcid = doc.metadata.get("pmcid", "N/A")
-                content_preview = doc.page_content[:600]
-                papers_info.append(f"[Paper {idx}]\nTitle: {title}\nPMCID: {pmcid}\nContent Preview: {content_preview}...")
-            
-            workflow_prompt = f"""Analyze these research papers and extract components for a ReactFlow diagram.
+        async def run_prompt(prompt: str) -> str:
+            return await get_llm_pool().ainvoke(
+                request.model_name, request.google_api_key, prompt, temperature=0.2)
 
-Query: "{request.query}"
-
-Papers:
-{chr(10).join(papers_info)}
-
-Extract and return a JSON object with this EXACT structure:
-{{
-    "papers": [
-        {{"id": "paperA", "title": "Paper title (max 45 chars)", "pmcid": "PMC123", "author": "Dr. Name", "topic": "Research Topic", "method": "Methodology", "result": "Key Finding"}}
-    ],
-    "citations": [
-        {{"from": "paperB", "to": "paperA", "reason": "How paperB cites paperA"}}
-    ]
-}}
-
-Extraction Rules:
-1. **Papers**: For each paper extract:
-   - id: Use format "paperA", "paperB", "paperC", etc.
-   - title: Paper title (max 45 chars)
-   - pmcid: PMCID from metadata
-   - author: Primary author name (e.g., "Dr. Rao", "Prof. Smith")
-   - topic: Main research topic (max 40 chars, e.g., "Gravity Response", "Space Radiation")
-   - method: Research methodology (max 40 chars, e.g., "Hydroponics", "Genome Sequencing")
-   - result: Key finding (max 45 chars, e.g., "Enhanced Yield", "Stable Repair Mechanism")
-
-2. **Citations**: Only if papers reference each other:
-   - from: Paper ID that cites
-   - to: Paper ID being cited
-   - reason: Brief context (max 40 chars)
-
-Keep labels concise and scientific.
-Return ONLY valid JSON, no markdown, no explanation."""
-
-            response = llm.invoke(workflow_prompt)
-            # Parse JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response.content, re.DOTALL)
-            if json_match:
-                workflow_analysis = json.loads(json_match.group())
-                print(f"✅ LLM workflow analysis successful")
-        except Exception as e:
-            print(f"Error in LLM workflow analysis: {e}")
-            workflow_analysis = None
+    workflow_analysis = None
+    try:
+        analysis = await analyze_papers(
+            request.query, papers, db_manager, run_prompt, request.model_name)
+        if analysis.described:
+            workflow_analysis = analysis.to_dict()
+            print(f"✅ Workflow analysis: {analysis.cached_papers} cached, "
+                  f"{analysis.analyzed_papers} analyzed by LLM")
+    except Exception as e:
+        print(f"Error in LLM workflow analysis: {e}")
+        workflow_analysis = None
 
     # Generate ReactFlow nodes and edges
     nodes = []
@@ -849,9 +1094,9 @@ Return ONLY valid JSON, no markdown, no explanation."""
                     })
     else:
         # Fallback: Simple paper list if no LLM analysis
-        for idx, doc in enumerate(relevant_docs):
-            paper_id = f"paper{chr(65+idx)}"
-            title = doc.metadata.get("title", "Unknown Title")
+        for idx, paper in enumerate(papers):
+            paper_id = paper.id
+            title = paper.title
             y_pos = y_base + (idx * y_spacing)
             
             nodes.append({
@@ -861,25 +1106,88 @@ Return ONLY valid JSON, no markdown, no explanation."""
                 "position": {"x": 100, "y": y_pos}
             })
     
+    # Related-paper edges from the precomputed similarity graph (no LLM call)
+    if paper_graph:
+        paper_ids = {paper.key: paper.id for paper in papers}
+        for from_key, to_key, similarity in await run_db(paper_graph.edges_between, list(paper_ids)):
+            edges.append({
+                "id": f"e_{paper_ids[from_key]}_related_{paper_ids[to_key]}",
+                "source": paper_ids[from_key],
+                "target": paper_ids[to_key],
+                "label": f"Related ({similarity:.2f})",
+                "data": {"similarity": round(similarity, 4)}
+            })
+    
     return {
         "nodes": nodes,
         "edges": edges,
         "query": request.query,
-        "num_papers": len(relevant_docs),
+        "num_papers": len(papers),
         "analysis": workflow_analysis
     }
 
 
+def paper_previews(links: List[str]) -> Dict[str, str]:
+    """Opening text (first chunk) of loaded papers, by link"""
+    previews = {}
+    if not vector_store or not links:
+        return previews
+    page = vector_store._collection.get(
+        where={"$and": [{"source": {"$in": links}}, {"chunk_index": 0}]},
+        include=["documents", "metadatas"],
+    )
+    for text, metadata in zip(page["documents"], page["metadatas"]):
+        previews[metadata.get("source")] = (text or "")[:PREVIEW_CHARS]
+    return previews
+
+
+@app.post("/workflow/precompute")
+async def precompute_workflow(request: WorkflowPrecomputeRequest):
+    """
+    Describe loaded papers in the background so later /workflow calls are served from cache
+
+    The API key is only held in memory for the duration of the task.
+    """
+    global workflow_precompute_task
+
+    if workflow_precompute_task and not workflow_precompute_task.done():
+        raise HTTPException(status_code=409, detail="Attribute precompute already running")
+
+    await ensure_vector_stores()
+    rows = await run_db(db_manager.get_papers_without_attributes, request.limit)
+    previews = await run_cpu(paper_previews, [row["link"] for row in rows])
+    papers = [
+        WorkflowPaper(
+            key=paper_key(row),
+            title=row["title"],
+            pmcid=row["pmcid"] or "N/A",
+            preview=previews.get(row["link"], ""),
+        )
+        for row in rows
+    ]
+
+    async def run_prompt(prompt: str) -> str:
+        return await get_llm_pool().ainvoke(
+            request.model_name, request.google_api_key, prompt, temperature=0.2)
+
+    workflow_precompute_task = asyncio.create_task(
+        precompute_attributes(papers, db_manager, run_prompt, request.model_name))
+    return {
+        "status": "started" if papers else "nothing to do",
+        "papers_queued": len(papers),
+    }
+
+
 @app.post("/database/load-csv")
 async def load_csv_to_database():
     """Load CSV into SQLite database (without scraping)"""
     global db_manager
 
     if not db_manager:
-        db_manager = init_database()
+        db_manager = await run_db(init_database)
 
     try:
-        stats = db_manager.load_csv(CSV_URL)
+        stats = await run_db(db_manager.load_csv, CSV_URL)
         return {
             "status": "success",
             "message": f"CSV loaded into database",
@@ -890,116 +1198,156 @@ async def load_csv_to_database():
             status_code=500, detail=f"Error loading CSV: {str(e)}")
 
 
-@app.post("/load-papers", response_model=LoadPapersResponse)
-async def load_papers(request: LoadPapersRequest, background_tasks: BackgroundTasks):
-    """Scrape full papers and create embeddings (run after loading CSV and abstracts)"""
-    global vector_store, embeddings, db_manager
+async def update_paper_graph(links: List[str]):
+    """Add newly loaded papers to the similarity graph; a failure doesn't fail ingestion"""
+    if not paper_graph or not vector_store or not links:
+        return
+    try:
+        await run_cpu(paper_graph.update_papers, vector_store._collection, links)
+    except Exception as e:
+        print(f"⚠️ Paper graph update failed: {e}")
 
-    if not embeddings:
-        embeddings = init_embeddings()
 
-    if not db_manager:
-        db_manager = init_database()
+async def ingest_papers(papers: List[Dict]) -> Tuple[Dict[int, int], Dict[int, str]]:
+    """
+    Scrape, chunk and embed a batch of papers, marking them as loaded
 
-    try:
-        # Get unloaded papers from database
-        if request.num_papers > 0:
-            papers_to_load = db_manager.get_unloaded_papers(
-                limit=request.num_papers)
-        else:
-            papers_to_load = db_manager.get_unloaded_papers()
-
-        if not papers_to_load:
-            return LoadPapersResponse(
-                status="success",
-                papers_loaded=0,
-                chunks_created=0,
-                message="All papers already loaded or no papers available. Load CSV first using /database/load-csv",
-            )
+    Returns:
+        Tuple of ({paper_id: chunks_created}, {paper_id: error})
+    """
+    global vector_store
 
-        docs = []
-        papers_successfully_loaded = []
+    await ensure_vector_stores()
 
-        for paper in papers_to_load:
-            title = paper["title"]
-            article_url = paper["link"]
-            pmcid = paper["pmcid"]
+    docs = []
+    papers_successfully_loaded = []
+    failed = {}
 
-            print(f"Scraping: {title[:60]}...")
-            result = scrape_article_text_with_images(article_url)
+    print(f"Scraping {len(papers)} papers...")
+    results = await asyncio.gather(
+        *(scrape_article_text_with_images(paper["link"]) for paper in papers)
+    )
 
-            if not result:
-                print(f"  ❌ Failed to scrape")
-                continue
+    for paper, result in zip(papers, results):
+        title = paper["title"]
+        article_url = paper["link"]
+        pmcid = paper["pmcid"]
 
-            text, image_urls = result
+        if not result:
+            print(f"  ❌ Failed to scrape: {title[:60]}")
+            failed[paper["id"]] = "Failed to scrape"
+            continue
 
-            # Create document with image URLs as JSON string
-            doc = Document(
-                page_content=text,
-                metadata={
-                    "title": title,
-                    "source": article_url,
-                    "pmcid": pmcid or "",
-                    "image_urls_json": json.dumps(image_urls) if image_urls else "",  # Store as JSON string
-                },
-            )
-            docs.append(doc)
-            papers_successfully_loaded.append(paper)
-            print(f"  ✅ Scraped successfully")
-            time.sleep(1)  # polite delay
-
-        if not docs:
-            raise HTTPException(
-                status_code=500, detail="Failed to scrape any papers. Please try again."
-            )
+        text, image_urls = result
 
-        # Split into chunks
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=5000,
-            chunk_overlap=500,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
+        # Create document with image URLs as JSON string
+        doc = Document(
+            page_content=text,
+            metadata={
+                "title": title,
+                "source": article_url,
+                "pmcid": pmcid or "",
+                "image_urls_json": json.dumps(image_urls) if image_urls else "",  # Store as JSON string
+            },
         )
-        chunks = splitter.split_documents(docs)
-        
-        # No need to filter metadata since we're using JSON strings for images
+        docs.append(doc)
+        papers_successfully_loaded.append(paper)
+        print(f"  ✅ Scraped successfully: {title[:60]}")
 
-        # Create or update vector store
-        if vector_store:
-            vector_store.add_documents(chunks)
-        else:
-            vector_store = create_vectorstore(
-                chunks, embeddings, PERSIST_DIRECTORY, COLLECTION_NAME
-            )
+    if not docs:
+        return {}, failed
+
+    # Split into chunks
+    chunks, chunk_ids, chunk_ids_by_link = await run_cpu(split_papers, docs, paper_splitter())
 
-        # Mark papers as loaded in database
-        for i, paper in enumerate(papers_successfully_loaded):
-            # Calculate chunks for this paper
-            paper_chunks = [
-                c for c in chunks if c.metadata.get("title") == paper["title"]
-            ]
-            chunks_count = len(paper_chunks)
-
-            # Mark as loaded
-            db_manager.mark_as_loaded(
-                paper["link"], chunks_created=chunks_count)
+    # No need to filter metadata since we're using JSON strings for images
+
+    # Create or update vector store (batched embedding + bulk upsert)
+    if not vector_store:
+        vector_store = await run_cpu(
+            open_vectorstore, embeddings, PERSIST_DIRECTORY, COLLECTION_NAME)
+    index_stats = await run_cpu(index_chunks, vector_store, chunks, chunk_ids,
+                                keyword_index=main_keyword_index)
+    print(f"  ⚡ Embedded {index_stats['chunks']} chunks at {index_stats['chunks_per_second']} chunks/s")
+
+    # Mark papers as loaded in database (one transaction for the batch)
+    chunk_counts = [
+        (paper["link"], len(chunk_ids_by_link.get(paper["link"], [])))
+        for paper in papers_successfully_loaded
+    ]
+
+    marked = await run_db(db_manager.mark_many_as_loaded, chunk_counts)
+
+    loaded = {}
+    for paper, (link, chunks_count) in zip(papers_successfully_loaded, chunk_counts):
+        if marked.get(link):
+            loaded[paper["id"]] = chunks_count
             print(
-                f"  📊 Marked as loaded: {
-                    paper['title'][:50]}... ({chunks_count} chunks)"
+                f"  📊 Marked as loaded: {paper['title'][:50]}... ({chunks_count} chunks)"
             )
+        else:
+            failed[paper["id"]] = "Failed to mark as loaded"
+
+    await update_paper_graph([link for link, _ in chunk_counts if marked.get(link)])
+
+    return loaded, failed
 
-        return LoadPapersResponse(
-            status="success",
-            papers_loaded=len(docs),
-            chunks_created=len(chunks),
-            message=f"Successfully loaded {len(docs)} papers and created {
-                len(chunks)} chunks",
-        )
 
+@app.post("/load-papers", response_model=LoadJobResponse)
+async def load_papers(request: LoadPapersRequest):
+    """Queue a background job that scrapes full papers and creates embeddings"""
+    global db_manager, job_queue
+
+    if not db_manager:
+        db_manager = await run_db(init_database)
+
+    if not job_queue:
+        job_queue = IngestJobQueue(db_manager, ingest_papers)
+        await job_queue.start()
+
+    try:
+        job = await job_queue.submit(request.num_papers)
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Error loading papers: {str(e)}")
+            status_code=500, detail=f"Error queueing papers: {str(e)}")
+
+    if job["total_papers"] == 0:
+        message = "All papers already loaded or no papers available. Load CSV first using /database/load-csv"
+    else:
+        message = f"Queued {job['total_papers']} papers. Track progress at /jobs/{job['id']}"
+
+    return LoadJobResponse(
+        status=job["status"],
+        job_id=job["id"],
+        papers_queued=job["total_papers"],
+        message=message,
+    )
+
+
+@app.get("/jobs")
+async def list_jobs(
+    limit: int = Query(default=20, ge=1, le=100, description="Limit number of results"),
+):
+    """List recent ingestion jobs with progress"""
+    if not db_manager:
+        raise HTTPException(
+            status_code=404, detail="Database manager not initialized")
+
+    jobs = await run_db(db_manager.list_jobs, limit=limit)
+    return {"count": len(jobs), "jobs": jobs}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: int):
+    """Get progress, throughput and failures of an ingestion job"""
+    if not db_manager:
+        raise HTTPException(
+            status_code=404, detail="Database manager not initialized")
+
+    job = await run_db(db_manager.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
 
 
 @app.post("/reset-database")
@@ -1008,9 +1356,18 @@ async def reset_database():
     global vector_store, db_manager
 
     vector_store = None
+    # Drop the stored chunks together with their BM25 index, so hybrid search
+    # never fuses an empty keyword index with stale vectors
+    await run_io(delete_vectorstore, PERSIST_DIRECTORY, COLLECTION_NAME)
+    if main_keyword_index:
+        await run_db(main_keyword_index.clear)
 
     if db_manager:
-        db_manager.reset_database()
+        await run_db(db_manager.reset_database)
+    if paper_graph:
+        await run_db(paper_graph.clear)
+    if answer_cache:
+        await run_db(answer_cache.clear)
 
     return {
         "status": "success",
@@ -1025,7 +1382,7 @@ async def get_database_stats():
         raise HTTPException(
             status_code=404, detail="Database manager not initialized")
 
-    stats = db_manager.get_stats()
+    stats = await run_db(db_manager.get_stats)
     return stats
 
 
@@ -1038,7 +1395,7 @@ async def get_loaded_papers_from_db(
         raise HTTPException(
             status_code=404, detail="Database manager not initialized")
 
-    papers = db_manager.get_loaded_papers(limit=limit)
+    papers = await run_db(db_manager.get_loaded_papers, limit=limit)
     return {"count": len(papers), "papers": papers}
 
 
@@ -1051,7 +1408,7 @@ async def get_unloaded_papers_from_db(
         raise HTTPException(
             status_code=404, detail="Database manager not initialized")
 
-    papers = db_manager.get_unloaded_papers(limit=limit)
+    papers = await run_db(db_manager.get_unloaded_papers, limit=limit)
     return {"count": len(papers), "papers": papers}
 
 
@@ -1062,7 +1419,7 @@ async def get_all_papers_from_db():
         raise HTTPException(
             status_code=404, detail="Database manager not initialized")
 
-    papers = db_manager.get_all_papers()
+    papers = await run_db(db_manager.get_all_papers)
     return {"count": len(papers), "papers": papers}
 
 
@@ -1071,14 +1428,23 @@ async def search_papers_in_db(
     query: str = Query(..., description="Search query"),
     loaded_only: bool = Query(
         default=False, description="Only return loaded papers"),
+    limit: int = Query(default=50, ge=1, le=500, description="Results per page"),
+    offset: int = Query(default=0, ge=0, description="Results to skip"),
 ):
-    """Search papers in database by title"""
+    """Full-text search of papers in database by title and abstract (BM25 ranked)"""
     if not db_manager:
         raise HTTPException(
             status_code=404, detail="Database manager not initialized")
 
-    papers = db_manager.search_papers(query, loaded_only=loaded_only)
-    return {"query": query, "count": len(papers), "papers": papers}
+    papers = await run_db(
+        db_manager.search_papers, query, loaded_only=loaded_only, limit=limit, offset=offset)
+    return {
+        "query": query,
+        "count": len(papers),
+        "limit": limit,
+        "offset": offset,
+        "papers": papers,
+    }
 
 
 class AppendCSVRequest(BaseModel):
@@ -1093,7 +1459,7 @@ async def append_csv_to_database(request: AppendCSVRequest):
             status_code=404, detail="Database manager not initialized")
 
     try:
-        stats = db_manager.append_csv(request.csv_url)
+        stats = await run_db(db_manager.append_csv, request.csv_url)
         return {
             "status": "success",
             "message": f"CSV appended successfully",
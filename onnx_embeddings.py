@@ -0,0 +1,98 @@
+"""
+ONNX Runtime Embedding Backend
+Runs sentence-transformers models on CPU through ONNX Runtime, optionally int8-quantized
+"""
+
+import logging
+import os
+from typing import List, Optional
+
+import numpy as np
+import onnxruntime as ort
+from huggingface_hub import hf_hub_download
+from langchain_core.embeddings import Embeddings
+from tokenizers import Tokenizer
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))  # 0 = let ONNX Runtime decide
+ONNX_BATCH_SIZE = int(os.getenv("ONNX_BATCH_SIZE", "32"))
+
+# Model files published in the sentence-transformers repos
+ONNX_FILE = "onnx/model.onnx"
+ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+class OnnxEmbeddings(Embeddings):
+    """Sentence-transformer embeddings (mean pooling + L2 norm) on ONNX Runtime"""
+
+    def __init__(self, model_name: str, quantized: bool = False,
+                 max_seq_length: int = 256, batch_size: int = ONNX_BATCH_SIZE,
+                 threads: int = ONNX_THREADS, onnx_file: Optional[str] = None):
+        """
+        Initialize backend
+
+        Args:
+            model_name: Hugging Face repo id, e.g. sentence-transformers/all-MiniLM-L6-v2
+            quantized: Use the int8-quantized model file
+            max_seq_length: Tokens kept per text (same as the sentence-transformers config)
+            batch_size: Texts per inference call
+            threads: Intra-op threads (0 for ONNX Runtime default)
+            onnx_file: Model file in the repo, overriding the quantized flag
+        """
+        self.model_name = model_name
+        self.quantized = quantized
+        self.batch_size = batch_size
+
+        model_path = hf_hub_download(
+            model_name, onnx_file or (ONNX_INT8_FILE if quantized else ONNX_FILE))
+        tokenizer_path = hf_hub_download(model_name, "tokenizer.json")
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        logger.info(f"ONNX embeddings loaded: {model_name} ({'int8' if quantized else 'fp32'})")
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed one batch into L2-normalized vectors"""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then normalize (as the model's Normalize module does)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents"""
+        if not texts:
+            return []
+        vectors = [
+            self._embed_batch(texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        return np.vstack(vectors).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query"""
+        return self._embed_batch([text])[0].tolist()
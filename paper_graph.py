@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Paper Similarity Graph
+k-nearest-neighbour graph over per-paper centroid embeddings, stored in SQLite
+
+Usage:
+    python paper_graph.py [--k 10] [--min-similarity 0.5]
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from workflow_analysis import paper_key
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+PAPER_GRAPH_PATH = os.getenv("PAPER_GRAPH_PATH", "./papers.db")
+PAPER_GRAPH_K = int(os.getenv("PAPER_GRAPH_K", "10"))  # Neighbours kept per paper
+PAPER_GRAPH_MIN_SIMILARITY = float(os.getenv("PAPER_GRAPH_MIN_SIMILARITY", "0.5"))
+
+# Records read per Chroma page when computing centroids
+CENTROID_BATCH_SIZE = 1000
+# Rows of the similarity matrix computed at once (bounds memory to BLOCK x papers)
+SIMILARITY_BLOCK_SIZE = 1024
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def compute_centroids(collection, where: Optional[Dict] = None,
+                      batch_size: int = CENTROID_BATCH_SIZE) -> Dict[str, Tuple[np.ndarray, int, str]]:
+    """
+    Average the chunk embeddings of each paper in a Chroma collection
+
+    Args:
+        collection: chromadb Collection
+        where: Metadata filter (e.g. {"source": {"$in": links}}); None for all chunks
+        batch_size: Records read per page
+
+    Returns:
+        Dictionary of paper key to (unit centroid, chunk count, paper link)
+    """
+    sums: Dict[str, np.ndarray] = {}
+    counts: Dict[str, int] = {}
+    links: Dict[str, str] = {}
+    offset = 0
+    while True:
+        page = collection.get(where=where, limit=batch_size, offset=offset,
+                              include=["embeddings", "metadatas"])
+        if not len(page["ids"]):
+            break
+        vectors = np.asarray(page["embeddings"], dtype=np.float32)
+        keys = [paper_key(metadata or {}) for metadata in page["metadatas"]]
+
+        # Sum each paper's rows in one vectorized pass
+        unique, inverse = np.unique(np.asarray(keys, dtype=object), return_inverse=True)
+        page_sums = np.zeros((len(unique), vectors.shape[1]), dtype=np.float32)
+        np.add.at(page_sums, inverse, vectors)
+        page_counts = np.bincount(inverse, minlength=len(unique))
+
+        for i, key in enumerate(unique):
+            if not key:
+                continue
+            if key in sums:
+                sums[key] += page_sums[i]
+                counts[key] += int(page_counts[i])
+            else:
+                sums[key] = page_sums[i]
+                counts[key] = int(page_counts[i])
+        for key, metadata in zip(keys, page["metadatas"]):
+            if key and key not in links:
+                links[key] = (metadata or {}).get("source") or ""
+
+        offset += len(page["ids"])
+        if len(page["ids"]) < batch_size:
+            break
+
+    if not sums:
+        return {}
+    keys = list(sums)
+    centroids = _normalize(np.vstack([sums[key] / counts[key] for key in keys]))
+    return {key: (centroids[i], counts[key], links[key]) for i, key in enumerate(keys)}
+
+
+def top_k_neighbors(queries: np.ndarray, matrix: np.ndarray, k: int, min_similarity: float,
+                    exclude: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+    """
+    Nearest rows of matrix for each query row by cosine similarity
+
+    Args:
+        queries: Unit vectors (q x d)
+        matrix: Unit vectors (n x d)
+        k: Neighbours per query
+        min_similarity: Minimum cosine similarity kept
+        exclude: For each query, a row of matrix to skip (itself), or -1
+
+    Returns:
+        Per query, (row, similarity) pairs, most similar first
+    """
+    results = []
+    k = min(k, len(matrix))
+    for start in range(0, len(queries), SIMILARITY_BLOCK_SIZE):
+        sims = queries[start:start + SIMILARITY_BLOCK_SIZE] @ matrix.T
+        if exclude is not None:
+            rows = np.arange(len(sims))
+            own = exclude[start:start + SIMILARITY_BLOCK_SIZE]
+            sims[rows[own >= 0], own[own >= 0]] = -np.inf
+        if k == 0:
+            results.extend([] for _ in range(len(sims)))
+            continue
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_sims = np.take_along_axis(top_sims, order, axis=1)
+        for row, row_sims in zip(top, top_sims):
+            results.append([
+                (int(j), float(s)) for j, s in zip(row, row_sims) if s >= min_similarity
+            ])
+    return results
+
+
+class PaperSimilarityGraph:
+    """Per-paper centroids and their k nearest neighbours in SQLite"""
+
+    def __init__(self, db_path: str = PAPER_GRAPH_PATH, k: int = PAPER_GRAPH_K,
+                 min_similarity: float = PAPER_GRAPH_MIN_SIMILARITY):
+        """
+        Initialize graph
+
+        Args:
+            db_path: Path to SQLite database file
+            k: Neighbours kept per paper
+            min_similarity: Minimum cosine similarity for an edge
+        """
+        self.db_path = db_path
+        self.k = k
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS paper_centroids (
+                paper_key TEXT PRIMARY KEY,
+                link TEXT,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                chunks INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS paper_neighbors (
+                paper_key TEXT NOT NULL,
+                neighbor_key TEXT NOT NULL,
+                similarity REAL NOT NULL,
+                PRIMARY KEY (paper_key, neighbor_key)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_paper_neighbors_neighbor ON paper_neighbors(neighbor_key)
+        """)
+        self.conn.commit()
+        self._refresh_counts()
+
+    def _refresh_counts(self):
+        """Recount papers and edges for stats() (caller holds the lock or owns the graph)"""
+        self.papers = self.conn.execute("SELECT COUNT(*) FROM paper_centroids").fetchone()[0]
+        self.edges = self.conn.execute("SELECT COUNT(*) FROM paper_neighbors").fetchone()[0]
+
+    def _save_centroids(self, centroids: Dict[str, Tuple[np.ndarray, int, str]]):
+        """Upsert centroids (caller holds the lock)"""
+        now = time.time()
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO paper_centroids (paper_key, link, dim, vector, chunks, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (key, link, len(vector), vector.astype(np.float32).tobytes(), count, now)
+            for key, (vector, count, link) in centroids.items()
+        ])
+
+    def _load_centroids(self, dim: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+        """All stored centroids of one dimension as (keys, matrix) (caller holds the lock)"""
+        if dim is None:
+            row = self.conn.execute(
+                "SELECT dim FROM paper_centroids GROUP BY dim ORDER BY COUNT(*) DESC LIMIT 1"
+            ).fetchone()
+            if not row:
+                return [], np.zeros((0, 0), dtype=np.float32)
+            dim = row[0]
+        rows = self.conn.execute(
+            "SELECT paper_key, vector FROM paper_centroids WHERE dim = ? ORDER BY paper_key", (dim,)
+        ).fetchall()
+        if not rows:
+            return [], np.zeros((0, dim), dtype=np.float32)
+        matrix = np.vstack([np.frombuffer(vector, dtype=np.float32) for _, vector in rows])
+        return [key for key, _ in rows], matrix
+
+    def rebuild(self, collections: Sequence) -> Dict:
+        """
+        Recompute every centroid and the whole kNN graph
+
+        Papers in several collections take their centroid from the first
+        one listed (pass the full-paper collection before the abstracts).
+
+        Args:
+            collections: chromadb Collections to read chunk embeddings from
+
+        Returns:
+            Dictionary with papers, edges and elapsed seconds
+        """
+        started = time.monotonic()
+        centroids: Dict[str, Tuple[np.ndarray, int, str]] = {}
+        for collection in collections:
+            for key, value in compute_centroids(collection).items():
+                centroids.setdefault(key, value)
+
+        with self._lock:
+            self.conn.execute("DELETE FROM paper_centroids")
+            self.conn.execute("DELETE FROM paper_neighbors")
+            self._save_centroids(centroids)
+            keys, matrix = self._load_centroids()
+            edges = []
+            if len(keys) > 1:
+                neighbors = top_k_neighbors(
+                    matrix, matrix, self.k + 1, self.min_similarity,
+                    exclude=np.arange(len(keys)))
+                for i, row in enumerate(neighbors):
+                    edges.extend((keys[i], keys[j], s) for j, s in row[:self.k])
+            self.conn.executemany(
+                "INSERT INTO paper_neighbors (paper_key, neighbor_key, similarity) VALUES (?, ?, ?)",
+                edges)
+            self.conn.commit()
+            self._refresh_counts()
+
+        stats = {
+            'papers': len(keys),
+            'edges': len(edges),
+            'elapsed_seconds': round(time.monotonic() - started, 2),
+        }
+        logger.info(f"Paper graph rebuilt: {stats}")
+        return stats
+
+    def update_papers(self, collection, links: Sequence[str]) -> int:
+        """
+        Add or refresh papers after ingestion without rebuilding the graph
+
+        The papers get their own k nearest neighbours, and each existing
+        paper takes them into its list if they are closer than its current
+        k-th neighbour.
+
+        Args:
+            collection: chromadb Collection holding the papers' chunks
+            links: Links of the ingested papers
+
+        Returns:
+            Number of papers updated
+        """
+        links = list(dict.fromkeys(links))
+        if not links:
+            return 0
+        centroids = compute_centroids(collection, where={"source": {"$in": links}})
+        if not centroids:
+            return 0
+
+        dim = len(next(iter(centroids.values()))[0])
+        with self._lock:
+            self._save_centroids(centroids)
+            keys, matrix = self._load_centroids(dim)
+            index = {key: i for i, key in enumerate(keys)}
+            new_keys = [key for key in centroids if key in index]
+            rows = np.array([index[key] for key in new_keys])
+
+            placeholders = ",".join("?" * len(new_keys))
+            self.conn.execute(
+                f"DELETE FROM paper_neighbors WHERE paper_key IN ({placeholders})"
+                f" OR neighbor_key IN ({placeholders})", new_keys + new_keys)
+
+            # The updated papers' own neighbour lists
+            neighbors = top_k_neighbors(
+                matrix[rows], matrix, self.k + 1, self.min_similarity, exclude=rows)
+            edges = [
+                (key, keys[j], similarity)
+                for key, row in zip(new_keys, neighbors)
+                for j, similarity in row[:self.k]
+            ]
+
+            # Other papers take an updated paper if it beats their current k-th neighbour
+            threshold = np.full(len(keys), self.min_similarity, dtype=np.float32)
+            for key, lowest, count in self.conn.execute("""
+                SELECT paper_key, MIN(similarity), COUNT(*) FROM paper_neighbors GROUP BY paper_key
+            """):
+                if count >= self.k and key in index:
+                    threshold[index[key]] = max(lowest, self.min_similarity)
+            sims = matrix @ matrix[rows].T
+            sims[rows, :] = -np.inf
+            touched = set()
+            for j, q in zip(*np.nonzero(sims >= threshold[:, None])):
+                edges.append((keys[j], new_keys[q], float(sims[j, q])))
+                touched.add(keys[j])
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO paper_neighbors (paper_key, neighbor_key, similarity)
+                VALUES (?, ?, ?)
+            """, edges)
+            self.conn.executemany("""
+                DELETE FROM paper_neighbors
+                WHERE paper_key = ? AND neighbor_key NOT IN (
+                    SELECT neighbor_key FROM paper_neighbors
+                    WHERE paper_key = ? ORDER BY similarity DESC LIMIT ?
+                )
+            """, [(key, key, self.k) for key in touched])
+            self.conn.commit()
+            self._refresh_counts()
+
+        logger.info(f"Paper graph updated for {len(new_keys)} papers")
+        return len(new_keys)
+
+    def edges_between(self, paper_keys: Sequence[str]) -> List[Tuple[str, str, float]]:
+        """
+        Neighbour edges among a set of papers
+
+        Args:
+            paper_keys: Paper PMCIDs (or links)
+
+        Returns:
+            (paper key, neighbour key, similarity) per related pair, once per
+            pair, most similar first
+        """
+        paper_keys = list(dict.fromkeys(paper_keys))
+        if len(paper_keys) < 2:
+            return []
+        placeholders = ",".join("?" * len(paper_keys))
+        with self._lock:
+            rows = self.conn.execute(f"""
+                SELECT paper_key, neighbor_key, similarity FROM paper_neighbors
+                WHERE paper_key IN ({placeholders}) AND neighbor_key IN ({placeholders})
+                ORDER BY similarity DESC
+            """, paper_keys + paper_keys).fetchall()
+
+        seen = set()
+        edges = []
+        for a, b, similarity in rows:
+            pair = frozenset((a, b))
+            if pair not in seen:
+                seen.add(pair)
+                edges.append((a, b, similarity))
+        return edges
+
+    def stats(self) -> Dict:
+        """
+        Get number of papers and edges
+
+        Reads the counts kept after each write instead of taking the lock,
+        which update_papers holds for its whole run, so /health never waits.
+        """
+        return {'papers': self.papers, 'edges': self.edges, 'k': self.k,
+                'min_similarity': self.min_similarity}
+
+    def clear(self):
+        """Remove all centroids and edges"""
+        with self._lock:
+            self.conn.execute("DELETE FROM paper_centroids")
+            self.conn.execute("DELETE FROM paper_neighbors")
+            self.conn.commit()
+            self._refresh_counts()
+
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+def main():
+    import chromadb
+
+    parser = argparse.ArgumentParser(description="Rebuild the paper similarity graph")
+    parser.add_argument("--k", type=int, default=PAPER_GRAPH_K, help="Neighbours per paper")
+    parser.add_argument("--min-similarity", type=float, default=PAPER_GRAPH_MIN_SIMILARITY)
+    parser.add_argument("--chroma-dir", default="./chroma_db", help="Full-paper Chroma directory")
+    parser.add_argument("--collection", default="space_biology_papers")
+    parser.add_argument("--abstract-dir", default="./small_persistent_db",
+                        help="Abstract Chroma directory")
+    parser.add_argument("--abstract-collection", default="search_semantics")
+    args = parser.parse_args()
+
+    collections = []
+    for path, name in ((args.chroma_dir, args.collection),
+                       (args.abstract_dir, args.abstract_collection)):
+        if not os.path.isdir(path):
+            print(f"Skipping {name}: {path} not found")
+            continue
+        try:
+            collections.append(chromadb.PersistentClient(path=path).get_collection(name))
+        except Exception as e:
+            print(f"Skipping {name}: {e}")
+
+    graph = PaperSimilarityGraph(k=args.k, min_similarity=args.min_similarity)
+    stats = graph.rebuild(collections)
+    print(f"Papers: {stats['papers']}  Edges: {stats['edges']}  Time: {stats['elapsed_seconds']}s")
+    graph.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Retrieval Planner for On-Demand Search
+Queries the full-paper and abstract stores concurrently with one query embedding
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from database_manager import PaperDatabaseManager
+from executors import run_cpu, run_db, run_io
+from keyword_index import ChunkKeywordIndex
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+RRF_K = int(os.getenv("RRF_K", "60"))  # Rank offset in reciprocal-rank fusion
+HYBRID_FETCH_K = int(os.getenv("HYBRID_FETCH_K", "20"))  # Minimum candidates per ranker
+
+SEARCH_METHODS = ("similarity", "mmr", "hybrid")
+
+# Chunks fetched per already-loaded paper
+CHUNKS_PER_PAPER = 5
+
+
+def _doc_key(doc: Document) -> Tuple[Optional[str], str]:
+    """Identity of a chunk across rankers (Chroma results carry no ids)"""
+    return doc.metadata.get("source"), doc.page_content
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[Document]], k: int = RRF_K) -> List[Document]:
+    """
+    Merge ranked lists with reciprocal-rank fusion
+
+    Each chunk scores sum(1 / (k + rank)) over the lists it appears in, so
+    chunks ranked well by both BM25 and vector search rise to the top
+    without having to calibrate their raw scores against each other.
+
+    Args:
+        rankings: Ranked document lists, best first
+        k: Rank offset; larger values flatten the head of each list
+
+    Returns:
+        Documents ordered by fused score
+    """
+    scores: Dict[Tuple[Optional[str], str], float] = {}
+    docs: Dict[Tuple[Optional[str], str], Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            key = _doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            docs.setdefault(key, doc)
+    return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
+def parse_keywords(keyword_filter: Optional[str]) -> List[str]:
+    """Split a comma-separated keyword filter into lowercase keywords"""
+    if not keyword_filter:
+        return []
+    return [kw.strip().lower() for kw in keyword_filter.split(",") if kw.strip()]
+
+
+def filter_by_keywords(docs: List[Document], keywords: List[str]) -> List[Document]:
+    """Keep documents whose title contains any of the keywords"""
+    if not keywords:
+        return docs
+    return [
+        doc for doc in docs
+        if any(kw in (doc.metadata.get("title") or "").lower() for kw in keywords)
+    ]
+
+
+@dataclass
+class StoreRetriever:
+    """A Chroma store and, optionally, the BM25 index over the same chunks"""
+    vector_store: object
+    keyword_index: Optional[ChunkKeywordIndex] = None
+    name: str = "main"
+
+    async def search(self, query: str, query_vector: List[float], k: int,
+                     method: str = "similarity",
+                     keywords: Optional[List[str]] = None) -> List[Document]:
+        """
+        Search the store
+
+        Args:
+            query: Query text (used by BM25)
+            query_vector: Query embedding (used by vector search)
+            k: Number of chunks
+            method: "similarity", "mmr" or "hybrid" (BM25 + vector with RRF)
+            keywords: Only keep chunks whose title contains one of these
+
+        Returns:
+            Up to k chunks, best first; a failing store yields no hits
+        """
+        # Over-fetch when filtering so the filter doesn't leave too few hits
+        fetch_k = k * 4 if keywords else k
+        try:
+            if method == "mmr":
+                docs = await run_cpu(
+                    self.vector_store.max_marginal_relevance_search_by_vector,
+                    query_vector, k=fetch_k, fetch_k=max(fetch_k * 4, HYBRID_FETCH_K),
+                )
+            elif method == "hybrid" and self.keyword_index is not None:
+                candidates = max(fetch_k * 2, HYBRID_FETCH_K)
+                vector_docs, keyword_hits = await asyncio.gather(
+                    run_cpu(self.vector_store.similarity_search_by_vector,
+                            query_vector, k=candidates),
+                    run_io(self.keyword_index.search, query, candidates),
+                )
+                docs = reciprocal_rank_fusion(
+                    [vector_docs, [doc for doc, _ in keyword_hits]])
+            else:
+                docs = await run_cpu(
+                    self.vector_store.similarity_search_by_vector, query_vector, k=fetch_k)
+        except Exception as e:
+            logger.error(f"Error searching {self.name} vector store: {e}")
+            return []
+
+        return filter_by_keywords(docs, keywords or [])[:k]
+
+    async def fetch_paper_chunks(self, query: str, query_vector: List[float],
+                                 links: List[str], per_paper: int = CHUNKS_PER_PAPER,
+                                 method: str = "similarity") -> List[Document]:
+        """
+        Get the chunks most relevant to the query for several papers in one query
+
+        Args:
+            query: Query text (used by BM25)
+            query_vector: Query embedding
+            links: Paper links (the "source" metadata of their chunks)
+            per_paper: Maximum chunks kept per paper
+            method: "hybrid" also ranks the papers' chunks with BM25
+
+        Returns:
+            Chunks ordered by relevance, at most per_paper for each paper
+        """
+        links = list(dict.fromkeys(links))
+        if not links:
+            return []
+
+        # Over-fetch so one paper's chunks can't crowd out the others
+        k = per_paper * len(links) * 2
+        results = await run_cpu(
+            self.vector_store.similarity_search_by_vector,
+            query_vector, k=k, filter={"source": {"$in": links}},
+        )
+        if method == "hybrid" and self.keyword_index is not None:
+            keyword_hits = await run_io(self.keyword_index.search, query, k, sources=links)
+            results = reciprocal_rank_fusion([results, [doc for doc, _ in keyword_hits]])
+
+        counts: Dict[Optional[str], int] = {}
+        chunks = []
+        for doc in results:
+            link = doc.metadata.get("source")
+            if counts.get(link, 0) < per_paper:
+                counts[link] = counts.get(link, 0) + 1
+                chunks.append(doc)
+        return chunks
+
+
+@dataclass
+class RetrievalPlan:
+    """Store hits for a query and which papers still need scraping"""
+    query_vector: List[float]
+    main_docs: List[Document] = field(default_factory=list)
+    abstract_docs: List[Document] = field(default_factory=list)
+    loaded_papers: List[Dict] = field(default_factory=list)
+    papers_to_scrape: List[Dict] = field(default_factory=list)
+
+
+async def search_stores(query: str, k: int, embeddings: Embeddings,
+                        main: Optional[StoreRetriever] = None,
+                        abstracts: Optional[StoreRetriever] = None,
+                        method: str = "similarity",
+                        keywords: Optional[List[str]] = None) -> RetrievalPlan:
+    """
+    Embed the query once and search both stores concurrently
+
+    Args:
+        query: Search query
+        k: Hits per store
+        embeddings: Embedding model shared by both stores
+        main: Full-paper store (None if not loaded)
+        abstracts: Abstract store (None if not loaded)
+        method: "similarity", "mmr" or "hybrid"
+        keywords: Only keep hits whose title contains one of these
+
+    Returns:
+        RetrievalPlan with query_vector, main_docs and abstract_docs
+    """
+    query_vector = await run_cpu(embeddings.embed_query, query)
+
+    async def search(store: Optional[StoreRetriever]) -> List[Document]:
+        if store is None:
+            return []
+        return await store.search(query, query_vector, k, method, keywords)
+
+    main_docs, abstract_docs = await asyncio.gather(search(main), search(abstracts))
+    return RetrievalPlan(query_vector, main_docs, abstract_docs)
+
+
+async def plan_retrieval(query: str, num_results: int, embeddings: Embeddings,
+                         db_manager: PaperDatabaseManager,
+                         main: Optional[StoreRetriever] = None,
+                         abstracts: Optional[StoreRetriever] = None,
+                         method: str = "similarity",
+                         keywords: Optional[List[str]] = None) -> RetrievalPlan:
+    """
+    Decide which papers to read from the main store and which to scrape
+
+    Both stores are searched up front. Abstract hits are only used when the
+    main store returns fewer than num_results chunks; their loaded status is
+    resolved with one batched lookup in papers.db.
+
+    Args:
+        query: Search query
+        num_results: Number of hits wanted
+        embeddings: Embedding model shared by both stores
+        db_manager: Paper database
+        main: Full-paper store (None if not loaded)
+        abstracts: Abstract store (None if not loaded)
+        method: "similarity", "mmr" or "hybrid"
+        keywords: Only keep hits whose title contains one of these
+
+    Returns:
+        RetrievalPlan with loaded_papers and papers_to_scrape filled in
+    """
+    plan = await search_stores(query, num_results, embeddings, main, abstracts, method, keywords)
+
+    seen = set()
+    for doc in plan.main_docs:
+        link = doc.metadata.get("source")
+        if link and link not in seen:
+            seen.add(link)
+            plan.loaded_papers.append({
+                "title": doc.metadata.get("title"),
+                "pmcid": doc.metadata.get("pmcid"),
+                "link": link,
+            })
+
+    if len(plan.main_docs) >= num_results:
+        logger.info(f"Found {len(plan.main_docs)} results in main vector store (full papers)")
+        return plan
+
+    candidates = []
+    for doc in plan.abstract_docs:
+        link = doc.metadata.get("source")
+        if link and link not in seen:
+            seen.add(link)
+            candidates.append({
+                "link": link,
+                "pmcid": doc.metadata.get("pmcid"),
+                "title": doc.metadata.get("title"),
+            })
+
+    papers = await run_db(db_manager.get_papers_by_links, [p["link"] for p in candidates])
+    for candidate in candidates:
+        db_paper = papers.get(candidate["link"])
+        if db_paper and db_paper["isLoaded"] and main is not None:
+            plan.loaded_papers.append(db_paper)
+        else:
+            plan.papers_to_scrape.append(candidate)
+
+    logger.info(
+        f"Retrieval plan ({method}): {len(plan.main_docs)} main hits, "
+        f"{len(plan.loaded_papers)} loaded papers, {len(plan.papers_to_scrape)} papers to scrape"
+    )
+    return plan
@@ -0,0 +1,202 @@
+"""
+Async Scraping Engine for NASA Space Biology Papers
+Shared pooled HTTP client with bounded concurrency and per-host politeness
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from executors import run_io
+from html_cache import CacheMissError, HtmlCache
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_HOST_RATE = float(os.getenv("SCRAPE_HOST_RATE", "3"))
+SCRAPE_HOST_BURST = int(os.getenv("SCRAPE_HOST_BURST", "3"))
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "30"))
+HTML_CACHE_ENABLED = os.getenv("HTML_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    " (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate against a single host"""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        """
+        Take one token, sleeping until it is available
+
+        Tokens may go negative: each caller reserves its slot immediately
+        and then sleeps off the debt, so waiters are served in FIFO order
+        without a lock (the event loop runs this section atomically).
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class AsyncScraper:
+    """Fetches pages through one pooled client with bounded concurrency"""
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        host_rate: float = SCRAPE_HOST_RATE,
+        host_burst: int = SCRAPE_HOST_BURST,
+        timeout: float = SCRAPE_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+        cache: Optional[HtmlCache] = None,
+    ):
+        """
+        Initialize scraper
+
+        Args:
+            concurrency: Maximum number of requests in flight
+            host_rate: Requests per second allowed against a single host
+            host_burst: Requests allowed back-to-back against a single host
+            timeout: Per-request timeout in seconds
+            headers: Default request headers
+            cache: On-disk cache consulted before and updated after each fetch
+        """
+        self.concurrency = concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.cache = cache
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _ensure_client(self):
+        """Create client and semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is loop:
+            return
+
+        # Client pools and semaphores are bound to the loop they were
+        # first used on (e.g. a script calling asyncio.run twice)
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+
+    def _bucket(self, url: str) -> TokenBucket:
+        """Get the token bucket for the host of a URL"""
+        host = urlparse(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.host_rate, self.host_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def fetch(self, url: str) -> str:
+        """
+        Fetch a page as text
+
+        Fresh cached pages are served without a request; stale ones are
+        revalidated with If-None-Match / If-Modified-Since.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Response body
+
+        Raises:
+            httpx.HTTPError: On network errors or non-2xx responses
+            CacheMissError: In offline mode when the page is not cached
+        """
+        cached = None
+        request_headers = {}
+        if self.cache:
+            cached = await run_io(self.cache.get, url)
+            if cached and (self.cache.offline or self.cache.is_fresh(cached)):
+                return cached.body
+            if self.cache.offline:
+                raise CacheMissError(f"Not cached (offline mode): {url}")
+            if cached and cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        self._ensure_client()
+        # Wait for the host's token before taking a slot, so a throttled
+        # host can't hold every slot while fetches to other hosts queue
+        await self._bucket(url).acquire()
+        async with self._semaphore:
+            response = await self._client.get(url, headers=request_headers)
+
+        if response.status_code == 304 and cached:
+            await run_io(self.cache.touch, url)
+            return cached.body
+
+        response.raise_for_status()
+        if self.cache:
+            await run_io(
+                self.cache.put,
+                url,
+                response.text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return response.text
+
+    async def aclose(self):
+        """Close the pooled client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+            logger.info("Scraper client closed")
+
+
+_scraper: Optional[AsyncScraper] = None
+
+
+def get_scraper() -> AsyncScraper:
+    """Get the process-wide scraper"""
+    global _scraper
+    if _scraper is None:
+        cache = HtmlCache() if HTML_CACHE_ENABLED else None
+        _scraper = AsyncScraper(cache=cache)
+    return _scraper
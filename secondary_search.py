@@ -1,6 +1,9 @@
-from main import scrape_article_abstract, init_embeddings, create_vectorstore, load_existing_vectorstore
+import asyncio
+from main import scrape_article_abstract, init_embeddings, open_vectorstore, split_papers
+from embedding_pipeline import index_chunks
+from keyword_index import ChunkKeywordIndex
+from scraper import get_scraper
 from database_manager import  PaperDatabaseManager
-from langchain_community.vectorstores import Chroma
 from langchain.docstore.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
@@ -17,17 +20,26 @@ if len(papers) == 0:
     print("✅ All papers already have abstracts extracted!")
     exit(0)
 
+async def scrape_abstracts(papers):
+    """Scrape all abstracts concurrently on the shared scraper"""
+    try:
+        return await asyncio.gather(
+            *(scrape_article_abstract(paper["link"]) for paper in papers)
+        )
+    finally:
+        await get_scraper().aclose()
+
+print(f"📄 Scraping abstracts for {len(papers)} papers...")
+texts = asyncio.run(scrape_abstracts(papers))
+
 docs = []
 abstracted_papers = []
 
-for paper in papers :
+for paper, text in zip(papers, texts):
     title = paper["title"]
     link = paper["link"]
     pmcid = paper["pmcid"]
     
-    print(f"📄 Scraping abstract for: {title[:60]}...")
-    text = scrape_article_abstract(link)
-    
     if not text:
         print(f"⚠️  Failed to scrape abstract for: {title[:60]}")
         continue
@@ -53,7 +65,7 @@ splitter = RecursiveCharacterTextSplitter(
     separators=["\n\n", "\n", ". ", " ", ""],
 )
 
-chunks = splitter.split_documents(docs)
+chunks, chunk_ids, chunk_ids_by_link = split_papers(docs, splitter)
 
 print(f"\n📦 Created {len(chunks)} chunks from {len(docs)} documents")
 
@@ -62,21 +74,18 @@ if len(chunks) == 0:
     print("⚠️  No chunks created! All scraping attempts may have failed.")
     exit(1)
 
-vector_store, count = load_existing_vectorstore(embeddings_func=embeddings, persist_dir=PERSIST_DIRECTORY,collection=COLLECTION_NAME)
+vector_store = open_vectorstore(embeddings, PERSIST_DIRECTORY, COLLECTION_NAME)
 
-if not vector_store:
-    vector_store = create_vectorstore(
-    chunks, embeddings, PERSIST_DIRECTORY, COLLECTION_NAME
-)
+stats = index_chunks(vector_store, chunks, chunk_ids,
+                     keyword_index=ChunkKeywordIndex(COLLECTION_NAME))
+print(f"⚡ Embedded {stats['chunks']} chunks at {stats['chunks_per_second']} chunks/s")
 
-vector_store.add_documents(chunks)
 
+chunk_counts = [(paper['link'], len(chunk_ids_by_link.get(paper['link'], []))) for paper in abstracted_papers]
 
-for i, paper in enumerate(abstracted_papers):
-    # Calculate chunks for this paper
-    paper_chunks = [c for c in chunks if c.metadata.get('title') == paper['title']]
-    chunks_count = len(paper_chunks)
-            
-    # Mark as loaded
-    db.mark_as_abstracted(paper['link'])
-    print(f"  📊 Marked as abstracted: {paper['title'][:50]}... ({chunks_count} chunks)")
\ No newline at end of file
+# Mark all as abstracted in one transaction
+abstracts = {doc.metadata['source']: doc.page_content for doc in docs}
+results = db.mark_many_as_abstracted(chunk_counts, abstracts)
+for paper, (link, chunks_count) in zip(abstracted_papers, chunk_counts):
+    if results.get(link):
+        print(f"  📊 Marked as abstracted: {paper['title'][:50]}... ({chunks_count} chunks)")
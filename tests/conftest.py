@@ -0,0 +1,35 @@
+"""
+Test Configuration
+Makes the top-level modules importable from the tests directory
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+
+@pytest.fixture
+def mock_scraper():
+    """Build AsyncScrapers whose client answers from a handler instead of the network"""
+    import httpx
+
+    from scraper import AsyncScraper
+
+    def build(handler, **kwargs) -> AsyncScraper:
+        scraper = AsyncScraper(**kwargs)
+        original = scraper._ensure_client
+
+        def ensure_client():
+            fresh = scraper._client is None
+            original()
+            if fresh:
+                scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        scraper._ensure_client = ensure_client
+        return scraper
+
+    return build
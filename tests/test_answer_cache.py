@@ -0,0 +1,69 @@
+"""
+Tests for the semantic answer cache
+"""
+
+import pytest
+from langchain_core.documents import Document
+
+from answer_cache import AnswerCache, context_key
+
+DOCS = [
+    Document(page_content="Bone density dropped in orbit.", metadata={"source": "http://x/a"}),
+    Document(page_content="Plants grew roots sideways.", metadata={"source": "http://x/b"}),
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.db"), max_entries=3, ttl=3600, similarity=0.95)
+    yield cache
+    cache.close()
+
+
+def test_exact_hit_ignores_case_whitespace_and_chunk_order(cache):
+    cache.put("gemini", "What happens to bone?", DOCS, "It weakens.")
+
+    assert cache.get("gemini", "  what happens   to BONE? ", DOCS[::-1]) == ("It weakens.", "exact")
+    assert cache.get("other-model", "What happens to bone?", DOCS) is None
+    assert cache.get("gemini", "What happens to bone?", DOCS[:1]) is None
+    assert context_key(DOCS) == context_key(DOCS[::-1])
+
+
+def test_similar_question_over_same_chunks_is_a_semantic_hit(cache):
+    cache.put("gemini", "What happens to bone?", DOCS, "It weakens.", query_vector=[1.0, 0.0, 0.0])
+
+    assert cache.get("gemini", "How does bone change?", DOCS, [0.99, 0.05, 0.0]) == ("It weakens.", "semantic")
+    assert cache.get("gemini", "How do plants grow?", DOCS, [0.0, 1.0, 0.0]) is None
+    assert cache.get("gemini", "How does bone change?", DOCS[:1], [0.99, 0.05, 0.0]) is None
+
+    stats = cache.stats()
+    assert (stats['semantic_hits'], stats['misses']) == (1, 2)
+
+
+def test_expired_answers_are_not_served(cache):
+    cache.put("gemini", "What happens to bone?", DOCS, "It weakens.", query_vector=[1.0, 0.0])
+    cache.conn.execute("UPDATE answers SET created_at = created_at - 7200")
+    cache.conn.commit()
+
+    assert cache.get("gemini", "What happens to bone?", DOCS, [1.0, 0.0]) is None
+
+
+def test_least_recently_used_answers_are_evicted(cache):
+    for i in range(3):
+        cache.put("gemini", f"question {i}", DOCS, f"answer {i}")
+    cache.get("gemini", "question 0", DOCS)
+    cache.conn.execute("UPDATE answers SET accessed_at = accessed_at - 10 WHERE query != 'question 0'")
+    cache.conn.commit()
+    cache.put("gemini", "question 3", DOCS, "answer 3")
+
+    assert cache.stats()['size'] == 3
+    assert cache.get("gemini", "question 0", DOCS) is not None
+    assert cache.get("gemini", "question 1", DOCS) is None
+
+
+def test_clear_removes_all_answers(cache):
+    cache.put("gemini", "What happens to bone?", DOCS, "It weakens.")
+    cache.clear()
+
+    assert cache.stats()['size'] == 0
+    assert cache.get("gemini", "What happens to bone?", DOCS) is None
@@ -0,0 +1,46 @@
+"""
+Tests for single-pass PMC article parsing
+"""
+
+from article_parser import parse_article
+
+URL = "https://pmc.ncbi.nlm.nih.gov/articles/PMC1/"
+
+PAGE = """
+<html><head><meta name="description" content=" Meta summary. "></head>
+<body>
+  <nav><p>Navigation text</p></nav>
+  <main id="maincontent">
+    <h2>Abstract</h2>
+    <p>Spaceflight weakens bone.</p>
+    <figure><img src="/blobs/fig1.jpg"></figure>
+    <p>Body paragraph two.</p>
+    <img src="//cdn.example.org/fig2.jpg">
+    <img src="/blobs/fig1.jpg">
+  </main>
+</body></html>
+"""
+
+
+def test_parse_extracts_text_abstract_and_images_in_one_pass():
+    record = parse_article(PAGE, URL)
+
+    assert record.text == "Spaceflight weakens bone.\n\nBody paragraph two."
+    assert record.abstract == "Spaceflight weakens bone."
+    assert record.summary == "Spaceflight weakens bone."
+    assert record.image_urls == [
+        "https://pmc.ncbi.nlm.nih.gov/blobs/fig1.jpg",
+        "https://cdn.example.org/fig2.jpg",
+    ]
+    assert record.meta_description == "Meta summary."
+
+
+def test_summary_falls_back_to_meta_description():
+    record = parse_article(
+        '<html><head><meta name="description" content="Only meta"></head>'
+        '<body><article><p>Text</p></article></body></html>', URL)
+
+    assert record.abstract is None
+    assert record.summary == "Only meta"
+    assert record.text == "Text"
+    assert record.image_urls == []
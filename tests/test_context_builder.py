@@ -0,0 +1,73 @@
+"""
+Tests for context packing
+"""
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from context_builder import HEADER_TOKENS, estimate_tokens, join_overlapping, pack_context
+
+
+def _chunks(text: str, source: str, pmcid: str):
+    """Split a paper the way ingestion does, recording chunk positions"""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=50)
+    chunks = splitter.split_documents([Document(page_content=text, metadata={"source": source, "pmcid": pmcid})])
+    for idx, chunk in enumerate(chunks):
+        chunk.metadata["chunk_index"] = idx
+    return chunks
+
+
+PAPER_TEXT = " ".join(f"sentence {i} about plant growth in microgravity." for i in range(60))
+
+
+def test_join_overlapping_drops_shared_text():
+    left = "alpha beta gamma delta epsilon zeta eta theta"
+    right = "epsilon zeta eta theta iota kappa"
+    assert join_overlapping(left, right) == "alpha beta gamma delta epsilon zeta eta theta iota kappa"
+    assert join_overlapping(left, "completely unrelated text here") is None
+
+
+def test_neighbours_are_merged_into_contiguous_text():
+    chunks = _chunks(PAPER_TEXT, "http://x/1", "PMC1")
+    packed, stats = pack_context(chunks[:3], token_budget=10_000, max_chunks_per_paper=3)
+
+    assert len(packed) == 1
+    assert stats['chunks_used'] == 3
+    assert stats['neighbours_merged'] == 2
+    assert packed[0].page_content in PAPER_TEXT
+    assert "chunk_index" not in packed[0].metadata
+
+
+def test_duplicates_and_contained_chunks_are_dropped():
+    chunks = _chunks(PAPER_TEXT, "http://x/1", "PMC1")
+    contained = Document(page_content=chunks[0].page_content[10:80], metadata=dict(chunks[0].metadata))
+    packed, stats = pack_context([chunks[0], chunks[0], contained], token_budget=10_000)
+
+    assert stats['duplicates_dropped'] == 2
+    assert stats['chunks_used'] == 1
+
+
+def test_per_paper_cap_leaves_room_for_other_papers():
+    first = _chunks(PAPER_TEXT, "http://x/1", "PMC1")
+    second = _chunks(PAPER_TEXT.replace("plant", "bone"), "http://x/2", "PMC2")
+    packed, stats = pack_context(first[:5] + second[:1], token_budget=10_000, max_chunks_per_paper=2)
+
+    assert [doc.metadata["pmcid"] for doc in packed] == ["PMC1", "PMC2"]
+    assert stats['chunks_skipped'] == 3
+
+
+def test_budget_is_respected():
+    docs = _chunks(PAPER_TEXT, "http://x/1", "PMC1")[::2]
+    budget = HEADER_TOKENS + estimate_tokens(docs[0].page_content) * 2
+    packed, stats = pack_context(docs, token_budget=budget, max_chunks_per_paper=0)
+
+    assert stats['chunks_used'] == 2
+    assert stats['estimated_tokens'] <= budget + estimate_tokens("\n[...]\n")
+
+
+def test_best_chunk_is_trimmed_when_nothing_fits():
+    chunks = _chunks(PAPER_TEXT, "http://x/1", "PMC1")
+    packed, stats = pack_context(chunks[:1], token_budget=HEADER_TOKENS + 10)
+
+    assert stats['chunks_used'] == 1
+    assert estimate_tokens(packed[0].page_content) <= 10
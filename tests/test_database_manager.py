@@ -0,0 +1,140 @@
+"""
+Tests for the paper tracking database
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from database_manager import PaperDatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = PaperDatabaseManager(str(tmp_path / "papers.db"))
+    yield manager
+    manager.close()
+
+
+def _write_csv(path, rows):
+    """Write (title, link) rows as a papers CSV"""
+    lines = ["Title,Link"] + [f"{title},{link}" for title, link in rows]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_load_csv_counts_added_duplicates_and_errors(db, tmp_path):
+    csv_path = _write_csv(tmp_path / "papers.csv", [
+        ("Plants in orbit", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC1/"),
+        ("Bone loss", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC2/"),
+        ("Radiation repair", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC3/"),
+        ("Plants in orbit again", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC1/"),
+        ("", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC4/"),
+    ])
+
+    assert db.load_csv(csv_path) == {'total': 5, 'added': 3, 'duplicates': 1, 'errors': 1}
+    assert db.get_paper_by_link("https://www.ncbi.nlm.nih.gov/pmc/articles/PMC2/")["pmcid"] == "PMC2"
+
+
+def test_reloading_csv_adds_nothing(db, tmp_path):
+    csv_path = _write_csv(tmp_path / "papers.csv", [
+        ("Plants in orbit", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC1/"),
+        ("Bone loss", "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC2/"),
+    ])
+    db.load_csv(csv_path)
+
+    assert db.load_csv(csv_path) == {'total': 2, 'added': 0, 'duplicates': 2, 'errors': 0}
+
+
+def test_counts_span_csv_chunks(db, tmp_path):
+    rows = [(f"Paper {i}", f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{i}/") for i in range(10)]
+    csv_path = _write_csv(tmp_path / "papers.csv", rows + rows[:3])
+
+    assert db.load_csv(csv_path, chunksize=4) == {'total': 13, 'added': 10, 'duplicates': 3, 'errors': 0}
+
+
+def _load_papers(db, tmp_path, count):
+    """Load `count` papers from a CSV and return their links"""
+    rows = [(f"Paper {i}", f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{i}/") for i in range(count)]
+    db.load_csv(_write_csv(tmp_path / "papers.csv", rows))
+    return [link for _, link in rows]
+
+
+def test_mark_many_as_loaded_reports_missing_links(db, tmp_path):
+    links = _load_papers(db, tmp_path, 3)
+    missing = "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC999/"
+
+    results = db.mark_many_as_loaded([(links[0], 4), (links[1], 7), (missing, 1)])
+
+    assert results == {links[0]: True, links[1]: True, missing: False}
+    assert db.get_paper_by_link(links[1])["chunks_created"] == 7
+    assert [p["link"] for p in db.get_unloaded_papers()] == [links[2]]
+
+
+def test_mark_many_as_abstracted_stores_abstracts(db, tmp_path):
+    links = _load_papers(db, tmp_path, 2)
+
+    results = db.mark_many_as_abstracted(
+        [(links[0], 0), (links[1], 0)], abstracts={links[0]: "Microgravity alters root growth."})
+
+    assert results == {links[0]: True, links[1]: True}
+    assert db.get_nonAbstracted_papers() == []
+    db.cursor.execute("SELECT link, abstract FROM papers ORDER BY id")
+    assert db.cursor.fetchall() == [(links[0], "Microgravity alters root growth."), (links[1], None)]
+
+
+def test_database_uses_wal_journal(db):
+    db.cursor.execute("PRAGMA journal_mode")
+    assert db.cursor.fetchone()[0] == "wal"
+
+
+def test_each_thread_gets_its_own_connection(db):
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(db.conn))
+    thread.start()
+    thread.join()
+
+    assert seen[0] is not db.conn
+
+
+def test_unpooled_manager_shares_one_connection(tmp_path):
+    manager = PaperDatabaseManager(str(tmp_path / "papers.db"), pooled=False)
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(manager.conn))
+    thread.start()
+    thread.join()
+
+    assert seen[0] is manager.conn
+    manager.close()
+
+
+def test_reads_see_writes_from_another_thread(db, tmp_path):
+    links = _load_papers(db, tmp_path, 4)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda link: db.mark_as_loaded(link, 2), links))
+
+    assert len(db.get_loaded_papers()) == 4
+
+
+def test_catalog_stats_follow_status_changes(db, tmp_path):
+    links = _load_papers(db, tmp_path, 3)
+    assert db.get_catalog_stats() == {'loaded_papers': 0, 'loaded_chunks': 0}
+
+    db.mark_many_as_loaded([(links[0], 5), (links[1], 3)])
+    db.mark_as_loaded(links[1], 4)
+
+    assert db.get_catalog_stats() == {'loaded_papers': 2, 'loaded_chunks': 9}
+    db.reset_database()
+    assert db.get_catalog_stats() == {'loaded_papers': 0, 'loaded_chunks': 0}
+
+
+def test_catalog_page_lists_loaded_papers_newest_first(db, tmp_path):
+    links = _load_papers(db, tmp_path, 4)
+    for link in links[:3]:
+        db.mark_as_loaded(link, 1)
+
+    page = db.get_catalog_page(limit=2)
+
+    assert [paper['source'] for paper in page] == [links[2], links[1]]
+    assert [paper['source'] for paper in db.get_catalog_page(limit=2, offset=2)] == [links[0]]
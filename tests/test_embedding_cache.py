@@ -0,0 +1,93 @@
+"""
+Tests for the persistent embedding store
+"""
+
+from langchain_core.embeddings import Embeddings
+
+from embedding_cache import CachedEmbeddings, EmbeddingStore, QueryEmbeddingLRU
+
+
+def _stored(store):
+    """Row count straight from SQLite"""
+    return store.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+def test_replacing_vectors_does_not_grow_count(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "cache.db"), max_entries=10)
+    store.put_many({f"k{i}": [float(i)] * 4 for i in range(3)})
+    store.put_many({"k1": [9.0] * 4, "k3": [3.0] * 4})
+
+    assert store._count == _stored(store) == 4
+    assert store.get_many(["k1"]) == {"k1": [9.0] * 4}
+
+
+def test_least_recently_used_are_evicted_beyond_cap(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "cache.db"), max_entries=5)
+    store.put_many({f"old{i}": [1.0] * 4 for i in range(4)})
+    store.get_many(["old0"])
+    store.put_many({f"new{i}": [2.0] * 4 for i in range(3)})
+
+    assert store._count == _stored(store) == 5
+    assert "old0" in store.get_many(["old0"])
+
+
+def test_count_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.db")
+    store = EmbeddingStore(path)
+    store.put_many({f"k{i}": [0.5] * 4 for i in range(7)})
+    store.close()
+
+    assert EmbeddingStore(path)._count == 7
+
+
+class CountingEmbeddings(Embeddings):
+    """Embedding model returning a per-model constant vector and counting calls"""
+
+    def __init__(self, value: float):
+        self.value = value
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [[self.value, float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [self.value, float(len(text))]
+
+
+def test_documents_are_embedded_once(tmp_path):
+    model = CountingEmbeddings(1.0)
+    embeddings = CachedEmbeddings(model, "model-a", store=EmbeddingStore(str(tmp_path / "cache.db")))
+
+    first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+    second = embeddings.embed_documents(["beta ", "alpha"])
+
+    assert first == [[1.0, 5.0], [1.0, 4.0], [1.0, 5.0]]
+    assert second == [[1.0, 4.0], [1.0, 5.0]]
+    assert model.calls == 1
+    assert embeddings.misses == 2
+
+
+def test_query_cache_shared_across_models_keeps_vectors_apart():
+    lru = QueryEmbeddingLRU(max_size=10)
+    torch = CachedEmbeddings(CountingEmbeddings(1.0), "model", query_cache=lru)
+    onnx = CachedEmbeddings(CountingEmbeddings(2.0), "model#onnx", query_cache=lru)
+
+    assert torch.embed_query("bone loss") == [1.0, 9.0]
+    assert onnx.embed_query("bone loss") == [2.0, 9.0]
+    assert torch.embed_query("  bone   loss ") == [1.0, 9.0]
+    assert lru.stats()['hits'] == 1
+
+
+def test_query_cache_expires_and_evicts():
+    lru = QueryEmbeddingLRU(max_size=2, ttl=60)
+    lru.put("a", [1.0])
+    lru.put("b", [2.0])
+    lru.get("a")
+    lru.put("c", [3.0])
+
+    assert lru.get("b") is None
+    assert lru.get("a") == [1.0]
+    lru._items["a"] = (lru._items["a"][0] - 120, [1.0])
+    assert lru.get("a") is None
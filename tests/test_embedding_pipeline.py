@@ -0,0 +1,84 @@
+"""
+Tests for the batched embedding pipeline
+"""
+
+import threading
+
+from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+from embedding_pipeline import embed_texts, index_chunks
+
+
+class RecordingEmbeddings(Embeddings):
+    """Embeds a text as its length and records batch sizes and threads"""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def embed_documents(self, texts):
+        self.batches.append([len(text.split()) for text in texts])
+        self.threads.add(threading.get_ident())
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text))]
+
+
+TEXTS = [" ".join(["word"] * n) for n in (9, 1, 5, 3, 7, 2, 8, 4, 6)]
+
+
+def test_vectors_keep_input_order():
+    model = RecordingEmbeddings()
+    vectors = embed_texts(model, TEXTS, batch_size=2, workers=3)
+
+    assert vectors == [[float(len(text))] for text in TEXTS]
+
+
+def test_batches_group_texts_of_similar_length():
+    model = RecordingEmbeddings()
+    embed_texts(model, TEXTS, batch_size=3, workers=1)
+
+    assert model.batches == [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert len(model.threads) == 1
+
+
+def _store(tmp_path):
+    """Chroma store persisted under tmp_path with fake embeddings"""
+    return Chroma(collection_name="papers", embedding_function=DeterministicFakeEmbedding(size=8),
+                  persist_directory=str(tmp_path))
+
+
+def _chunks(source, count):
+    """Chunk documents and ids for one paper"""
+    chunks = [Document(page_content=f"{source} chunk {i}", metadata={"source": source, "chunk_index": i})
+              for i in range(count)]
+    return chunks, [f"{source}-{i}" for i in range(count)]
+
+
+def test_reindexing_a_paper_drops_its_stale_chunks(tmp_path):
+    store = _store(tmp_path)
+    index_chunks(store, *_chunks("http://x/a", 3))
+    index_chunks(store, *_chunks("http://x/b", 2))
+
+    index_chunks(store, *_chunks("http://x/a", 1))
+
+    assert sorted(store._collection.get()["ids"]) == ["http://x/a-0", "http://x/b-0", "http://x/b-1"]
+
+
+def test_split_papers_dedupes_links_and_groups_ids():
+    from main import paper_splitter, split_papers
+
+    docs = [
+        Document(page_content="first version", metadata={"source": "http://x/a"}),
+        Document(page_content="other paper", metadata={"source": "http://x/b"}),
+        Document(page_content="second version", metadata={"source": "http://x/a"}),
+    ]
+
+    chunks, ids, ids_by_link = split_papers(docs, paper_splitter())
+
+    assert [chunk.page_content for chunk in chunks] == ["second version", "other paper"]
+    assert len(set(ids)) == len(ids) == 2
+    assert ids_by_link == {"http://x/a": [ids[0]], "http://x/b": [ids[1]]}
@@ -0,0 +1,58 @@
+"""
+Tests for the executor pools
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from executors import get_pool, run_cpu, run_db, run_io, shutdown_pools
+
+
+def test_work_runs_on_named_pools():
+    async def run():
+        return await asyncio.gather(
+            run_cpu(lambda: threading.current_thread().name),
+            run_io(lambda: threading.current_thread().name),
+            run_db(lambda: threading.current_thread().name),
+        )
+
+    cpu, io, db = asyncio.run(run())
+    assert cpu.startswith("cpu-pool")
+    assert io.startswith("io-pool")
+    assert db.startswith("db-pool")
+
+
+def test_blocking_work_does_not_block_the_loop():
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await run_io(time.sleep, 0.2)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 5
+
+
+def test_arguments_are_passed_through():
+    assert asyncio.run(run_db(lambda a, b=0: a + b, 2, b=3)) == 5
+
+
+def test_unknown_pool_is_rejected():
+    with pytest.raises(ValueError):
+        get_pool("gpu")
+
+
+def test_pools_are_recreated_after_shutdown():
+    pool = get_pool("io")
+    shutdown_pools()
+    assert get_pool("io") is not pool
@@ -0,0 +1,110 @@
+"""
+Tests for the on-disk HTML cache
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from html_cache import CacheMissError, HtmlCache
+
+URL = "https://pmc.ncbi.nlm.nih.gov/articles/PMC1/"
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put(URL, "<html>paper</html>", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    page = cache.get(URL)
+    assert page.body == "<html>paper</html>"
+    assert page.etag == '"v1"'
+    assert cache.is_fresh(page)
+    assert cache.get("https://pmc.ncbi.nlm.nih.gov/articles/PMC2/") is None
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put(URL, "<html>same</html>")
+    cache.put("https://www.ncbi.nlm.nih.gov/pmc/articles/PMC1/", "<html>same</html>")
+
+    stats = cache.stats()
+    assert stats['pages'] == 2
+    assert stats['bodies'] == 1
+
+
+def test_least_recently_used_bodies_are_evicted(tmp_path):
+    cache = HtmlCache(str(tmp_path), max_bytes=10 ** 9)
+    for i in range(3):
+        cache.put(f"{URL}{i}", f"<html>{i} " + "x" * 1000 + "</html>")
+        time.sleep(0.01)
+    cache.get(f"{URL}0")
+    cache.max_bytes = cache.stats()['bytes'] - 1
+
+    cache.put(f"{URL}3", "<html>3</html>")
+    assert cache.get(f"{URL}0") is not None
+    assert cache.get(f"{URL}1") is None
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_stale_page_is_revalidated(tmp_path, mock_scraper):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="<html>v1</html>", headers={"ETag": '"v1"'})
+
+    cache = HtmlCache(str(tmp_path), max_age=3600)
+    scraper = mock_scraper(handler, cache=cache)
+
+    async def run():
+        first = await scraper.fetch(URL)
+        fresh = await scraper.fetch(URL)
+        cache.max_age = 0
+        revalidated = await scraper.fetch(URL)
+        await scraper.aclose()
+        return first, fresh, revalidated
+
+    assert asyncio.run(run()) == ("<html>v1</html>",) * 3
+    # The fresh hit made no request; the stale one sent the ETag and got a 304
+    assert len(requests) == 2
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_changed_page_replaces_cached_body(tmp_path, mock_scraper):
+    versions = iter(["<html>v1</html>", "<html>v2</html>"])
+
+    def handler(request):
+        return httpx.Response(200, text=next(versions))
+
+    cache = HtmlCache(str(tmp_path), max_age=0)
+    scraper = mock_scraper(handler, cache=cache)
+
+    async def run():
+        await scraper.fetch(URL)
+        body = await scraper.fetch(URL)
+        await scraper.aclose()
+        return body
+
+    assert asyncio.run(run()) == "<html>v2</html>"
+    assert cache.get(URL).body == "<html>v2</html>"
+
+
+def test_offline_mode_serves_cache_only(tmp_path, mock_scraper):
+    def handler(request):
+        raise AssertionError("offline mode made a request")
+
+    cache = HtmlCache(str(tmp_path), max_age=0, offline=True)
+    cache.put(URL, "<html>cached</html>")
+    scraper = mock_scraper(handler, cache=cache)
+
+    async def run():
+        body = await scraper.fetch(URL)
+        with pytest.raises(CacheMissError):
+            await scraper.fetch(f"{URL}missing")
+        return body
+
+    assert asyncio.run(run()) == "<html>cached</html>"
@@ -0,0 +1,118 @@
+"""
+Tests for the background ingestion job queue
+"""
+
+import asyncio
+
+import pytest
+
+from database_manager import PaperDatabaseManager
+from job_queue import IngestJobQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = PaperDatabaseManager(str(tmp_path / "papers.db"))
+    csv_path = tmp_path / "papers.csv"
+    csv_path.write_text("Title,Link\n" + "".join(
+        f"Paper {i},https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{i}/\n" for i in range(7)))
+    manager.load_csv(str(csv_path))
+    yield manager
+    manager.close()
+
+
+def _run_jobs(db, process_batch, num_papers, batch_size=3, jobs=1):
+    """Submit jobs, wait until the worker has finished them and return their final state"""
+    async def run():
+        queue = IngestJobQueue(db, process_batch, batch_size=batch_size)
+        await queue.start()
+        submitted = [await queue.submit(num_papers) for _ in range(jobs)]
+        await queue._queue.join()
+        await queue.stop()
+        return [db.get_job(job["id"]) for job in submitted]
+
+    return asyncio.run(run())
+
+
+def test_job_processes_papers_in_batches_and_reports_progress(db):
+    batches = []
+
+    async def process_batch(papers):
+        batches.append([paper["id"] for paper in papers])
+        db.mark_many_as_loaded([(paper["link"], 4) for paper in papers])
+        return {paper["id"]: 4 for paper in papers}, {}
+
+    job, = _run_jobs(db, process_batch, num_papers=None)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert job["status"] == "completed"
+    assert job["total_papers"] == job["papers_done"] == 7
+    assert job["papers_pending"] == 0
+    assert job["chunks_created"] == 28
+    assert job["progress"] == 100.0
+
+
+def test_failed_papers_are_recorded_without_failing_the_job(db):
+    async def process_batch(papers):
+        loaded = {paper["id"]: 1 for paper in papers if paper["pmcid"] != "PMC2"}
+        failed = {paper["id"]: "scrape failed" for paper in papers if paper["pmcid"] == "PMC2"}
+        return loaded, failed
+
+    job, = _run_jobs(db, process_batch, num_papers=5)
+
+    assert job["status"] == "completed"
+    assert job["papers_done"] == 4
+    assert job["papers_failed"] == 1
+    assert job["failures"] == [{
+        'title': "Paper 2",
+        'link': "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC2/",
+        'error': "scrape failed",
+    }]
+
+
+def test_batch_error_fails_the_job_and_keeps_the_worker_running(db):
+    calls = []
+
+    async def process_batch(papers):
+        calls.append(len(papers))
+        if len(calls) == 1:
+            raise RuntimeError("vector store unavailable")
+        return {paper["id"]: 1 for paper in papers}, {}
+
+    first, second = _run_jobs(db, process_batch, num_papers=2, jobs=2)
+
+    assert first["status"] == "failed"
+    assert first["error"] == "vector store unavailable"
+    assert first["papers_pending"] == 2
+    assert second["status"] == "completed"
+
+
+def test_empty_job_completes_immediately(db):
+    async def process_batch(papers):
+        raise AssertionError("nothing to process")
+
+    db.mark_many_as_loaded([(paper["link"], 1) for paper in db.get_unloaded_papers()])
+    job, = _run_jobs(db, process_batch, num_papers=None)
+
+    assert job["status"] == "completed"
+    assert job["total_papers"] == 0
+
+
+def test_interrupted_job_resumes_on_start(db):
+    job = db.create_load_job(None, 3)
+    db.set_job_status(job["id"], "running")
+    processed = []
+
+    async def process_batch(papers):
+        processed.extend(paper["id"] for paper in papers)
+        return {paper["id"]: 1 for paper in papers}, {}
+
+    async def run():
+        queue = IngestJobQueue(db, process_batch, batch_size=3)
+        await queue.start()
+        await queue._queue.join()
+        await queue.stop()
+
+    asyncio.run(run())
+    assert len(processed) == 7
+    assert db.get_job(job["id"])["status"] == "completed"
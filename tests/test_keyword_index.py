@@ -0,0 +1,83 @@
+"""
+Tests for the chunk keyword index
+"""
+
+import chromadb
+import pytest
+
+from keyword_index import ChunkKeywordIndex, build_match_query
+
+CHUNKS = {
+    "a-0": ("Interleukin IL-6 levels rose in mice after spaceflight.", "http://x/a"),
+    "a-1": ("Bone density dropped during the mission.", "http://x/a"),
+    "b-0": ("Plants grown in microgravity showed altered root growth.", "http://x/b"),
+    "c-0": ("IL-6 signalling and NF-kB activation in astronaut blood.", "http://x/c"),
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ChunkKeywordIndex("papers", str(tmp_path / "keywords.db"))
+    ids = list(CHUNKS)
+    index.add(ids, [CHUNKS[i][0] for i in ids], [{"source": CHUNKS[i][1]} for i in ids])
+    yield index
+    index.close()
+
+
+def _sources(hits):
+    return [doc.metadata["source"] for doc, _ in hits]
+
+
+def test_match_query_quotes_terms():
+    assert build_match_query('IL-6 "NF-kB" ') == '"IL-6" OR "NF-kB"'
+    assert build_match_query(" -- ") is None
+
+
+def test_search_ranks_by_bm25(index):
+    hits = index.search("IL-6 NF-kB", k=10)
+
+    assert _sources(hits) == ["http://x/c", "http://x/a"]
+    assert hits[0][1] > hits[1][1]
+    assert _sources(index.search("plant", k=10)) == ["http://x/b"]
+
+
+def test_search_can_be_limited_to_papers(index):
+    assert _sources(index.search("IL-6", sources=["http://x/a"])) == ["http://x/a"]
+    assert index.search("IL-6", sources=[]) == []
+
+
+def test_add_replaces_chunks_by_id(index):
+    index.add(["b-0"], ["Radiation damage to seeds."], [{"source": "http://x/b"}])
+
+    assert index.count() == 4
+    assert index.search("microgravity") == []
+    assert _sources(index.search("radiation")) == ["http://x/b"]
+
+
+def test_delete_sources_and_clear_stay_within_collection(index, tmp_path):
+    other = ChunkKeywordIndex("abstracts", str(tmp_path / "keywords.db"))
+    other.add(["x"], ["IL-6 abstract"], [{"source": "http://x/a"}])
+
+    index.delete_sources(["http://x/a"])
+    assert index.count() == 2
+    assert _sources(index.search("IL-6")) == ["http://x/c"]
+
+    index.clear()
+    assert index.count() == 0
+    assert other.count() == 1
+    other.close()
+
+
+def test_sync_rebuilds_from_collection(index):
+    collection = chromadb.EphemeralClient().get_or_create_collection("keyword-sync")
+    collection.add(
+        ids=["s-0", "s-1"],
+        documents=["Cosmic radiation exposure.", "Sleep in orbit."],
+        metadatas=[{"source": "http://x/s"}, {"source": "http://x/s"}],
+        embeddings=[[1.0, 0.0], [0.0, 1.0]],
+    )
+
+    assert index.sync_from_collection(collection) == 2
+    assert index.sync_from_collection(collection) == 0
+    assert _sources(index.search("radiation")) == ["http://x/s"]
+    assert index.search("microgravity") == []
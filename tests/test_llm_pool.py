@@ -0,0 +1,137 @@
+"""
+Tests for the pooled LLM clients
+"""
+
+import asyncio
+
+from llm_pool import LLMClientPool, fake_chat_model, hash_api_key
+
+
+def _counting_factory():
+    """Factory recording the clients it creates"""
+    created = []
+
+    def factory(model_name, api_key, temperature):
+        client = fake_chat_model(model_name, api_key, temperature)
+        created.append((model_name, api_key, temperature))
+        return client
+
+    return factory, created
+
+
+def test_same_key_reuses_client():
+    factory, created = _counting_factory()
+    pool = LLMClientPool(factory=factory, max_clients=4, idle_ttl=0)
+
+    async def run():
+        await pool.ainvoke("m1", "key", "hi")
+        await pool.ainvoke("m1", "key", "again")
+        await pool.ainvoke("m1", "key", "temperature differs", temperature=0.5)
+
+    asyncio.run(run())
+    stats = pool.stats()
+    assert len(created) == 2
+    assert stats['created'] == 2
+    assert stats['reused'] == 1
+    assert stats['clients'] == 2
+
+
+def test_least_recently_used_idle_client_is_evicted():
+    factory, created = _counting_factory()
+    pool = LLMClientPool(factory=factory, max_clients=2, idle_ttl=0)
+
+    async def run():
+        await pool.ainvoke("m1", "key", "hi")
+        await pool.ainvoke("m2", "key", "hi")
+        await pool.ainvoke("m1", "key", "hi")  # m2 is now least recently used
+        await pool.ainvoke("m3", "key", "hi")
+
+    asyncio.run(run())
+    assert set(model for model, _, _ in pool._clients) == {"m1", "m3"}
+    assert pool.stats()['evicted'] == 1
+
+
+def test_checked_out_client_is_not_evicted():
+    pool = LLMClientPool(factory=fake_chat_model, max_clients=1, idle_ttl=0)
+
+    async def run():
+        async with pool.acquire("m1", "key"):
+            await pool.ainvoke("m2", "key", "hi")
+            assert ("m1", hash_api_key("key"), 0.0) in pool._clients
+
+    asyncio.run(run())
+
+
+def test_expired_idle_clients_are_evicted():
+    pool = LLMClientPool(factory=fake_chat_model, max_clients=10, idle_ttl=60)
+
+    async def run():
+        await pool.ainvoke("m1", "key", "hi")
+        pool._clients[("m1", hash_api_key("key"), 0.0)].last_used -= 120
+        await pool.ainvoke("m2", "key", "hi")
+
+    asyncio.run(run())
+    assert [model for model, _, _ in pool._clients] == ["m2"]
+
+
+def test_api_key_is_not_stored_in_pool_keys():
+    pool = LLMClientPool(factory=fake_chat_model)
+    asyncio.run(pool.ainvoke("m1", "secret-key", "hi"))
+    assert all("secret-key" not in key for key in pool._clients)
+
+
+def test_concurrency_limit_per_client():
+    in_flight = []
+    peak = []
+
+    class SlowModel:
+        async def ainvoke(self, prompt):
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(prompt)
+
+            class Response:
+                content = prompt
+            return Response
+
+    pool = LLMClientPool(factory=lambda *args: SlowModel(), concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(pool.ainvoke("m", "key", f"p{i}") for i in range(6)))
+
+    assert asyncio.run(run()) == [f"p{i}" for i in range(6)]
+    assert max(peak) == 2
+
+
+def test_concurrency_limit_is_shared_per_api_key():
+    in_flight = {}
+    peak = {}
+
+    class SlowModel:
+        def __init__(self, api_key):
+            self.api_key = api_key
+
+        async def ainvoke(self, prompt):
+            in_flight[self.api_key] = in_flight.get(self.api_key, 0) + 1
+            peak[self.api_key] = max(peak.get(self.api_key, 0), in_flight[self.api_key])
+            await asyncio.sleep(0.01)
+            in_flight[self.api_key] -= 1
+
+            class Response:
+                content = prompt
+            return Response
+
+    pool = LLMClientPool(factory=lambda model, api_key, temperature: SlowModel(api_key), concurrency=2)
+
+    async def run():
+        calls = [pool.ainvoke(model, key, "p", temperature=temperature)
+                 for key in ("key-a", "key-b")
+                 for model in ("m1", "m2")
+                 for temperature in (0, 0.5)]
+        await asyncio.gather(*calls)
+
+    asyncio.run(run())
+    # Four clients per key, but never more than two calls in flight for either key
+    assert pool.stats()['clients'] == 8
+    assert peak == {"key-a": 2, "key-b": 2}
@@ -0,0 +1,71 @@
+"""
+Tests for the ONNX Runtime embedding backend
+"""
+
+import numpy as np
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+import main
+from onnx_embeddings import OnnxEmbeddings
+
+VOCAB = {"[PAD]": 0, "plants": 1, "bone": 2, "orbit": 3}
+
+
+class FakeSession:
+    """Returns token id i as the embedding [i, 1] for every token"""
+
+    def run(self, outputs, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+
+def _backend(batch_size=2):
+    """OnnxEmbeddings over a word-level tokenizer and FakeSession"""
+    tokenizer = Tokenizer(WordLevel(VOCAB, unk_token="[PAD]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+    backend = OnnxEmbeddings.__new__(OnnxEmbeddings)
+    backend.model_name = "test-model"
+    backend.batch_size = batch_size
+    backend.tokenizer = tokenizer
+    backend.session = FakeSession()
+    backend.input_names = {"input_ids", "attention_mask"}
+    return backend
+
+
+def _normalized(vector):
+    """L2-normalize a vector"""
+    vector = np.array(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_mean_pooling_ignores_padding():
+    vectors = _backend().embed_documents(["bone", "plants orbit orbit"])
+
+    # "bone" is padded to three tokens; padding must not dilute its mean
+    np.testing.assert_allclose(vectors[0], _normalized([2, 1]), rtol=1e-6)
+    np.testing.assert_allclose(vectors[1], _normalized([7 / 3, 1]), rtol=1e-6)
+
+
+def test_batches_keep_input_order():
+    backend = _backend(batch_size=1)
+    texts = ["orbit", "plants", "bone"]
+
+    assert backend.embed_documents(texts) == [backend.embed_query(text) for text in texts]
+    assert backend.embed_documents([]) == []
+
+
+def test_onnx_backend_gets_its_own_cache_namespace(monkeypatch):
+    monkeypatch.setattr(main, "load_embedding_model", lambda backend: _backend())
+    monkeypatch.setattr(main, "EMBEDDING_CACHE_ENABLED", False)
+
+    monkeypatch.setattr(main, "EMBEDDING_BACKEND", "torch")
+    torch_name = main.init_embeddings().model_name
+    monkeypatch.setattr(main, "EMBEDDING_BACKEND", "onnx-int8")
+    onnx_name = main.init_embeddings().model_name
+
+    assert torch_name == main.EMBEDDING_MODEL
+    assert onnx_name == f"{main.EMBEDDING_MODEL}#onnx-int8"
@@ -0,0 +1,133 @@
+"""
+Tests for the paper similarity graph
+"""
+
+import chromadb
+import numpy as np
+import pytest
+
+from paper_graph import PaperSimilarityGraph, compute_centroids
+
+PAPERS = 60
+CHUNKS_PER_PAPER = 7
+INITIAL_PAPERS = 50
+
+
+@pytest.fixture
+def chunk_records():
+    """Chunk embeddings of papers drawn around five topics"""
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(5, 32))
+    records = []
+    for paper in range(PAPERS):
+        for chunk in range(CHUNKS_PER_PAPER):
+            records.append((
+                f"p{paper}-{chunk}",
+                (topics[paper % 5] + rng.normal(scale=0.6, size=32)).tolist(),
+                {"source": f"http://x/{paper}", "pmcid": f"PMC{paper}", "chunk_index": chunk},
+            ))
+    return records
+
+
+def _collection(name, records):
+    """In-memory collection holding some chunk records"""
+    client = chromadb.EphemeralClient()
+    if name in [c.name for c in client.list_collections()]:
+        client.delete_collection(name)
+    collection = client.create_collection(name)
+    _add(collection, records)
+    return collection
+
+
+def _add(collection, records):
+    """Add (id, embedding, metadata) records to a collection"""
+    ids, embeddings, metadatas = zip(*records)
+    collection.add(ids=list(ids), embeddings=list(embeddings), metadatas=list(metadatas))
+
+
+def _edges(graph):
+    """Stored (paper, neighbour) pairs"""
+    return set(graph.conn.execute("SELECT paper_key, neighbor_key FROM paper_neighbors"))
+
+
+def test_centroids_average_chunks_per_paper(chunk_records):
+    collection = _collection("centroids", chunk_records)
+    centroids = compute_centroids(collection, batch_size=100)
+
+    assert len(centroids) == PAPERS
+    vector, count, link = centroids["PMC3"]
+    assert count == CHUNKS_PER_PAPER
+    assert link == "http://x/3"
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+
+
+def test_rebuild_matches_brute_force(chunk_records, tmp_path):
+    collection = _collection("bruteforce", chunk_records)
+    graph = PaperSimilarityGraph(str(tmp_path / "graph.db"), k=5, min_similarity=-1)
+    graph.rebuild([collection])
+
+    centroids = compute_centroids(collection)
+    keys = sorted(centroids)
+    matrix = np.vstack([centroids[key][0] for key in keys])
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, -np.inf)
+    row = keys.index("PMC0")
+    expected = [keys[j] for j in np.argsort(-similarity[row])[:5]]
+
+    got = [key for key, in graph.conn.execute(
+        "SELECT neighbor_key FROM paper_neighbors WHERE paper_key = 'PMC0' ORDER BY similarity DESC")]
+    assert got == expected
+
+
+def test_update_papers_matches_rebuild(chunk_records, tmp_path):
+    split = INITIAL_PAPERS * CHUNKS_PER_PAPER
+    collection = _collection("incremental", chunk_records[:split])
+    incremental = PaperSimilarityGraph(str(tmp_path / "incremental.db"), k=5, min_similarity=0.3)
+    incremental.rebuild([collection])
+
+    _add(collection, chunk_records[split:])
+    updated = incremental.update_papers(
+        collection, [f"http://x/{paper}" for paper in range(INITIAL_PAPERS, PAPERS)])
+
+    full = PaperSimilarityGraph(str(tmp_path / "full.db"), k=5, min_similarity=0.3)
+    full.rebuild([collection])
+
+    assert updated == PAPERS - INITIAL_PAPERS
+    assert _edges(incremental) == _edges(full)
+    assert incremental.stats()['papers'] == PAPERS
+
+
+def test_edges_between_lists_each_pair_once(chunk_records, tmp_path):
+    collection = _collection("between", chunk_records)
+    # Twelve papers per topic: k=11 links every paper to all its topic peers
+    graph = PaperSimilarityGraph(str(tmp_path / "graph.db"), k=11, min_similarity=0.3)
+    graph.rebuild([collection])
+
+    edges = graph.edges_between(["PMC0", "PMC5", "PMC10", "PMC1"])
+    pairs = [frozenset((a, b)) for a, b, _ in edges]
+    assert len(pairs) == len(set(pairs))
+    # Same-topic papers are related, papers of different topics aren't
+    assert frozenset(("PMC0", "PMC5")) in pairs
+    assert all("PMC1" not in pair for pair in pairs)
+    assert [s for _, _, s in edges] == sorted((s for _, _, s in edges), reverse=True)
+
+
+def test_clear_removes_everything(chunk_records, tmp_path):
+    collection = _collection("cleared", chunk_records)
+    graph = PaperSimilarityGraph(str(tmp_path / "graph.db"), k=5, min_similarity=0.3)
+    graph.rebuild([collection])
+    graph.clear()
+
+    assert graph.stats()['papers'] == 0
+    assert graph.stats()['edges'] == 0
+
+
+def test_stats_do_not_wait_for_a_running_update(chunk_records, tmp_path):
+    collection = _collection("stats", chunk_records)
+    graph = PaperSimilarityGraph(str(tmp_path / "graph.db"), k=5, min_similarity=0.3)
+    graph.rebuild([collection])
+
+    with graph._lock:  # As held by update_papers on the cpu pool
+        stats = graph.stats()
+    assert stats['papers'] == PAPERS
+    assert stats['edges'] == len(_edges(graph))
@@ -0,0 +1,88 @@
+"""
+Tests for full-text paper search
+"""
+
+import pytest
+
+from database_manager import PaperDatabaseManager
+
+PAPERS = [
+    ("Plant growth in microgravity", "PMC1"),
+    ("Bone density loss in astronauts", "PMC2"),
+    ("Radiation effects on DNA repair", "PMC3"),
+    ("Muscle atrophy during spaceflight", "PMC4"),
+    ("Immune response of mice aboard the ISS", "PMC5"),
+    ("Sleep patterns of crew members", "PMC6"),
+    ("Microbial biofilms on station surfaces", "PMC7"),
+    ("Vision changes after long missions", "PMC8"),
+]
+
+
+def _link(pmcid):
+    return f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/"
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = PaperDatabaseManager(str(tmp_path / "papers.db"))
+    csv_path = tmp_path / "papers.csv"
+    csv_path.write_text("Title,Link\n" + "".join(f"{title},{_link(pmcid)}\n" for title, pmcid in PAPERS))
+    manager.load_csv(str(csv_path))
+    yield manager
+    manager.close()
+
+
+def _pmcids(results):
+    return [paper["pmcid"] for paper in results]
+
+
+def test_search_matches_stems_and_prefixes(db):
+    assert db.fts_enabled
+    assert _pmcids(db.search_papers("plants")) == ["PMC1"]
+    assert _pmcids(db.search_papers("micrograv")) == ["PMC1"]
+    assert _pmcids(db.search_papers("astronaut bone")) == ["PMC2"]
+    assert db.search_papers("?!") == []
+
+
+def test_title_matches_rank_above_abstract_matches(db):
+    db.mark_many_as_abstracted(
+        [(_link("PMC4"), 0)],
+        abstracts={_link("PMC4"): "Muscle loss compared with radiation exposure in orbit."},
+    )
+
+    results = db.search_papers("radiation")
+    assert _pmcids(results) == ["PMC3", "PMC4"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_abstract_updates_are_indexed(db):
+    assert db.search_papers("hydroponics") == []
+    db.mark_many_as_abstracted(
+        [(_link("PMC1"), 0)], abstracts={_link("PMC1"): "Seedlings grown with hydroponics."})
+
+    assert _pmcids(db.search_papers("hydroponics")) == ["PMC1"]
+
+
+def test_loaded_only_and_pagination(db):
+    db.mark_many_as_loaded([(_link("PMC2"), 3)])
+
+    assert _pmcids(db.search_papers("loss", loaded_only=True)) == ["PMC2"]
+    everything = _pmcids(db.search_papers("in", limit=10))
+    assert _pmcids(db.search_papers("in", limit=1, offset=1)) == everything[1:2]
+
+
+def test_reset_empties_the_index(db):
+    db.reset_database()
+    assert db.search_papers("plant") == []
+
+
+def test_existing_database_is_indexed_on_open(db, tmp_path):
+    db.conn.execute("DROP TABLE papers_fts")
+    db.conn.commit()
+    db.close()
+
+    reopened = PaperDatabaseManager(str(tmp_path / "papers.db"))
+    try:
+        assert _pmcids(reopened.search_papers("dna")) == ["PMC3"]
+    finally:
+        reopened.close()
@@ -0,0 +1,66 @@
+"""
+Tests for cross-encoder reranking
+"""
+
+import time
+
+from langchain_core.documents import Document
+
+from reranker import CrossEncoderReranker
+
+
+class FakeCrossEncoder:
+    """Scores a pair by how often the query appears in the chunk"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = 0
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=False):
+        self.batches += 1
+        time.sleep(self.delay)
+        return [text.count(query) for query, text in pairs]
+
+
+def _reranker(model, batch_size=2):
+    reranker = CrossEncoderReranker(batch_size=batch_size)
+    reranker.model = model
+    return reranker
+
+
+DOCS = [Document(page_content=text, metadata={"source": "http://x/a"})
+        for text in ("no match", "ice", "ice ice ice", "ice ice", "nothing")]
+
+
+def test_rerank_orders_by_score_and_keeps_top_n():
+    kept, stats = _reranker(FakeCrossEncoder()).rerank("ice", DOCS, top_n=2, budget_ms=None)
+
+    assert [doc.page_content for doc in kept] == ["ice ice ice", "ice ice"]
+    assert kept[0].metadata["rerank_score"] == 3
+    assert stats['applied'] and stats['kept'] == 2 and stats['fallback'] is None
+
+
+def test_rerank_without_top_n_reorders_every_candidate():
+    kept, stats = _reranker(FakeCrossEncoder()).rerank("ice", DOCS, top_n=None, budget_ms=None)
+
+    assert [doc.page_content for doc in kept][:3] == ["ice ice ice", "ice ice", "ice"]
+    assert len(kept) == len(DOCS)
+    assert stats['kept'] == len(DOCS)
+
+
+def test_rerank_falls_back_to_retrieval_order_over_budget():
+    model = FakeCrossEncoder(delay=0.05)
+    kept, stats = _reranker(model).rerank("ice", DOCS, top_n=None, budget_ms=80)
+
+    assert kept == DOCS
+    assert not stats['applied']
+    assert stats['fallback'] == "time budget exceeded"
+    # The second batch was predicted not to fit, so it never ran
+    assert model.batches == 1
+
+
+def test_rerank_without_model_keeps_retrieval_order():
+    kept, stats = CrossEncoderReranker().rerank("ice", DOCS, top_n=3)
+
+    assert kept == DOCS[:3]
+    assert stats['fallback'] == "model not loaded"
@@ -0,0 +1,142 @@
+"""
+Tests for hybrid retrieval and rank fusion
+"""
+
+import asyncio
+import threading
+
+import chromadb
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from database_manager import PaperDatabaseManager
+from executors import CPU_WORKERS
+from keyword_index import ChunkKeywordIndex
+from retrieval import StoreRetriever, plan_retrieval, reciprocal_rank_fusion, search_stores
+
+
+def _doc(text, source="http://x/a"):
+    return Document(page_content=text, metadata={"source": source, "title": text})
+
+
+def test_rrf_prefers_chunks_ranked_by_both():
+    a, b, c, d = (_doc(t) for t in "abcd")
+    fused = reciprocal_rank_fusion([[a, b, c], [c, d, b]], k=60)
+
+    assert [doc.page_content for doc in fused] == ["c", "b", "a", "d"]
+
+
+def test_rrf_merges_same_chunk_from_both_lists():
+    fused = reciprocal_rank_fusion([[_doc("x")], [_doc("x")], [_doc("x", "http://x/b")]])
+
+    assert len(fused) == 2
+    assert fused[0].metadata["source"] == "http://x/a"
+
+
+class FakeVectorStore:
+    """Vector store returning a fixed ranking (the query vector is ignored)"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def similarity_search_by_vector(self, vector, k=4, filter=None):
+        docs = self.docs
+        if filter:
+            docs = [doc for doc in docs if doc.metadata["source"] in filter["source"]["$in"]]
+        return docs[:k]
+
+
+def test_hybrid_search_finds_exact_terms_vectors_miss(tmp_path):
+    vector_docs = [_doc(f"vector hit {i}") for i in range(3)]
+    index = ChunkKeywordIndex("papers", str(tmp_path / "keywords.db"))
+    index.add(["k"], ["CD8 T cells in orbit"], [{"source": "http://x/k", "title": "CD8"}])
+    retriever = StoreRetriever(FakeVectorStore(vector_docs), index)
+
+    async def run(method):
+        return await retriever.search("CD8", [0.0], k=4, method=method)
+
+    similarity = asyncio.run(run("similarity"))
+    hybrid = asyncio.run(run("hybrid"))
+
+    assert "CD8 T cells in orbit" not in [doc.page_content for doc in similarity]
+    assert "CD8 T cells in orbit" in [doc.page_content for doc in hybrid]
+    index.close()
+
+
+def test_fetch_paper_chunks_caps_chunks_per_paper():
+    docs = [_doc(f"a{i}", "http://x/a") for i in range(4)] + [_doc("b0", "http://x/b")]
+    retriever = StoreRetriever(FakeVectorStore(docs))
+
+    chunks = asyncio.run(retriever.fetch_paper_chunks(
+        "query", [0.0], ["http://x/a", "http://x/b"], per_paper=2))
+
+    assert [doc.page_content for doc in chunks] == ["a0", "a1", "b0"]
+
+
+def test_reset_deletes_persisted_collection(tmp_path):
+    from main import delete_vectorstore
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    client.create_collection("papers").add(ids=["1"], embeddings=[[1.0, 0.0]], documents=["old"])
+
+    assert delete_vectorstore(str(tmp_path), "papers")
+    assert "papers" not in [c.name for c in client.list_collections()]
+    assert not delete_vectorstore(str(tmp_path), "papers")
+
+
+class CountingEmbeddings(Embeddings):
+    """Constant query vector; counts embed_query calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [[0.0] for _ in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [0.0]
+
+
+class BarrierVectorStore(FakeVectorStore):
+    """Only returns once every store sharing the barrier is searching"""
+
+    def __init__(self, docs, barrier):
+        super().__init__(docs)
+        self.barrier = barrier
+
+    def similarity_search_by_vector(self, vector, k=4, filter=None):
+        self.barrier.wait()
+        return super().similarity_search_by_vector(vector, k, filter)
+
+
+@pytest.mark.skipif(CPU_WORKERS < 2, reason="needs two CPU pool workers")
+def test_search_stores_embeds_once_and_searches_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    embeddings = CountingEmbeddings()
+    main = StoreRetriever(BarrierVectorStore([_doc("full")], barrier))
+    abstracts = StoreRetriever(BarrierVectorStore([_doc("abstract")], barrier), name="abstracts")
+
+    plan = asyncio.run(search_stores("query", 2, embeddings, main, abstracts))
+
+    assert embeddings.calls == 1
+    assert [doc.page_content for doc in plan.main_docs] == ["full"]
+    assert [doc.page_content for doc in plan.abstract_docs] == ["abstract"]
+
+
+def test_plan_uses_abstract_hits_of_loaded_papers(tmp_path):
+    db = PaperDatabaseManager(str(tmp_path / "papers.db"))
+    db.cursor.executemany("INSERT INTO papers (title, link) VALUES (?, ?)",
+                          [("Loaded", "http://x/loaded"), ("Unloaded", "http://x/unloaded")])
+    db.conn.commit()
+    db.mark_as_loaded("http://x/loaded", 3)
+    main = StoreRetriever(FakeVectorStore([_doc("full", "http://x/main")]))
+    abstracts = StoreRetriever(FakeVectorStore(
+        [_doc("a", "http://x/loaded"), _doc("b", "http://x/unloaded")]), name="abstracts")
+
+    plan = asyncio.run(plan_retrieval("query", 3, CountingEmbeddings(), db, main, abstracts))
+
+    assert [paper["link"] for paper in plan.loaded_papers] == ["http://x/main", "http://x/loaded"]
+    assert [paper["link"] for paper in plan.papers_to_scrape] == ["http://x/unloaded"]
+    db.close()
@@ -0,0 +1,87 @@
+"""
+Tests for the async scraping engine
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from scraper import TokenBucket
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=20, capacity=3)
+
+    async def run():
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        burst = time.monotonic() - started
+        for _ in range(2):
+            await bucket.acquire()
+        return burst, time.monotonic() - started
+
+    burst, total = asyncio.run(run())
+    assert burst < 0.05
+    assert total >= 2 / 20 * 0.9
+
+
+def test_fetch_returns_body_and_raises_on_errors(mock_scraper):
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, text=f"page {request.url.path}")
+
+    scraper = mock_scraper(handler)
+
+    async def run():
+        body = await scraper.fetch("https://example.org/a")
+        with pytest.raises(httpx.HTTPStatusError):
+            await scraper.fetch("https://example.org/missing")
+        await scraper.aclose()
+        return body
+
+    assert asyncio.run(run()) == "page /a"
+
+
+def test_concurrency_is_bounded(mock_scraper):
+    in_flight = []
+    peak = []
+
+    async def handler(request):
+        in_flight.append(request)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(request)
+        return httpx.Response(200, text="ok")
+
+    scraper = mock_scraper(handler, concurrency=2, host_rate=1000, host_burst=100)
+
+    async def run():
+        await asyncio.gather(*(scraper.fetch(f"https://example.org/{i}") for i in range(8)))
+        await scraper.aclose()
+
+    asyncio.run(run())
+    assert max(peak) == 2
+
+
+def test_throttled_host_does_not_block_other_hosts(mock_scraper):
+    async def handler(request):
+        return httpx.Response(200, text=request.url.host)
+
+    # One slot; the slow host allows one request now and then one every 0.5s
+    scraper = mock_scraper(handler, concurrency=1, host_rate=2, host_burst=1)
+
+    async def run():
+        slow = [asyncio.create_task(scraper.fetch(f"https://slow.example.org/{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        await scraper.fetch("https://fast.example.org/")
+        elapsed = time.monotonic() - started
+        await asyncio.gather(*slow)
+        await scraper.aclose()
+        return elapsed
+
+    assert asyncio.run(run()) < 0.25
@@ -0,0 +1,64 @@
+"""
+Tests for the streaming /search endpoint
+"""
+
+import asyncio
+import json
+
+from fastapi import HTTPException
+
+import main
+
+
+async def _noop():
+    """Stand-in for ensure_vector_stores"""
+
+
+def _read_events(response):
+    """Collect a StreamingResponse body as (event, data) pairs"""
+    async def read():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    events = []
+    for block in asyncio.run(read()).strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+def test_events_are_streamed_in_order(monkeypatch):
+    async def fake_events(request, stream_tokens=False):
+        assert stream_tokens
+        yield "sources", {"sources": ["http://x/a"]}
+        yield "token", {"text": "Plants"}
+        yield "result", {"answer": "Plants"}
+
+    monkeypatch.setattr(main, "ensure_vector_stores", _noop)
+    monkeypatch.setattr(main, "search_events", fake_events)
+    response = asyncio.run(main.stream_search(main.OnDemandSearchQuery(query="plants")))
+
+    assert response.media_type == "text/event-stream"
+    assert [event for event, _ in _read_events(response)] == ["sources", "token", "result"]
+
+
+def test_failure_after_start_becomes_error_event(monkeypatch):
+    async def fake_events(request, stream_tokens=False):
+        yield "sources", {"sources": []}
+        raise HTTPException(status_code=502, detail="LLM unavailable")
+
+    monkeypatch.setattr(main, "ensure_vector_stores", _noop)
+    monkeypatch.setattr(main, "search_events", fake_events)
+    response = asyncio.run(main.stream_search(main.OnDemandSearchQuery(query="plants")))
+
+    assert _read_events(response)[-1] == ("error", {"status_code": 502, "detail": "LLM unavailable"})
+
+
+def test_search_returns_the_result_event(monkeypatch):
+    async def fake_events(request, stream_tokens=False):
+        assert not stream_tokens
+        yield "sources", {"sources": []}
+        yield "result", {"answer": "Bone loss"}
+
+    monkeypatch.setattr(main, "search_events", fake_events)
+
+    assert asyncio.run(main.search_papers(main.OnDemandSearchQuery(query="bone"))) == {"answer": "Bone loss"}
@@ -0,0 +1,47 @@
+"""
+Tests for deferred model and vector store loading
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+@pytest.fixture
+def fresh_loaders(monkeypatch):
+    """Start each test with nothing loaded"""
+    monkeypatch.setattr(main, "_loading", {})
+    monkeypatch.setattr(main, "load_errors", {})
+    monkeypatch.setattr(main, "embeddings", None)
+
+
+def test_concurrent_requests_share_one_load(fresh_loaders, monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "init_embeddings", lambda: calls.append(1) or "model")
+
+    async def run():
+        return await asyncio.gather(*(main.ensure_embeddings() for _ in range(5)))
+
+    assert asyncio.run(run()) == ["model"] * 5
+    assert len(calls) == 1
+
+
+def test_failed_load_is_reported_and_retried(fresh_loaders, monkeypatch):
+    def broken():
+        raise RuntimeError("model download failed")
+
+    async def run():
+        with pytest.raises(HTTPException) as error:
+            await main.ensure_vector_stores()
+        assert error.value.status_code == 503
+        assert main.load_errors == {"embeddings": "model download failed"}
+
+        monkeypatch.setattr(main, "init_embeddings", lambda: "model")
+        return await main.ensure_embeddings()
+
+    monkeypatch.setattr(main, "init_embeddings", broken)
+    assert asyncio.run(run()) == "model"
+    assert main.load_errors == {}
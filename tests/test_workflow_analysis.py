@@ -0,0 +1,93 @@
+"""
+Tests for cached /workflow paper attributes and citation analyses
+"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+from database_manager import PaperDatabaseManager
+from workflow_analysis import analyze_papers, papers_from_docs, precompute_attributes
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = PaperDatabaseManager(str(tmp_path / "papers.db"))
+    yield manager
+    manager.close()
+
+
+def _docs(*pmcids):
+    return [
+        Document(page_content=f"Text of {pmcid}", metadata={"pmcid": pmcid, "title": f"Paper {pmcid}",
+                                                             "source": f"http://x/{pmcid}"})
+        for pmcid in pmcids
+    ]
+
+
+class FakeLLM:
+    """Answers with attributes for every requested paper and one citation"""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def __call__(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        ids = [line[1:-1] for line in prompt.splitlines() if line.startswith("[paper")]
+        return json.dumps({
+            "papers": [{"id": paper_id, "author": f"Dr. {paper_id}", "topic": "Bone",
+                        "method": "Imaging", "result": "Loss"} for paper_id in ids],
+            "citations": [{"from": "paperB", "to": "paperA", "reason": "builds on"}],
+        })
+
+
+def test_papers_from_docs_keeps_one_entry_per_paper():
+    papers = papers_from_docs(_docs("PMC1", "PMC2", "PMC1"))
+
+    assert [(paper.id, paper.key) for paper in papers] == [("paperA", "PMC1"), ("paperB", "PMC2")]
+
+
+def test_second_analysis_is_served_from_cache(db):
+    llm = FakeLLM()
+
+    first = asyncio.run(analyze_papers("bone", papers_from_docs(_docs("PMC1", "PMC2")), db, llm))
+    second = asyncio.run(analyze_papers("bone", papers_from_docs(_docs("PMC2", "PMC1")), db, llm))
+
+    assert len(llm.prompts) == 1
+    assert (first.analyzed_papers, second.cached_papers) == (2, 2)
+    assert second.citations_cached
+    # Cached by paper, so the citation follows the papers into their new diagram ids
+    assert second.citations == [{"from": "paperA", "to": "paperB", "reason": "builds on"}]
+    assert second.to_dict()["papers"][0]["author"] == "Dr. paperB"
+
+
+def test_only_new_papers_are_sent_to_the_llm(db):
+    llm = FakeLLM()
+    asyncio.run(analyze_papers("bone", papers_from_docs(_docs("PMC1")), db, llm))
+
+    analysis = asyncio.run(analyze_papers("bone", papers_from_docs(_docs("PMC1", "PMC3")), db, llm))
+
+    assert "Only for these paper IDs: paperB." in llm.prompts[-1]
+    assert (analysis.cached_papers, analysis.analyzed_papers) == (1, 1)
+
+
+def test_precompute_fills_the_cache_in_batches(db):
+    llm = FakeLLM()
+    papers = papers_from_docs(_docs("PMC1", "PMC2", "PMC3"))
+
+    assert asyncio.run(precompute_attributes(papers, db, llm, batch_size=2)) == 3
+    assert len(llm.prompts) == 2
+    assert set(db.get_paper_attributes(["PMC1", "PMC2", "PMC3"])) == {"PMC1", "PMC2", "PMC3"}
+
+
+def test_reset_clears_workflow_caches(db):
+    db.save_paper_attributes({"PMC1": {"title": "Plants in orbit", "author": "Dr. A",
+                                       "topic": "Plants", "method": "Growth", "result": "Taller"}})
+    db.save_citation_analysis(["PMC1", "PMC2"], [{"from": "PMC2", "to": "PMC1", "reason": "cites"}])
+
+    assert db.get_citation_analysis(["PMC2", "PMC1"]) is not None
+    assert db.reset_database()
+    assert db.get_paper_attributes(["PMC1"]) == {}
+    assert db.get_citation_analysis(["PMC1", "PMC2"]) is None
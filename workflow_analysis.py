@@ -0,0 +1,293 @@
+"""
+Workflow Analysis with Cached Paper Attributes
+Extracts author, topic, method and result once per paper and citations once per paper set
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from database_manager import PaperDatabaseManager
+from executors import run_db
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+WORKFLOW_BATCH_SIZE = int(os.getenv("WORKFLOW_BATCH_SIZE", "10"))  # Papers per precompute LLM call
+
+ATTRIBUTE_FIELDS = ("author", "topic", "method", "result")
+ATTRIBUTE_DEFAULTS = {
+    "author": "Unknown Author",
+    "topic": "Research Topic",
+    "method": "Methodology",
+    "result": "Finding",
+}
+PREVIEW_CHARS = 600
+
+# Sends a prompt to the LLM and returns the response text
+PromptRunner = Callable[[str], Awaitable[str]]
+
+
+@dataclass
+class WorkflowPaper:
+    """A paper in a workflow diagram and its (possibly cached) attributes"""
+    key: str
+    title: str
+    pmcid: str
+    preview: str
+    attributes: Optional[Dict] = None
+    id: str = ""
+
+
+@dataclass
+class WorkflowAnalysis:
+    """Papers with attributes and citations between them, by diagram id"""
+    papers: List[WorkflowPaper] = field(default_factory=list)
+    citations: List[Dict] = field(default_factory=list)
+    cached_papers: int = 0
+    analyzed_papers: int = 0
+    citations_cached: bool = False
+
+    @property
+    def described(self) -> bool:
+        """Whether any paper has attributes"""
+        return any(paper.attributes for paper in self.papers)
+
+    def to_dict(self) -> Dict:
+        """Analysis in the shape returned by /workflow"""
+        return {
+            "papers": [
+                {"id": paper.id, "title": paper.title[:45], "pmcid": paper.pmcid,
+                 **{name: (paper.attributes or {}).get(name) or ATTRIBUTE_DEFAULTS[name]
+                    for name in ATTRIBUTE_FIELDS}}
+                for paper in self.papers
+            ],
+            "citations": self.citations,
+            "cached_papers": self.cached_papers,
+            "analyzed_papers": self.analyzed_papers,
+            "citations_cached": self.citations_cached,
+        }
+
+
+def paper_key(metadata: Dict) -> str:
+    """Cache key of a paper: its PMCID, or its link when it has none"""
+    return metadata.get("pmcid") or metadata.get("source") or metadata.get("link") or ""
+
+
+def diagram_id(idx: int) -> str:
+    """Diagram id of the idx-th paper (paperA, paperB, ...)"""
+    return f"paper{chr(65 + idx)}"
+
+
+def papers_from_docs(docs: List[Document]) -> List[WorkflowPaper]:
+    """One WorkflowPaper per distinct paper among retrieved chunks, in retrieval order"""
+    papers: Dict[str, WorkflowPaper] = {}
+    for doc in docs:
+        key = paper_key(doc.metadata)
+        if key and key not in papers:
+            papers[key] = WorkflowPaper(
+                key=key,
+                title=doc.metadata.get("title", "Unknown Title"),
+                pmcid=doc.metadata.get("pmcid", "N/A"),
+                preview=doc.page_content[:PREVIEW_CHARS],
+            )
+    ordered = list(papers.values())
+    for idx, paper in enumerate(ordered):
+        paper.id = diagram_id(idx)
+    return ordered
+
+
+def build_prompt(query: str, papers: List[WorkflowPaper], extract: List[WorkflowPaper],
+                 with_citations: bool) -> str:
+    """
+    Prompt extracting attributes for some papers and citations between all of them
+
+    Args:
+        query: User query (context for the analysis)
+        papers: All papers in the diagram
+        extract: Papers whose attributes are needed
+        with_citations: Also ask which papers cite each other
+    """
+    papers_info = "\n".join(
+        f"[{paper.id}]\nTitle: {paper.title}\nPMCID: {paper.pmcid}\nContent Preview: {paper.preview}..."
+        for paper in papers
+    )
+    extract_ids = ", ".join(paper.id for paper in extract)
+    citation_rules = (
+        """2. **Citations**: Only if papers reference each other:
+   - from: Paper ID that cites
+   - to: Paper ID being cited
+   - reason: Brief context (max 40 chars)"""
+        if with_citations else
+        '2. **Citations**: Not needed, return "citations": []'
+    )
+    return f"""Analyze these research papers and extract components for a ReactFlow diagram.
+
+Query: "{query}"
+
+Papers:
+{papers_info}
+
+Extract and return a JSON object with this EXACT structure:
+{{
+    "papers": [
+        {{"id": "paperA", "title": "Paper title (max 45 chars)", "pmcid": "PMC123", "author": "Dr. Name", "topic": "Research Topic", "method": "Methodology", "result": "Key Finding"}}
+    ],
+    "citations": [
+        {{"from": "paperB", "to": "paperA", "reason": "How paperB cites paperA"}}
+    ]
+}}
+
+Extraction Rules:
+1. **Papers**: Only for these paper IDs: {extract_ids or "none (return an empty list)"}. For each extract:
+   - id: The paper ID shown in brackets
+   - title: Paper title (max 45 chars)
+   - pmcid: PMCID from metadata
+   - author: Primary author name (e.g., "Dr. Rao", "Prof. Smith")
+   - topic: Main research topic (max 40 chars, e.g., "Gravity Response", "Space Radiation")
+   - method: Research methodology (max 40 chars, e.g., "Hydroponics", "Genome Sequencing")
+   - result: Key finding (max 45 chars, e.g., "Enhanced Yield", "Stable Repair Mechanism")
+
+{citation_rules}
+
+Keep labels concise and scientific.
+Return ONLY valid JSON, no markdown, no explanation."""
+
+
+def parse_response(text: str) -> Optional[Dict]:
+    """Parse the JSON object in an LLM response"""
+    match = re.search(r'\{.*\}', text or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group())
+    except json.JSONDecodeError:
+        return None
+
+
+def _extracted_attributes(parsed: Dict, papers: List[WorkflowPaper]) -> Dict[str, Dict]:
+    """Attributes from an LLM response, keyed by paper cache key"""
+    by_id = {paper.id: paper for paper in papers}
+    attributes = {}
+    for item in parsed.get("papers") or []:
+        paper = by_id.get(item.get("id"))
+        if paper is None:
+            continue
+        attributes[paper.key] = {
+            "title": paper.title,
+            **{name: str(item.get(name) or ATTRIBUTE_DEFAULTS[name]) for name in ATTRIBUTE_FIELDS},
+        }
+    return attributes
+
+
+async def analyze_papers(query: str, papers: List[WorkflowPaper],
+                         db_manager: PaperDatabaseManager,
+                         run_prompt: Optional[PromptRunner] = None,
+                         model_name: Optional[str] = None) -> WorkflowAnalysis:
+    """
+    Fill in paper attributes and citations, calling the LLM only for what isn't cached
+
+    Attributes are read from papers.db by paper key; the LLM is asked only
+    for papers never seen before. Citations are cached per set of papers,
+    so the same set of papers in any order reuses one analysis.
+
+    Args:
+        query: User query
+        papers: Papers in diagram order (ids assigned)
+        db_manager: Paper database holding the caches
+        run_prompt: Sends a prompt to the LLM (None to use cached data only)
+        model_name: Recorded with newly cached entries
+
+    Returns:
+        WorkflowAnalysis; papers neither cached nor described by the LLM have no attributes
+    """
+    analysis = WorkflowAnalysis(papers=papers)
+    keys = [paper.key for paper in papers]
+
+    cached = await run_db(db_manager.get_paper_attributes, keys)
+    for paper in papers:
+        paper.attributes = cached.get(paper.key)
+    analysis.cached_papers = sum(1 for paper in papers if paper.attributes)
+
+    citations = [] if len(papers) < 2 else await run_db(db_manager.get_citation_analysis, keys)
+    analysis.citations_cached = citations is not None and len(papers) > 1
+
+    missing = [paper for paper in papers if not paper.attributes]
+    if run_prompt is not None and (missing or citations is None):
+        parsed = parse_response(await run_prompt(
+            build_prompt(query, papers, missing, with_citations=citations is None)))
+        if parsed is None:
+            raise ValueError("LLM response contained no JSON object")
+
+        extracted = _extracted_attributes(parsed, missing)
+        if extracted:
+            await run_db(db_manager.save_paper_attributes, extracted, model_name)
+        for paper in missing:
+            paper.attributes = extracted.get(paper.key)
+        analysis.analyzed_papers = len(extracted)
+
+        if citations is None:
+            by_id = {paper.id: paper.key for paper in papers}
+            citations = [
+                {"from": by_id[c.get("from")], "to": by_id[c.get("to")],
+                 "reason": c.get("reason", "")}
+                for c in parsed.get("citations") or []
+                if c.get("from") in by_id and c.get("to") in by_id
+            ]
+            await run_db(db_manager.save_citation_analysis, keys, citations, model_name)
+
+    # Cached citations use paper keys; the diagram uses this request's ids
+    ids = {paper.key: paper.id for paper in papers}
+    analysis.citations = [
+        {"from": ids[c["from"]], "to": ids[c["to"]], "reason": c.get("reason", "")}
+        for c in citations or []
+        if c.get("from") in ids and c.get("to") in ids
+    ]
+    logger.info(
+        f"Workflow analysis: {analysis.cached_papers} cached papers, "
+        f"{analysis.analyzed_papers} analyzed, citations "
+        f"{'cached' if analysis.citations_cached else 'analyzed'}"
+    )
+    return analysis
+
+
+async def precompute_attributes(papers: List[WorkflowPaper], db_manager: PaperDatabaseManager,
+                                run_prompt: PromptRunner, model_name: Optional[str] = None,
+                                batch_size: int = WORKFLOW_BATCH_SIZE) -> int:
+    """
+    Extract and cache attributes for papers ahead of /workflow requests
+
+    Args:
+        papers: Papers without cached attributes
+        db_manager: Paper database holding the cache
+        run_prompt: Sends a prompt to the LLM
+        model_name: Recorded with the cached entries
+        batch_size: Papers per LLM call
+
+    Returns:
+        Number of papers whose attributes were cached
+    """
+    cached = 0
+    for start in range(0, len(papers), batch_size):
+        batch = papers[start:start + batch_size]
+        for idx, paper in enumerate(batch):
+            paper.id = diagram_id(idx)
+        try:
+            parsed = parse_response(await run_prompt(
+                build_prompt("Describe each paper", batch, batch, with_citations=False)))
+        except Exception as e:
+            logger.error(f"Attribute precompute batch failed: {e}")
+            continue
+        extracted = _extracted_attributes(parsed or {}, batch)
+        if extracted:
+            await run_db(db_manager.save_paper_attributes, extracted, model_name)
+            cached += len(extracted)
+        logger.info(f"Precomputed attributes for {cached}/{len(papers)} papers")
+    return cached